@@ -1,29 +1,17 @@
+import importlib
 import os
-import base64
 
 import streamlit as st
 
+import perf
 from db import (
     init_db, authenticate_user, get_background_color, is_db_configured,
-    create_session, get_session, delete_session,
+    is_session_configured, create_session, get_session, delete_session,
 )
 
 _SESSION_PARAM = "s"   # URL query-param key that holds the session token
-import views.judges_page as judges_page
-import views.competitors_page as competitors_page
-import views.scoring_page as scoring_page
-import views.leaderboard_page as leaderboard_page
-import views.questions_page as questions_page
-import views.registrations_page as registrations_page
-import views.registration_page as registration_page
-import views.booking_page as booking_page
-import views.admin_bookings_page as admin_bookings_page
-import views.home_page as home_page
-import views.scheduling_page as scheduling_page
-import views.admin_scheduling_page as admin_scheduling_page
-import views.mentor_schedule_page as mentor_schedule_page
-import views.finals_scoring_page as finals_scoring_page
-import views.scoring_overview_page as scoring_overview_page
+from static_assets import img_tag
+from theme import BASE_CSS, apply_stylesheet
 
 _LOGO_LEFT    = os.path.join("assets", "georgian_logo.png")
 _LOGO_RIGHT   = os.path.join("assets", "autohack_logo.png")
@@ -58,15 +46,6 @@ _LOGIN_CSS = f"""
     margin-bottom: 2rem !important;
     box-shadow: 0 8px 60px rgba(0,0,0,0.60) !important;
 }}
-.ah-subtitle {{
-    color: rgba(200,210,230,0.70); font-size: 0.95rem;
-    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
-}}
-.ah-stripe {{
-    height: 3px;
-    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
-    border-radius: 2px; width: 55%; margin: 16px auto 0;
-}}
 .login-card {{
     background: rgba(16, 20, 42, 0.72);
     border: 1px solid rgba(74,128,212,0.30);
@@ -126,21 +105,55 @@ hr {{ border-color: rgba(255,255,255,0.10) !important; }}
 """
 
 
-def _b64_tag(path: str, style: str, alt: str = "") -> str:
-    if not os.path.exists(path):
-        return ""
-    ext  = os.path.splitext(path)[1].lstrip(".").lower()
-    mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-    with open(path, "rb") as fh:
-        b64 = base64.b64encode(fh.read()).decode()
-    return f'<img src="data:{mime};base64,{b64}" style="{style}" alt="{alt}">'
+# ── Routes ──────────────────────────────────────────────────────────────────────
+# Route → module in views/. Modules are imported on first use (see _show), so a
+# visitor opening ?page=register loads only that page, not all fifteen.
+
+# ?page=<param> routes, no login required ("" / "home" only when logged out)
+PUBLIC_ROUTES = {
+    "":                      "home_page",
+    "home":                  "home_page",
+    "register":              "registration_page",
+    "book":                  "booking_page",
+    "mentor-robot-schedule": "scheduling_page",
+    "mentor_schedule":       "mentor_schedule_page",
+}
+
+# Admin sidebar navigation, in menu order
+ADMIN_ROUTES = {
+    "Team Registrations":        "registrations_page",
+    "Import Registrations":      "registration_import_page",
+    "Prelim Bookings":           "admin_bookings_page",
+    "Mentor - Robot Scheduling": "admin_scheduling_page",
+    "Manage Judges":             "judges_page",
+    "Manage Questions":          "questions_page",
+    "Scoring Overview":          "scoring_overview_page",
+    "Prelims Leaderboard":       "leaderboard_page",
+}
+
+# Judges are routed by their assigned round
+JUDGE_ROUTES = {
+    "prelims": "scoring_page",
+    "finals":  "finals_scoring_page",
+}
+
+
+def load_view(module: str):
+    """Import views.<module> on first use; later calls hit sys.modules."""
+    return importlib.import_module(f"views.{module}")
+
+
+def _show(module: str) -> None:
+    perf.label_run(module)
+    load_view(module).show()
 
 
 def main():
     st.set_page_config(page_title="AutoHack 2026", layout="wide")
 
-    # ── Query-param + MongoDB session persistence ────────────────────────────────
-    # The session token lives in the URL (?s=<token>) which survives page refresh.
+    # ── Query-param session persistence ──────────────────────────────────────────
+    # The signed session token lives in the URL (?s=<token>) which survives page
+    # refresh, and is verified without a database read (see db.get_session).
 
     # Handle logout requested by scoring pages
     if st.session_state.pop("_do_logout", False):
@@ -151,7 +164,7 @@ def main():
         st.session_state.pop("user", None)
         st.rerun()
 
-    # Restore session from DB when session_state was wiped (page refresh)
+    # Restore session from the token when session_state was wiped (page refresh)
     if not st.session_state.get("user"):
         token = st.query_params.get(_SESSION_PARAM)
         if token:
@@ -169,21 +182,9 @@ def main():
 
     # --- Public routes (no login required) ---
     page_param = st.query_params.get("page", "")
-    if page_param == "" or page_param == "home":
-        if not st.session_state.get("user"):
-            home_page.show()
-            return
-    if page_param == "register":
-        registration_page.show()
-        return
-    if page_param == "book":
-        booking_page.show()
-        return
-    if page_param == "mentor-robot-schedule":
-        scheduling_page.show()
-        return
-    if page_param == "mentor_schedule":
-        mentor_schedule_page.show()
+    logged_in_home = page_param in ("", "home") and st.session_state.get("user")
+    if page_param in PUBLIC_ROUTES and not logged_in_home:
+        _show(PUBLIC_ROUTES[page_param])
         return
 
     # --- Authenticated routes ---
@@ -203,40 +204,14 @@ def main():
         # Admin gets full navigation
         # Note: Manage Competitors and Customize pages are kept in the codebase
         # but removed from navigation (use ?page=... directly if needed)
-        page = st.sidebar.radio("Navigation", [
-            "Team Registrations",
-            "Prelim Bookings",
-            "Mentor - Robot Scheduling",
-            "Manage Judges",
-            "Manage Questions",
-            "Scoring Overview",
-            "Prelims Leaderboard",
-        ])
+        page = st.sidebar.radio("Navigation", list(ADMIN_ROUTES))
+        _show(ADMIN_ROUTES[page])
+        perf.panel()
     else:
         # Judges: no navigation radio — page is determined by their assigned round.
         # The sign-out control is embedded inside each scoring page's header.
         judge_round = user.get("judge_round", "prelims")
-        page = "Finals Scoring" if judge_round == "finals" else "Prelims Scoring"
-
-    # --- Route handlers ---
-    if page == "Team Registrations":
-        registrations_page.show()
-    elif page == "Prelim Bookings":
-        admin_bookings_page.show()
-    elif page == "Mentor - Robot Scheduling":
-        admin_scheduling_page.show()
-    elif page == "Manage Judges":
-        judges_page.show()
-    elif page == "Manage Questions":
-        questions_page.show()
-    elif page == "Scoring Overview":
-        scoring_overview_page.show()
-    elif page == "Prelims Leaderboard":
-        leaderboard_page.show()
-    elif page == "Prelims Scoring":
-        scoring_page.show()
-    elif page == "Finals Scoring":
-        finals_scoring_page.show()
+        _show(JUDGE_ROUTES.get(judge_round, JUDGE_ROUTES["prelims"]))
 
 
 def _render_sidebar_header():
@@ -284,21 +259,21 @@ def render_login():
         portal_icon  = "🔐"
         portal_label = "Staff Portal"
 
-    st.markdown(_LOGIN_CSS, unsafe_allow_html=True)
+    apply_stylesheet("login", BASE_CSS, _LOGIN_CSS)
 
     # ── Banner ──────────────────────────────────────────────────────────────────
     ah_tag = (
-        _b64_tag(_LOGO_AH_WHITE,
-                 "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                 "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_SVG,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
-        or _b64_tag(_LOGO_RIGHT,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
+        img_tag(_LOGO_AH_WHITE,
+                "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                "AutoHack 2026")
+        or img_tag(_LOGO_AH_SVG,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
+        or img_tag(_LOGO_RIGHT,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
     )
-    gc_tag = _b64_tag(
+    gc_tag = img_tag(
         _LOGO_LEFT,
         "height:30px;object-fit:contain;opacity:0.82;",
         "Georgian College"
@@ -337,6 +312,14 @@ def render_login():
             "[database] uri and name. Login is disabled until configured."
         )
         st.stop()
+    if not is_session_configured():
+        st.error(
+            "Session secret missing. Add a [session] section with "
+            "secret = \"<long random string>\" to .streamlit/secrets.toml (generate one with "
+            "`python -c \"import secrets; print(secrets.token_urlsafe(48))\"`). "
+            "Login is disabled until configured."
+        )
+        st.stop()
 
     # ── Login card ──────────────────────────────────────────────────────────────
     _, col, _ = st.columns([1, 2, 1])
@@ -378,4 +361,8 @@ def render_login():
 
 
 if __name__ == "__main__":
-    main()
+    perf.begin_run()
+    try:
+        main()
+    finally:
+        perf.end_run()
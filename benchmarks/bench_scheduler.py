@@ -0,0 +1,86 @@
+"""
+benchmarks/bench_scheduler.py
+
+Times scheduler.solve() on a synthetic event of 500 teams and checks the result
+is a valid, complete schedule. Run from the repo root:
+
+    python benchmarks/bench_scheduler.py [--teams 500] [--seed 1]
+
+Scenarios:
+  prelim   1 session per team, 40 slots x 13 rooms, 60% of teams list 3 preferences
+  mentor   2 sessions per team, 15 slots x 70 seats, every team lists 4 preferences
+  robot    2 sessions per team, 15 slots x 70 seats, mentor slots blocked
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scheduler  # noqa: E402
+
+BUDGET_SECONDS = 1.0
+
+
+def _check(name, teams, capacity, need, assignment, blocked=None):
+    used = {}
+    for team, slots in assignment.items():
+        assert len(slots) == len(set(slots)), f"{name}: {team} double-booked"
+        assert len(slots) <= need, f"{name}: {team} got too many sessions"
+        for s in slots:
+            assert s not in (blocked or {}).get(team, ()), f"{name}: {team} in a blocked slot"
+            used[s] = used.get(s, 0) + 1
+    for s, n in used.items():
+        assert n <= capacity[s], f"{name}: slot {s} over capacity"
+    demand = len(teams) * need
+    booked = sum(used.values())
+    assert booked == min(demand, sum(capacity.values())), f"{name}: schedule is not complete"
+    return booked
+
+
+def _run(name, teams, capacity, need, prefs, blocked=None):
+    start = time.perf_counter()
+    assignment = scheduler.solve(teams, capacity, need, prefs, blocked)
+    elapsed = time.perf_counter() - start
+    booked = _check(name, teams, capacity, need, assignment, blocked)
+    first = sum(1 for t, s in assignment.items() if prefs.get(t) and prefs[t][0] in s)
+    print(f"{name:7s} {elapsed * 1000:8.1f} ms   {booked:5d} sessions   "
+          f"{first:4d} teams got their first choice")
+    return elapsed, assignment
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--teams", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    teams = [f"Team {i:03d}" for i in range(args.teams)]
+
+    # Prelims: popular early slots so preferences actually compete
+    prelim_cap = {s: 13 for s in range(1, 41)}
+    weights = [1 / (s ** 0.5) for s in prelim_cap]
+    prelim_prefs = {
+        t: rng.choices(list(prelim_cap), weights, k=3) for t in teams if rng.random() < 0.6
+    }
+    t_prelim, _ = _run("prelim", teams, prelim_cap, 1, prelim_prefs)
+
+    session_cap = {s: 70 for s in range(101, 116)}
+    mentor_prefs = {t: rng.sample(list(session_cap), 4) for t in teams}
+    t_mentor, mentor = _run("mentor", teams, session_cap, 2, mentor_prefs)
+
+    robot_prefs = {t: rng.sample(list(session_cap), 4) for t in teams}
+    blocked = {t: set(s) for t, s in mentor.items()}
+    t_robot, _ = _run("robot", teams, session_cap, 2, robot_prefs, blocked)
+
+    total = t_prelim + t_mentor + t_robot
+    print(f"total   {total * 1000:8.1f} ms   (budget {BUDGET_SECONDS * 1000:.0f} ms)")
+    if total > BUDGET_SECONDS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
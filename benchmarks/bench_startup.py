@@ -0,0 +1,172 @@
+"""
+benchmarks/bench_startup.py
+
+Measures how fast the app comes up for the public routes. Run from the repo
+root:
+
+    python benchmarks/bench_startup.py [--runs 3] [--no-server]
+
+Stages, each in a fresh interpreter so nothing is already imported:
+  import   import app.py plus the route's view module (what a cold script run
+           pays before drawing anything); also reports whether pandas or fpdf
+           were pulled in, and the old eager "import every view" cost for
+           comparison
+  render   first AppTest run of app.py with ?page=<route>; needs the
+           database from .streamlit/secrets.toml to be reachable, otherwise
+           the run ends in a connection error (still timed, and counted)
+  server   `streamlit run app.py` until /_stcore/health answers, then the time
+           to first byte of GET /?page=<route>
+
+Exits non-zero if a public route imports pandas or fpdf.
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HEAVY = ("pandas", "fpdf")
+
+_IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import app
+for module in {modules!r}:
+    app.load_view(module)
+elapsed = time.perf_counter() - start
+print(elapsed, *[name in sys.modules for name in {heavy!r}])
+"""
+
+_RENDER_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=60)
+at.query_params["page"] = {page!r}
+start = time.perf_counter()
+at.run()
+print(time.perf_counter() - start, len(at.exception))
+"""
+
+
+def _python(code: str) -> str:
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True)
+    return out.stdout.strip().splitlines()[-1]
+
+
+def _ms(samples) -> str:
+    return f"{statistics.median(samples) * 1000:8.1f} ms"
+
+
+def _public_routes():
+    # Imported here, in the parent process, only to read the route table
+    from app import PUBLIC_ROUTES
+
+    return {page: module for page, module in PUBLIC_ROUTES.items() if page}
+
+
+def bench_import(routes: dict, runs: int) -> bool:
+    print("import (cold interpreter)")
+    ok = True
+    for page, module in routes.items():
+        samples, heavy = [], []
+        for _ in range(runs):
+            fields = _python(_IMPORT_SNIPPET.format(root=ROOT, modules=[module], heavy=HEAVY)).split()
+            samples.append(float(fields[0]))
+            heavy = [name for name, loaded in zip(HEAVY, fields[1:]) if loaded == "True"]
+        ok = ok and not heavy
+        print(f"  {page:22s} {_ms(samples)}   heavy: {', '.join(heavy) or '-'}")
+
+    from app import ADMIN_ROUTES, JUDGE_ROUTES, PUBLIC_ROUTES
+
+    every = sorted(set(PUBLIC_ROUTES.values()) | set(ADMIN_ROUTES.values()) | set(JUDGE_ROUTES.values()))
+    samples = [float(_python(_IMPORT_SNIPPET.format(root=ROOT, modules=every, heavy=HEAVY)).split()[0])
+               for _ in range(runs)]
+    print(f"  {'(all views, eager)':22s} {_ms(samples)}")
+    return ok
+
+
+def bench_render(routes: dict, runs: int) -> None:
+    print("render (first AppTest run)")
+    for page in routes:
+        samples, errors = [], 0
+        for _ in range(runs):
+            seconds, exceptions = _python(_RENDER_SNIPPET.format(root=ROOT, page=page)).split()
+            samples.append(float(seconds))
+            errors += int(exceptions)
+        print(f"  {page:22s} {_ms(samples)}" + (f"   ({errors} exception(s))" if errors else ""))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(port: int, path: str):
+    """(status, seconds to the first byte of the response)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    start = time.perf_counter()
+    conn.request("GET", path)
+    resp = conn.getresponse()
+    resp.read(1)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return resp.status, elapsed
+
+
+def bench_server(routes: dict) -> None:
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                if _get(port, "/_stcore/health")[0] == 200:
+                    break
+            except OSError:
+                pass
+            if proc.poll() is not None or time.perf_counter() - start > 60:
+                print("server   did not come up")
+                return
+            time.sleep(0.05)
+        print(f"server   ready after {(time.perf_counter() - start) * 1000:.0f} ms")
+        for page in routes:
+            status, seconds = _get(port, f"/?page={page}")
+            print(f"  {page:22s} {seconds * 1000:8.1f} ms   HTTP {status}")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--no-server", action="store_true", help="skip the streamlit server stage")
+    args = parser.parse_args()
+
+    routes = _public_routes()
+    ok = bench_import(routes, args.runs)
+    bench_render(routes, args.runs)
+    if not args.no_server:
+        bench_server(routes)
+    if not ok:
+        print("a public route imports " + " or ".join(HEAVY))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+components.py
+
+Small UI building blocks shared by several pages.
+"""
+
+import streamlit as st
+
+import perf
+from db import (
+    admin_bulk_update_bookings,
+    auto_schedule,
+    dismiss_waitlist_notice,
+    get_queue_request,
+    get_team_waitlist,
+    get_waitlist_notices,
+    join_waitlist,
+    leave_waitlist,
+    slot_label,
+)
+from theme import GRID_CSS, apply_stylesheet
+
+
+@st.fragment(run_every=2)
+def queue_status(state_key: str):
+    """Waiting-room panel for a request sitting in the booking admission queue.
+
+    `st.session_state[state_key]` holds the request id. Only this fragment is
+    re-executed while the team waits; once the worker has processed the request
+    the outcome is stored under f"{state_key}_result" and the whole page reruns.
+    """
+    perf.ignore_fragment_run()  # polls every 2 s; not an interaction worth profiling
+    request_id = st.session_state.get(state_key)
+    if not request_id:
+        return
+    req = get_queue_request(request_id)
+    if req is None:
+        st.session_state.pop(state_key, None)
+        st.rerun()
+    if req["status"] in ("queued", "processing"):
+        if req["position"]:
+            st.info(
+                f"⏳ You're in line — position **{req['position']}**. "
+                "Keep this page open; requests are processed in the order they arrive."
+            )
+        else:
+            st.info("⏳ Processing your request…")
+        return
+    st.session_state.pop(state_key, None)
+    st.session_state[f"{state_key}_result"] = (req["status"], req.get("message", ""))
+    st.rerun()
+
+
+def queue_result(state_key: str, success_message: str) -> None:
+    """Show (once) the outcome of a processed queue request, if there is one."""
+    result = st.session_state.pop(f"{state_key}_result", None)
+    if not result:
+        return
+    status, message = result
+    if status == "done":
+        st.success(success_message)
+    else:
+        st.error(message or "Your request could not be completed. Please try again.")
+
+
+def waitlist_panel(kind: str, team_name: str, taken: dict, key: str) -> None:
+    """The team's waitlist entries plus a picker to join the waitlist of a taken slot.
+
+    `taken` maps a display label → (slot_id, room) for every slot the team could
+    wait for. When one frees up the team is booked into it automatically, so
+    there is no need to keep reloading the page.
+    """
+    for notice in get_waitlist_notices(team_name, kind):
+        col_txt, col_btn = st.columns([4, 1])
+        col_txt.warning(
+            f"**{slot_label(notice['slot_id'])}** — Room **{notice['room']}** freed up and you "
+            f"were next on its waitlist, but we couldn't book it for you: {notice['message']}"
+        )
+        if col_btn.button("Dismiss", key=f"{key}_notice_{notice['id']}"):
+            dismiss_waitlist_notice(notice["id"], team_name)
+            st.rerun()
+
+    entries = get_team_waitlist(team_name, kind)
+    for entry in entries:
+        col_txt, col_btn = st.columns([4, 1])
+        col_txt.markdown(
+            f"⏳ Waitlisted for **{slot_label(entry['slot_id'])}** — Room **{entry['room']}** "
+            f"(position {entry['position']})"
+        )
+        if col_btn.button("Leave", key=f"{key}_leave_{entry['id']}"):
+            leave_waitlist(entry["id"], team_name)
+            st.rerun()
+
+    waiting = {(e["slot_id"], e["room"]) for e in entries}
+    options = [label for label, target in taken.items() if target not in waiting]
+    if not options:
+        return
+    with st.expander("Slot you wanted is taken? Join its waitlist"):
+        st.caption(
+            "If the slot frees up, the first team on its waitlist is booked into it "
+            "automatically. Come back later to see your booking."
+        )
+        choice = st.selectbox("Waitlist slot", options=options, key=f"{key}_pick")
+        if st.button("Join Waitlist", key=f"{key}_join"):
+            slot_id, room = taken[choice]
+            try:
+                join_waitlist(kind, team_name, slot_id, room)
+                st.rerun()
+            except ValueError as exc:
+                st.error(str(exc))
+
+
+@st.fragment
+def bulk_edit_bookings(kind: str, bookings: list, slot_ids: list,
+                       place: str, place_options: list, key: str) -> None:
+    """Spreadsheet-style editor for moving many bookings at once.
+
+    Only rows whose slot or `place` ("room" / "mentor_name") changed are sent,
+    and the whole batch is validated and saved by admin_bulk_update_bookings.
+    Edits in the table rerun only this fragment; a save reruns the whole page.
+    """
+    import pandas as pd
+
+    place_title = "Mentor" if place == "mentor_name" else "Room"
+    label_to_id = {slot_label(i): i for i in slot_ids}
+    original = pd.DataFrame(
+        [{"id": b["id"], "Team": b["team_name"],
+          "Time Slot": slot_label(b.get("slot_id")), place_title: b.get(place)}
+         for b in bookings],
+        columns=["id", "Team", "Time Slot", place_title],
+    )
+    edited = st.data_editor(
+        original,
+        key=f"{key}_editor",
+        hide_index=True,
+        use_container_width=True,
+        disabled=["id", "Team"],
+        column_order=["Team", "Time Slot", place_title],
+        column_config={
+            "Time Slot": st.column_config.SelectboxColumn(
+                options=list(label_to_id), required=True),
+            place_title: st.column_config.SelectboxColumn(
+                options=place_options, required=True),
+        },
+    )
+    changed = edited[
+        (edited["Time Slot"] != original["Time Slot"])
+        | (edited[place_title] != original[place_title])
+    ]
+    st.caption(f"{len(changed)} booking(s) changed")
+    if st.button("💾 Save All Changes", type="primary", key=f"{key}_save",
+                 disabled=changed.empty):
+        try:
+            moved = admin_bulk_update_bookings(kind, [
+                {"id": row["id"], "slot_id": label_to_id[row["Time Slot"]],
+                 place: row[place_title]}
+                for row in changed.to_dict("records")
+            ])
+            st.session_state.pop(f"{key}_editor", None)
+            st.success(f"✅ Moved {moved} booking(s).")
+            st.rerun()
+        except ValueError as exc:
+            st.error(str(exc))
+
+
+@st.fragment
+def auto_schedule_panel(kind: str, key: str) -> None:
+    """Admin expander that fills the open `kind` slots with auto_schedule()."""
+    with st.expander("🤖 Auto-schedule"):
+        st.caption(
+            "Books every registered team that still needs a session into the open "
+            "slots, honouring waitlist requests as preferences where possible."
+        )
+        replace = st.checkbox(
+            "Replace existing bookings", key=f"{key}_replace",
+            help="Delete all current bookings of this kind and rebuild the schedule from scratch.",
+        )
+        if st.button("Run Auto-schedule", type="primary", key=f"{key}_run"):
+            result = auto_schedule(kind, replace=replace)
+            # Toasts survive the app rerun that redraws the grids around us
+            st.toast(f"✅ Scheduled {result['scheduled']} session(s).")
+            if result["unscheduled"]:
+                st.toast(
+                    "⚠️ Not enough free slots for: " + ", ".join(result["unscheduled"])
+                )
+            st.rerun(scope="app")
+
+
+def slot_grid(headers: list, rows: list, widths: list) -> None:
+    """Render a slot availability grid as a single HTML table element.
+
+    headers  one HTML snippet per column (the first is the time column)
+    rows     one list of cell HTML snippets per slot, or a plain string for a
+             full-width separator row (e.g. the day heading)
+    widths   relative column widths, as passed to st.columns before
+
+    One element per grid instead of one st.columns row and a markdown element
+    per cell, so a rerun sends one delta rather than dozens.
+    """
+    total = sum(widths)
+    apply_stylesheet("grid", GRID_CSS)
+    parts = ['<table class="ah-grid"><colgroup>']
+    parts += [f'<col style="width:{100 * w / total:.2f}%">' for w in widths]
+    parts.append("</colgroup><thead><tr>")
+    parts += [f"<th>{h}</th>" for h in headers]
+    parts.append("</tr></thead><tbody>")
+    for row in rows:
+        if isinstance(row, str):
+            parts.append(f'<tr><td colspan="{len(widths)}">{row}</td></tr>')
+        else:
+            parts.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>")
+    parts.append("</tbody></table>")
+    # No newlines: indented lines inside st.markdown would turn into code blocks
+    st.markdown("".join(parts), unsafe_allow_html=True)
+
+
+def _keep_tab(key: str) -> None:
+    # Clicking the selected segment deselects it; keep the last tab instead
+    if st.session_state.get(key) is None:
+        st.session_state[key] = st.session_state.get(f"{key}_last")
+    st.session_state[f"{key}_last"] = st.session_state[key]
+
+
+@st.fragment
+def lazy_tabs(tabs: dict, key: str) -> None:
+    """Tab strip that only runs the selected tab.
+
+    `tabs` maps a label to a zero-argument callable that renders that tab.
+    Unlike st.tabs, which executes every tab body on every run, only the chosen
+    tab's queries and widgets run; switching tabs reruns just this fragment.
+    Needs st.segmented_control (Streamlit 1.40+, see requirements.txt).
+    """
+    labels = list(tabs)
+    st.session_state.setdefault(key, labels[0])
+    choice = st.segmented_control(
+        "Tab", labels, key=key, label_visibility="collapsed",
+        on_change=_keep_tab, args=(key,),
+    )
+    tabs[choice if choice in tabs else labels[0]]()
@@ -1,15 +1,27 @@
+import base64
 import hashlib
+import hmac
+import json
 import os
+import re
 import secrets
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
 from typing import Any, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 import streamlit as st
 from bson import ObjectId
-from pymongo import ASCENDING, MongoClient
-from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo import ASCENDING, MongoClient, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 from bson.binary import Binary
 
+import perf
+
+
 def _get_mongo_uri() -> str:
     # Streamlit Cloud exposes secrets via st.
     print("calling _get_mongo_uri")
@@ -43,7 +55,8 @@ def get_db():
     db_name = _get_db_name()
     if not uri or not db_name:
         raise RuntimeError("Database configuration missing. See .streamlit/secrets.toml")
-    client = MongoClient(uri)
+    # perf.listener profiles every command per script run (admin Performance panel)
+    client = MongoClient(uri, event_listeners=[perf.listener])
     return client[db_name]
 
 
@@ -78,6 +91,15 @@ def _ensure_index(col, key_or_keys, **kwargs):
             raise
 
 
+def _drop_legacy_indexes(col, names: list) -> None:
+    """Drop superseded indexes by name; indexes that are already gone are skipped."""
+    for name in names:
+        try:
+            col.drop_index(name)
+        except OperationFailure:
+            pass  # IndexNotFound — dropped by an earlier run or another instance
+
+
 def _doc_with_id(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     if not doc:
         return None
@@ -113,11 +135,39 @@ def init_db():
     _ensure_index(db.team_registrations, "team_name")
     _ensure_index(db.team_registrations, "contact_email")
     _ensure_index(db.team_registrations, "status")
+    _ensure_index(db.team_registrations, [("member_emails", ASCENDING), ("status", ASCENDING)])
+    _init_registration_search_indexes(db)
+    _ensure_index(db.team_registrations, [("created_at", ASCENDING), ("_id", ASCENDING)])
+    _ensure_index(db.team_registrations,
+                  [("status", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)])
     _init_booking_indexes(db)
     _init_booking_history_indexes(db)
+    _init_session_history_indexes(db)
     _init_scheduling_indexes(db)
     _init_finals_indexes(db)
+    _init_quota_indexes(db)
+    _init_queue_indexes(db)
+    _init_waitlist_indexes(db)
+    _init_session_indexes(db)
     create_default_admin_if_missing(db)
+    _run_data_migrations()
+
+
+@st.cache_resource
+def _run_data_migrations() -> bool:
+    """One-time (per process) backfills for documents written before newer
+    schema fields existed. Every step must be idempotent and safe to run while
+    other app instances are serving traffic."""
+    db = get_db()
+    _backfill_booking_quotas(db)
+    _reconcile_booking_quotas(db)
+    _backfill_member_emails(db)
+    _init_registration_unique_indexes(db)
+    _backfill_booking_slot_ids(db)
+    _backfill_history_expiry(db)
+    _backfill_waitlist_seats(db)
+    db.assets.delete_one({"_id": "session_secret"})  # key stored by older versions; secrets only now
+    return True
 
 
 # --- CRUD operations ---
@@ -197,16 +247,22 @@ def update_judge_account(
         update_fields["password_hash"] = hash_password(password)
     if judge_round is not None:
         update_fields["judge_round"] = judge_round
-    db.users.update_one(
+    before = db.users.find_one_and_update(
         {"judge_id": judge_oid, "role": "judge"},
         {"$set": update_fields},
         upsert=True,
     )
+    # Session tokens carry username and judge_round, so they must not outlive
+    # a change to either (or to the password)
+    if before and (password or any(before.get(k) != v for k, v in update_fields.items()
+                                   if k != "password_hash")):
+        _revoke_user_sessions(db, [str(before["_id"])])
 
 
 def delete_judge_account(judge_id: Any):
     db = get_db()
     judge_oid = _oid(judge_id)
+    _revoke_user_sessions(db, [str(u["_id"]) for u in db.users.find({"judge_id": judge_oid}, {"_id": 1})])
     db.scores.delete_many({"judge_id": judge_oid})
     db.answers.delete_many({"judge_id": judge_oid})
     db.users.delete_many({"judge_id": judge_oid})
@@ -498,23 +554,195 @@ def get_answers_for_judge_competitor(judge_id, competitor_id):
 
 
 # --- Team Registration ---
+# Every registration also stores `member_emails`: its members' emails trimmed and
+# lower-cased, behind a multikey index, so "which team is this email on?" is an
+# index point query instead of a case-insensitive regex scan. Together with
+# `team_name_key` (the normalized name) it backs partial unique indexes over
+# pending/approved registrations, so the database itself rejects a second team
+# with the same name or a member who is already on another team.
+#
+# For admin search it also stores `search_tokens`: every word of the team name
+# and of each member's name, email, institution and program, accent-stripped
+# and case-folded. A multikey index on it turns as-you-type lookups into
+# anchored-prefix index scans; a text index over the same fields ranks
+# whole-word matches.
+
+_ACTIVE_REGISTRATION = {"status": {"$in": ["pending", "approved"]}}
+
+
+class RegistrationConflictError(ValueError):
+    """A registration clashes with a pending/approved one.
+
+    `conflicts` has the find_registration_conflicts() shape:
+    {"team_name": bool, "emails": {normalized_email: existing team_name}}."""
+
+    def __init__(self, conflicts: Dict[str, Any]):
+        self.conflicts = conflicts
+        parts = []
+        if conflicts.get("team_name"):
+            parts.append("team name already registered")
+        parts += [f"{e} already on team {t}" for e, t in conflicts.get("emails", {}).items()]
+        super().__init__("Registration conflict: " + ("; ".join(parts) or "duplicate registration"))
+
+
+_UNIQUE_REGISTRATION_INDEXES = {"team_name_key": "uniq_active_team_name",
+                                 "member_emails": "uniq_active_member_email"}
+
+
+def _init_registration_unique_indexes(db):
+    """Unique team name / member email across active registrations.
+
+    Built after the backfills so old documents have the normalized fields. If
+    an index can't be built (the collection already holds duplicates, or the
+    server predates $in in partial filters) the app keeps running, and
+    registration writes fall back to a conflict query before writing; see
+    _check_registration_conflicts."""
+    for field, name in _UNIQUE_REGISTRATION_INDEXES.items():
+        try:
+            db.team_registrations.create_index(
+                field, name=name, unique=True,
+                partialFilterExpression={**_ACTIVE_REGISTRATION, field: {"$exists": True}},
+            )
+        except OperationFailure as exc:
+            if exc.code in (85, 86):
+                continue
+            print(f"WARNING: could not create unique index {name}: {exc}. Until it exists, "
+                  f"duplicate registrations are only caught by a check-then-write query, "
+                  f"which concurrent submissions can slip past. Remove the duplicate "
+                  f"{field} values and restart to build it.")
+    _registration_uniqueness_enforced.clear()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _registration_uniqueness_enforced() -> bool:
+    """True if both unique registration indexes exist."""
+    names = get_db().team_registrations.index_information()
+    return all(name in names for name in _UNIQUE_REGISTRATION_INDEXES.values())
+
+
+def _check_registration_conflicts(team_name: str, members: list, exclude_id: Any = None) -> None:
+    """Fallback for when a unique index is missing: look for a clashing active
+    registration before writing and raise RegistrationConflictError if there
+    is one. A no-op while the indexes enforce uniqueness themselves."""
+    if _registration_uniqueness_enforced():
+        return
+    conflicts = find_registration_conflicts(
+        team_name, [m.get("email") for m in members or []], exclude_id=exclude_id)
+    if conflicts["team_name"] or conflicts["emails"]:
+        raise RegistrationConflictError(conflicts)
 
-def register_team(team_name: str, project_name: str, description: str, members: list, contact_email: str) -> str:
-    """Submit a new team registration (public, no auth required)."""
-    db = get_db()
-    doc = {
+
+def _normalize_team_name(team_name: Any) -> str:
+    return " ".join(str(team_name or "").split()).casefold()
+
+
+def _normalize_email(email: Any) -> str:
+    return str(email or "").strip().lower()
+
+
+def _member_emails(members: list) -> list:
+    """Sorted, de-duplicated normalized emails of a members list (blanks dropped)."""
+    return sorted({_normalize_email(m.get("email")) for m in members or []} - {""})
+
+
+_SEARCH_MEMBER_FIELDS = ("name", "email", "institution", "program")
+
+
+def _search_tokens(text: Any) -> list:
+    """Words of `text`, accent-stripped and case-folded: "Zoë O'Neil" → ["zoe", "o", "neil"]."""
+    plain = unicodedata.normalize("NFKD", str(text or ""))
+    plain = "".join(c for c in plain if not unicodedata.combining(c)).casefold()
+    return re.findall(r"[^\W_]+", plain)
+
+
+def _registration_search_tokens(team_name: Any, members: list) -> list:
+    tokens = set(_search_tokens(team_name))
+    for m in members or []:
+        for field in _SEARCH_MEMBER_FIELDS:
+            tokens.update(_search_tokens(m.get(field)))
+    return sorted(tokens)
+
+
+def _init_registration_search_indexes(db):
+    _ensure_index(db.team_registrations, "search_tokens")
+    _ensure_index(
+        db.team_registrations,
+        [("team_name", "text"), ("members.name", "text"), ("members.email", "text"),
+         ("members.institution", "text"), ("members.program", "text")],
+        name="registration_search",
+        weights={"team_name": 5, "members.name": 3},
+        default_language="none",  # no stemming or stop words: these are names
+    )
+
+
+def _backfill_member_emails(db) -> None:
+    """Add member_emails / team_name_key / search_tokens to registrations written
+    before they existed."""
+    ops = [
+        UpdateOne({"_id": row["_id"]}, {"$set": {
+            "member_emails": _member_emails(row.get("members")),
+            "team_name_key": _normalize_team_name(row.get("team_name")),
+            "search_tokens": _registration_search_tokens(row.get("team_name"), row.get("members")),
+        }})
+        for row in db.team_registrations.find(
+            {"$or": [{"member_emails": {"$exists": False}}, {"team_name_key": {"$exists": False}},
+                     {"search_tokens": {"$exists": False}}]},
+            {"members": 1, "team_name": 1},
+        )
+    ]
+    if ops:
+        db.team_registrations.bulk_write(ops, ordered=False)
+        print(f"Backfilled member_emails/team_name_key/search_tokens on {len(ops)} registration(s).")
+
+
+def _raise_registration_conflict(team_name: str, members: list, exc: DuplicateKeyError,
+                                 exclude_id: Any = None):
+    """Turn a unique-index violation into a RegistrationConflictError with field detail."""
+    conflicts = find_registration_conflicts(
+        team_name, [m.get("email") for m in members or []], exclude_id=exclude_id)
+    if not conflicts["team_name"] and not conflicts["emails"]:
+        # The clashing registration was withdrawn meanwhile; report what the index saw
+        key = (exc.details or {}).get("keyValue") or {}
+        if "member_emails" in key:
+            conflicts["emails"][key["member_emails"]] = "another team"
+        else:
+            conflicts["team_name"] = True
+    raise RegistrationConflictError(conflicts) from exc
+
+
+def _registration_doc(team_name: str, project_name: str, description: str,
+                      members: list, contact_email: str) -> Dict[str, Any]:
+    return {
         "team_name": team_name.strip(),
+        "team_name_key": _normalize_team_name(team_name),
         "project_name": project_name.strip(),
         "description": description.strip(),
         "members": members,  # list of {name, email}
+        "member_emails": _member_emails(members),
+        "search_tokens": _registration_search_tokens(team_name, members),
         "contact_email": contact_email.strip().lower(),
         "status": "pending",
         "created_at": datetime.utcnow(),
         "admin_notes": "",
         "competitor_id": None,
     }
-    result = db.team_registrations.insert_one(doc)
+
+
+def register_team(team_name: str, project_name: str, description: str, members: list, contact_email: str) -> str:
+    """Submit a new team registration (public, no auth required).
+
+    A single insert: the unique indexes reject a taken team name or member
+    email, reported as RegistrationConflictError."""
+    db = get_db()
+    _check_registration_conflicts(team_name, members)
+    doc = _registration_doc(team_name, project_name, description, members, contact_email)
+    try:
+        result = db.team_registrations.insert_one(doc)
+    except DuplicateKeyError as exc:
+        _raise_registration_conflict(team_name, members, exc)
+    _email_index().put(doc)
     get_team_registrations.clear()
+    get_registrations_page.clear()
     get_bookable_team_names.clear()
     return str(result.inserted_id)
 
@@ -530,6 +758,88 @@ def get_team_registrations(status: Optional[str] = None):
     return [_doc_with_id(r) for r in rows]
 
 
+@st.cache_data(ttl=30)
+def get_registrations_page(status: Optional[str] = None, search: str = "",
+                           page: int = 0, page_size: int = 25) -> Dict[str, Any]:
+    """One page of registrations for the admin table, oldest first.
+
+    Status and search are applied in the query, so only `page_size` documents
+    ever leave the database. `search` keeps registrations where every word
+    typed is the start of a word in the team name or a member's name, email,
+    institution or program. Returns {"rows": [...], "total": matching registrations}."""
+    db = get_db()
+    query: Dict[str, Any] = {}
+    if status:
+        query["status"] = status
+    if _search_tokens(search):
+        query.update(_prefix_filter(search))
+    total = db.team_registrations.count_documents(query)
+    rows = (
+        db.team_registrations.find(query)
+        .sort([("created_at", ASCENDING), ("_id", ASCENDING)])
+        .skip(max(page, 0) * page_size)
+        .limit(page_size)
+    )
+    return {"rows": [_doc_with_id(r) for r in rows], "total": total}
+
+
+def _prefix_filter(search: str) -> Dict[str, Any]:
+    """Every search word must prefix some token — anchored regexes, so each is an index range scan."""
+    return {"$and": [{"search_tokens": {"$regex": "^" + re.escape(t)}} for t in _search_tokens(search)]}
+
+
+def search_registrations(search: str, limit: int = 10) -> list:
+    """Ranked registration search for the admin "find" box.
+
+    Registrations where every word typed prefixes one of their words come
+    first (so results appear while a word is still half typed), ranked by how
+    many words matched exactly and whether they hit the team name. Remaining
+    places are filled from the text index, which matches any of the words.
+    Each result carries `matched_members`: the members the words point at."""
+    words = _search_tokens(search)
+    if not words:
+        return []
+    db = get_db()
+    fields = {"team_name": 1, "status": 1, "members": 1, "search_tokens": 1}
+
+    def rank(doc):
+        name_tokens = set(_search_tokens(doc.get("team_name")))
+        tokens = set(doc.get("search_tokens") or [])
+        return sum(2 * (w in name_tokens) + (w in tokens) for w in words)
+
+    hits = list(db.team_registrations.find(_prefix_filter(search), fields).limit(limit * 5))
+    hits.sort(key=rank, reverse=True)
+    hits = hits[:limit]
+    if len(hits) < limit:
+        seen = [h["_id"] for h in hits]
+        try:
+            hits += list(
+                db.team_registrations.find(
+                    {"$text": {"$search": " ".join(words)}, "_id": {"$nin": seen}},
+                    {**fields, "score": {"$meta": "textScore"}},
+                )
+                .sort([("score", {"$meta": "textScore"})])
+                .limit(limit - len(hits))
+            )
+        except OperationFailure as exc:  # e.g. the text index could not be built
+            print(f"search_registrations: text search unavailable: {exc}")
+
+    def words_hit(member):
+        tokens = [t for f in _SEARCH_MEMBER_FIELDS for t in _search_tokens(member.get(f))]
+        return sum(any(t.startswith(w) for t in tokens) for w in words)
+
+    results = []
+    for doc in hits:
+        doc.pop("search_tokens", None)
+        doc.pop("score", None)
+        members = doc.get("members") or []
+        hit = [words_hit(m) for m in members]
+        best = max(hit, default=0)
+        doc["matched_members"] = [m for m, n in zip(members, hit) if best and n == best]
+        results.append(_doc_with_id(doc))
+    return results
+
+
 def approve_registration_as_competitor(reg_id: Any) -> str:
     """Approve a registration and create a competitor entry. Returns competitor_id."""
     db = get_db()
@@ -541,15 +851,18 @@ def approve_registration_as_competitor(reg_id: Any) -> str:
         notes_text += f"\n{reg['description']}"
     result = db.competitors.insert_one({"name": reg["team_name"], "notes": notes_text})
     competitor_id = result.inserted_id
-    db.team_registrations.update_one(
+    updated = db.team_registrations.find_one_and_update(
         {"_id": _oid(reg_id)},
         {"$set": {
             "status": "approved",
             "competitor_id": competitor_id,
             "reviewed_at": datetime.utcnow(),
         }},
+        return_document=ReturnDocument.AFTER,
     )
+    _email_index().put(updated)
     get_team_registrations.clear()
+    get_registrations_page.clear()
     get_approved_team_names.clear()
     get_bookable_team_names.clear()
     get_leaderboard.clear()
@@ -563,32 +876,69 @@ def reject_registration(reg_id: Any, admin_notes: str = ""):
         {"_id": _oid(reg_id)},
         {"$set": {"status": "rejected", "admin_notes": admin_notes, "reviewed_at": datetime.utcnow()}},
     )
+    _email_index().drop(reg_id)
     get_team_registrations.clear()
+    get_registrations_page.clear()
     get_bookable_team_names.clear()
 
 
 def update_registration(reg_id: Any, team_name: str = None, contact_email: str = None,
                         admin_notes: str = None, status: str = None, members: list = None):
-    """Update editable fields on a team registration."""
+    """Update editable fields on a team registration.
+    Raises RegistrationConflictError if the result clashes with another team,
+    and ValueError if the registration no longer exists."""
     db = get_db()
     patch: Dict[str, Any] = {}
     if team_name     is not None: patch["team_name"]    = team_name.strip()
+    if team_name     is not None: patch["team_name_key"] = _normalize_team_name(team_name)
     if contact_email is not None: patch["contact_email"] = contact_email.strip().lower()
     if admin_notes   is not None: patch["admin_notes"]  = admin_notes.strip()
     if status        is not None: patch["status"]       = status
     if members       is not None: patch["members"]      = members
-    if patch:
-        db.team_registrations.update_one({"_id": _oid(reg_id)}, {"$set": patch})
-        get_team_registrations.clear()
-        get_bookable_team_names.clear()
-        get_approved_team_names.clear()
+    if members       is not None: patch["member_emails"] = _member_emails(members)
+    if not patch:
+        return
+    current: Dict[str, Any] = {}
+    needs_check = ({"team_name", "members", "status"} & patch.keys()
+                   and not _registration_uniqueness_enforced())
+    if needs_check or ("team_name" in patch) != ("members" in patch):
+        current = db.team_registrations.find_one(
+            {"_id": _oid(reg_id)}, {"team_name": 1, "members": 1, "status": 1})
+        if current is None:
+            raise ValueError("Registration not found")
+    if needs_check and patch.get("status", current.get("status")) in _ACTIVE_REGISTRATION["status"]["$in"]:
+        _check_registration_conflicts(patch.get("team_name", current.get("team_name", "")),
+                                      patch.get("members", current.get("members")),
+                                      exclude_id=reg_id)
+    if "team_name" in patch or "members" in patch:
+        # Same $set as the fields they index; the unpatched one comes from current
+        patch["search_tokens"] = _registration_search_tokens(
+            patch.get("team_name", current.get("team_name")),
+            patch.get("members", current.get("members")))
+    try:
+        updated = db.team_registrations.find_one_and_update(
+            {"_id": _oid(reg_id)}, {"$set": patch}, return_document=ReturnDocument.AFTER)
+    except DuplicateKeyError as exc:
+        current = db.team_registrations.find_one({"_id": _oid(reg_id)}, {"team_name": 1, "members": 1}) or {}
+        _raise_registration_conflict(patch.get("team_name", current.get("team_name", "")),
+                                     patch.get("members", current.get("members")), exc,
+                                     exclude_id=reg_id)
+    if updated is None:
+        raise ValueError("Registration not found")
+    _email_index().put(updated)
+    get_team_registrations.clear()
+    get_registrations_page.clear()
+    get_bookable_team_names.clear()
+    get_approved_team_names.clear()
 
 
 def delete_registration(reg_id: Any) -> None:
     """Permanently remove a team registration document."""
     db = get_db()
     db.team_registrations.delete_one({"_id": _oid(reg_id)})
+    _email_index().drop(reg_id)
     get_team_registrations.clear()
+    get_registrations_page.clear()
     get_bookable_team_names.clear()
     get_approved_team_names.clear()
 
@@ -611,81 +961,407 @@ def contact_email_registered(email: str) -> bool:
     }))
 
 
+def find_registration_conflicts(team_name: str, emails: list, exclude_id: Any = None) -> Dict[str, Any]:
+    """Check a prospective registration against pending/approved ones in one query.
+
+    Returns {"team_name": bool, "emails": {normalized_email: existing team_name}}
+    — "team_name" is True when the name is taken, "emails" lists each member
+    email that already belongs to another team. `exclude_id` skips the
+    registration being edited."""
+    db = get_db()
+    wanted = _member_emails([{"email": e} for e in emails])
+    name_key = _normalize_team_name(team_name)
+    clauses: list = [{"team_name_key": name_key}]
+    if wanted:
+        clauses.append({"member_emails": {"$in": wanted}})
+    query: Dict[str, Any] = {**_ACTIVE_REGISTRATION, "$or": clauses}
+    if exclude_id is not None:
+        query["_id"] = {"$ne": _oid(exclude_id)}
+    conflicts: Dict[str, Any] = {"team_name": False, "emails": {}}
+    for row in db.team_registrations.find(
+        query,
+        {"team_name": 1, "team_name_key": 1, "member_emails": 1},
+    ):
+        if row.get("team_name_key") == name_key:
+            conflicts["team_name"] = True
+        for email in set(row.get("member_emails") or []) & set(wanted):
+            conflicts["emails"].setdefault(email, row.get("team_name", "another team"))
+    return conflicts
+
+
+def find_existing_registrations(team_names: list, emails: list) -> Dict[str, Any]:
+    """Batch form of find_registration_conflicts for imports — still one query.
+
+    Returns {"team_names": set of the given names already taken,
+             "emails": {normalized_email: existing team_name}}."""
+    db = get_db()
+    by_key = {_normalize_team_name(n): n for n in team_names}
+    wanted = _member_emails([{"email": e} for e in emails])
+    taken: Dict[str, Any] = {"team_names": set(), "emails": {}}
+    if not by_key and not wanted:
+        return taken
+    for row in db.team_registrations.find(
+        {**_ACTIVE_REGISTRATION, "$or": [{"team_name_key": {"$in": list(by_key)}},
+                                         {"member_emails": {"$in": wanted}}]},
+        {"team_name": 1, "team_name_key": 1, "member_emails": 1},
+    ):
+        if row.get("team_name_key") in by_key:
+            taken["team_names"].add(by_key[row["team_name_key"]])
+        for email in set(row.get("member_emails") or []) & set(wanted):
+            taken["emails"].setdefault(email, row.get("team_name", "another team"))
+    return taken
+
+
+def bulk_register_teams(teams: list) -> Dict[str, Any]:
+    """Admin import: register many teams with one insert_many(ordered=False).
+
+    `teams` is a list of (team_name, members). Rows the unique indexes reject
+    (a name or email taken since validation) are skipped and reported.
+    Returns {"inserted": [team_name, ...], "failed": {team_name: reason}}."""
+    db = get_db()
+    docs = [_registration_doc(name, "", "", members, "") for name, members in teams]
+    failed: Dict[str, str] = {}
+    if docs and not _registration_uniqueness_enforced():
+        # No unique index to reject clashes: check against the database and
+        # within the batch before inserting
+        taken = find_existing_registrations([d["team_name"] for d in docs],
+                                            [e for d in docs for e in d["member_emails"]])
+        names = {_normalize_team_name(n) for n in taken["team_names"]}
+        emails = set(taken["emails"])
+        keep = []
+        for d in docs:
+            clash = next((e for e in d["member_emails"] if e in emails), None)
+            if d["team_name_key"] in names:
+                failed[d["team_name"]] = "team name is already registered"
+            elif clash:
+                failed[d["team_name"]] = f"email {clash} is already registered"
+            else:
+                keep.append(d)
+                names.add(d["team_name_key"])
+                emails.update(d["member_emails"])
+        docs = keep
+    if docs:
+        try:
+            db.team_registrations.insert_many(docs, ordered=False)
+        except BulkWriteError as exc:
+            for err in exc.details.get("writeErrors", []):
+                key = err.get("keyValue") or {}
+                if err.get("code") != 11000:
+                    reason = err.get("errmsg", "could not be saved")  # e.g. validation failure
+                elif "member_emails" in key:
+                    reason = f"email {key['member_emails']} is already registered"
+                else:
+                    reason = "team name is already registered"
+                failed[docs[err["index"]]["team_name"]] = reason
+    inserted = [d for d in docs if d["team_name"] not in failed]
+    index = _email_index()
+    for doc in inserted:
+        index.put(doc)
+    get_team_registrations.clear()
+    get_registrations_page.clear()
+    get_bookable_team_names.clear()
+    print(f"bulk_register_teams: imported {len(inserted)} team(s), {len(failed)} rejected")
+    return {"inserted": [d["team_name"] for d in inserted], "failed": failed}
+
+
 def get_team_by_member_email(email: str):
     """Return the registration doc where any member's email matches (pending/approved), or None.
-    Comparison is case-insensitive."""
-    import re
-    db = get_db()
-    pattern = re.compile(r"^" + re.escape(email.strip()) + r"$", re.IGNORECASE)
-    row = db.team_registrations.find_one({
-        "members.email": pattern,
-        "status": {"$in": ["pending", "approved"]},
-    })
-    return _doc_with_id(row) if row else None
+    Comparison is case-insensitive. Served from the in-process email index."""
+    return _email_index().lookup(_normalize_email(email))
+
+
+# ── Member email index ──────────────────────────────────────────────────────────
+# The public booking/scheduling pages look a team up by email on every rerun
+# (i.e. every keystroke). A process-wide email → registration map, loaded once,
+# turns that into a dict hit. Registration writes in this process patch it
+# directly; on a replica set a change-stream thread applies writes made by other
+# app instances. Unknown emails are cached as misses for a short while and then
+# re-checked against the database, which also covers instances that can't watch
+# a change stream.
+
+_EMAIL_MISS_TTL_SECONDS = 30
+
+
+class _EmailIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_email: Dict[str, Dict[str, Any]] = {}
+        self._emails_by_id: Dict[str, list] = {}
+        self._misses: Dict[str, float] = {}
+
+    def put(self, row: Optional[Dict[str, Any]]) -> None:
+        """Add/refresh one registration (raw Mongo doc); inactive ones are removed."""
+        if not row:
+            return
+        reg = _doc_with_id(row)
+        with self._lock:
+            self._drop_locked(reg["id"])
+            if reg.get("status") not in ("pending", "approved"):
+                return
+            emails = reg.get("member_emails") or _member_emails(reg.get("members"))
+            self._emails_by_id[reg["id"]] = emails
+            for email in emails:
+                self._by_email[email] = reg
+                self._misses.pop(email, None)
+
+    def drop(self, reg_id: Any) -> None:
+        with self._lock:
+            self._drop_locked(str(reg_id))
+
+    def _drop_locked(self, reg_id: str) -> None:
+        for email in self._emails_by_id.pop(reg_id, []):
+            if self._by_email.get(email, {}).get("id") == reg_id:
+                del self._by_email[email]
+
+    def lookup(self, email: str) -> Optional[Dict[str, Any]]:
+        if not email:
+            return None
+        with self._lock:
+            reg = self._by_email.get(email)
+            if reg is not None:
+                return dict(reg)
+            if self._misses.get(email, 0) > time.monotonic():
+                return None
+        row = get_db().team_registrations.find_one(
+            {"member_emails": email, **_ACTIVE_REGISTRATION})
+        if row:
+            self.put(row)
+            return _doc_with_id(row)
+        with self._lock:
+            self._misses[email] = time.monotonic() + _EMAIL_MISS_TTL_SECONDS
+        return None
+
+
+def _watch_registrations(index: _EmailIndex) -> None:
+    """Apply team_registrations change events from other instances to `index`."""
+    resume_token = None
+    while True:
+        try:
+            with get_db().team_registrations.watch(
+                full_document="updateLookup", resume_after=resume_token
+            ) as stream:
+                for change in stream:
+                    resume_token = stream.resume_token
+                    if change["operationType"] == "delete":
+                        index.drop(change["documentKey"]["_id"])
+                    elif change.get("fullDocument"):
+                        index.put(change["fullDocument"])
+        except Exception as exc:
+            print(f"Registration change stream interrupted, reconnecting: {exc}")
+            time.sleep(5)
+
+
+@st.cache_resource
+def _email_index() -> _EmailIndex:
+    index = _EmailIndex()
+    for row in get_db().team_registrations.find(_ACTIVE_REGISTRATION):
+        index.put(row)
+    if _transactions_supported():  # change streams need a replica set too
+        threading.Thread(target=_watch_registrations, args=(index,),
+                         name="registration-watch", daemon=True).start()
+    return index
 
 
 # ── Prelim Booking constants ────────────────────────────────────────────────────
 
 PRELIM_ROOMS: list = ["N200", "N217", "ABSC Lounge 3rd Floor"]
 
-PRELIM_SLOTS: list = [
-    "2:30 PM – 2:40 PM",
-    "2:40 PM – 2:50 PM",
-    "2:50 PM – 3:00 PM",
-    "3:00 PM – 3:10 PM",
-    "3:10 PM – 3:20 PM",
-    "3:20 PM – 3:30 PM",
-]
-
 
 # ── Prelim Booking DB helpers ───────────────────────────────────────────────────
 
 def _init_booking_indexes(db):
     """Create unique indexes for the prelim_bookings collection."""
+    # Partial so that legacy label-only docs (pre slot_id backfill) don't collide
     _ensure_index(db.prelim_bookings,
-        [("slot_label", ASCENDING), ("room", ASCENDING)], unique=True)
+        [("slot_id", ASCENDING), ("room", ASCENDING)], unique=True,
+        partialFilterExpression={"slot_id": {"$exists": True}})
     _ensure_index(db.prelim_bookings, "team_name", unique=True)
 
 
+BOOKING_HISTORY_PAGE_SIZE: int = 50
+_DEFAULT_HISTORY_RETENTION_DAYS = 180
+
+
+def _get_history_retention_days() -> Optional[int]:
+    """Days to keep prelim booking audit events, from [booking]
+    history_retention_days in secrets (default 180). 0 keeps events forever."""
+    try:
+        days = int(st.secrets.booking.history_retention_days)
+    except Exception:
+        days = _DEFAULT_HISTORY_RETENTION_DAYS
+    return days if days > 0 else None
+
+
 def _init_booking_history_indexes(db):
     """Create indexes for the prelim_booking_history audit collection."""
-    _ensure_index(db.prelim_booking_history, [("timestamp", ASCENDING)])
-    _ensure_index(db.prelim_booking_history, [("team_name",  ASCENDING)])
+    # Keyset pagination walks (timestamp, _id) newest first; _id breaks ties.
+    _ensure_index(db.prelim_booking_history, [("timestamp", -1), ("_id", -1)])
+    _ensure_index(db.prelim_booking_history,
+        [("team_name", ASCENDING), ("timestamp", -1), ("_id", -1)])
+    _ensure_index(db.prelim_booking_history,
+        [("action", ASCENDING), ("timestamp", -1), ("_id", -1)])
+    # Retention: each event carries its own expiry, set when it is logged
+    _ensure_index(db.prelim_booking_history, "expires_at", expireAfterSeconds=0)
+    # Events of one admin bulk edit share a batch id (see admin_bulk_update_bookings)
+    _ensure_index(db.prelim_booking_history, "batch", sparse=True)
+
+
+def _init_session_history_indexes(db):
+    """Indexes for session_booking_history, the mentor/robot audit log."""
+    _ensure_index(db.session_booking_history,
+        [("kind", ASCENDING), ("timestamp", -1), ("_id", -1)])
+    _ensure_index(db.session_booking_history,
+        [("team_name", ASCENDING), ("timestamp", -1), ("_id", -1)])
+    _ensure_index(db.session_booking_history, "expires_at", expireAfterSeconds=0)
+    _ensure_index(db.session_booking_history, "batch", sparse=True)
+
+
+def _backfill_history_expiry(db) -> None:
+    """Give audit events logged before retention existed an expires_at, and drop
+    the single-field indexes superseded by the keyset indexes."""
+    days = _get_history_retention_days()
+    if days:
+        db.prelim_booking_history.update_many(
+            {"expires_at": {"$exists": False}},
+            [{"$set": {"expires_at": {"$add": ["$timestamp", days * 86400 * 1000]}}}],
+        )
+    _drop_legacy_indexes(db.prelim_booking_history, ["timestamp_1", "team_name_1"])
 
 
-def log_booking_event(
+def _booking_event_doc(
     team_name: str,
-    slot_label: str,
+    slot_id: Optional[int],
     room: str,
     action: str,
-    previous_slot: Optional[str] = None,
+    previous_slot_id: Optional[int] = None,
     previous_room: Optional[str] = None,
-):
-    """Append an entry to the prelim booking audit log.
-
-    action values: 'booked', 'switched', 'admin_updated', 'admin_deleted'
-    """
-    db = get_db()
+) -> Dict[str, Any]:
     doc: Dict[str, Any] = {
         "team_name": team_name,
-        "slot_label": slot_label,
+        "slot_id": slot_id,
+        "slot_label": slot_label(slot_id),
         "room": room,
         "action": action,
         "timestamp": datetime.utcnow(),
     }
-    if previous_slot is not None:
-        doc["previous_slot"] = previous_slot
+    if previous_slot_id is not None:
+        doc["previous_slot_id"] = previous_slot_id
+        doc["previous_slot"] = slot_label(previous_slot_id)
     if previous_room is not None:
         doc["previous_room"] = previous_room
-    db.prelim_booking_history.insert_one(doc)
+    days = _get_history_retention_days()
+    if days:
+        doc["expires_at"] = doc["timestamp"] + timedelta(days=days)
+    return doc
+
+
+def _session_event_doc(kind: str, booking: Dict[str, Any], action: str,
+                       previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Audit event for a mentor/robot booking, shaped like the prelim events
+    plus `kind` (and `mentor_name` for mentor sessions). `previous` is the
+    booking before an update."""
+    def where(b):
+        if kind == "mentor":
+            return MENTOR_ROOM_MAP.get(b.get("mentor_name"), "")
+        return b.get("room", "")
+
+    doc = _booking_event_doc(
+        booking["team_name"], booking.get("slot_id"), where(booking), action,
+        previous.get("slot_id") if previous else None,
+        where(previous) if previous else None,
+    )
+    doc["kind"] = kind
+    if kind == "mentor":
+        doc["mentor_name"] = booking.get("mentor_name")
+        if previous:
+            doc["previous_mentor_name"] = previous.get("mentor_name")
+    return doc
+
+
+def _history_collection(db, kind: str):
+    """Where `kind` booking events are logged."""
+    return db.prelim_booking_history if kind == "prelim" else db.session_booking_history
+
+
+def log_booking_event(
+    team_name: str,
+    slot_id: Optional[int],
+    room: str,
+    action: str,
+    previous_slot_id: Optional[int] = None,
+    previous_room: Optional[str] = None,
+):
+    """Append an entry to the prelim booking audit log.
+
+    action values: 'booked', 'switched', 'admin_updated', 'admin_deleted', 'auto_scheduled'
+    Slot labels are stored next to the ids so the log stays readable on its own.
+    """
+    db = get_db()
+    db.prelim_booking_history.insert_one(_booking_event_doc(
+        team_name, slot_id, room, action, previous_slot_id, previous_room,
+    ))
+    get_booking_history_page.clear()
+    get_booking_history_teams.clear()
+
+
+def _booking_history_query(team_name: Optional[str], action: Optional[str]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+    if team_name:
+        query["team_name"] = team_name
+    if action:
+        query["action"] = action
+    return query
 
 
 @st.cache_data(ttl=30)
-def get_booking_history() -> list:
-    """Return all prelim booking audit-log entries, newest first."""
+def get_booking_history_page(
+    team_name: Optional[str] = None,
+    action: Optional[str] = None,
+    after: Optional[tuple] = None,
+    limit: int = BOOKING_HISTORY_PAGE_SIZE,
+) -> tuple:
+    """Return (events, next_cursor): one page of the prelim booking audit log,
+    newest first, optionally filtered by team and/or action.
+
+    Keyset pagination: `after` is the cursor returned with the previous page,
+    i.e. the (timestamp, id) of its last event, so every page is a bounded index
+    range scan no matter how deep it is. next_cursor is None on the last page."""
+    db = get_db()
+    query = _booking_history_query(team_name, action)
+    if after:
+        ts, last_id = after
+        query["$or"] = [
+            {"timestamp": {"$lt": ts}},
+            {"timestamp": ts, "_id": {"$lt": _oid(last_id)}},
+        ]
+    rows = list(
+        db.prelim_booking_history.find(query)
+        .sort([("timestamp", -1), ("_id", -1)])
+        .limit(limit + 1)
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = (rows[-1]["timestamp"], str(rows[-1]["_id"]))
+    return [_doc_with_id(r) for r in rows], next_cursor
+
+
+def iter_booking_history(team_name: Optional[str] = None, action: Optional[str] = None):
+    """Yield every matching audit event, newest first, streamed from the cursor
+    (for CSV export — nothing is cached or materialised up front)."""
     db = get_db()
-    rows = db.prelim_booking_history.find().sort("timestamp", -1)
-    return [_doc_with_id(r) for r in rows]
+    rows = db.prelim_booking_history.find(
+        _booking_history_query(team_name, action)
+    ).sort([("timestamp", -1), ("_id", -1)]).batch_size(1000)
+    for row in rows:
+        yield _doc_with_id(row)
+
+
+@st.cache_data(ttl=60)
+def get_booking_history_teams() -> list:
+    """Sorted team names that appear in the booking audit log (for filters)."""
+    db = get_db()
+    return sorted(db.prelim_booking_history.distinct("team_name"))
 
 
 @st.cache_data(ttl=30)
@@ -711,7 +1387,7 @@ def get_all_bookings() -> list:
     """Return all prelim bookings sorted by slot then room."""
     db = get_db()
     rows = db.prelim_bookings.find().sort(
-        [("slot_label", ASCENDING), ("room", ASCENDING)]
+        [("slot_id", ASCENDING), ("room", ASCENDING)]
     )
     return [_doc_with_id(r) for r in rows]
 
@@ -724,32 +1400,33 @@ def get_booking_by_team_name(team_name: str) -> Optional[Dict[str, Any]]:
 
 
 @st.cache_data(ttl=15)
-def get_booked_slot_map() -> Dict[str, str]:
-    """Return dict keyed by 'slot_label||room' → team_name for all booked slots."""
+def get_booked_slot_map() -> Dict[tuple, str]:
+    """Return dict keyed by (slot_id, room) → team_name for all booked slots."""
     db = get_db()
-    result: Dict[str, str] = {}
-    for row in db.prelim_bookings.find():
-        key = f"{row['slot_label']}||{row['room']}"
-        result[key] = row["team_name"]
+    result: Dict[tuple, str] = {}
+    for row in db.prelim_bookings.find({}, {"slot_id": 1, "room": 1, "team_name": 1}):
+        result[(row.get("slot_id"), row["room"])] = row["team_name"]
     return result
 
 
-def create_booking(team_name: str, slot_label: str, room: str) -> str:
+def create_booking(team_name: str, slot_id: int, room: str) -> str:
     """Create a new booking. Raises ValueError on conflict."""
     db = get_db()
+    _require_slot(slot_id, "prelim")
     # Check if team already has a booking
     existing = db.prelim_bookings.find_one({"team_name": team_name})
     if existing:
         raise ValueError(f"Team '{team_name}' already has a booking. Use switch_booking to change it.")
     doc = {
         "team_name": team_name,
-        "slot_label": slot_label,
+        "slot_id": slot_id,
+        "slot_label": slot_label(slot_id),
         "room": room,
         "booked_at": datetime.utcnow(),
     }
     try:
         result = db.prelim_bookings.insert_one(doc)
-        log_booking_event(team_name, slot_label, room, "booked")
+        log_booking_event(team_name, slot_id, room, "booked")
         get_booked_slot_map.clear()
         get_all_bookings.clear()
         get_prelim_slot_map.clear()
@@ -763,82 +1440,89 @@ def create_booking(team_name: str, slot_label: str, room: str) -> str:
         )
 
 
-def switch_booking(team_name: str, new_slot_label: str, new_room: str) -> str:
+def switch_booking(team_name: str, new_slot_id: int, new_room: str) -> str:
     """Switch a team's booking to a new slot/room using a single atomic update.
     Replaces the old delete→insert pattern to eliminate the window where another
     team could claim the freed slot between the two operations."""
     db = get_db()
+    _require_slot(new_slot_id, "prelim")
     # Capture old booking details for the audit log
     old = db.prelim_bookings.find_one({"team_name": team_name})
     if not old:
         raise ValueError(f"No existing booking found for '{team_name}'.")
-    old_slot = old["slot_label"]
+    old_slot = old.get("slot_id")
     old_room = old["room"]
-    # Single atomic update — MongoDB enforces the unique (slot_label, room) index
+    # Single atomic update — MongoDB enforces the unique (slot_id, room) index
     # here too, so a concurrent booking of the same target slot will be rejected.
     try:
         db.prelim_bookings.update_one(
             {"team_name": team_name},
-            {"$set": {"slot_label": new_slot_label, "room": new_room,
-                      "booked_at": datetime.utcnow()}},
+            {"$set": {"slot_id": new_slot_id, "slot_label": slot_label(new_slot_id),
+                      "room": new_room, "booked_at": datetime.utcnow()}},
         )
-        log_booking_event(team_name, new_slot_label, new_room, "switched", old_slot, old_room)
+        log_booking_event(team_name, new_slot_id, new_room, "switched", old_slot, old_room)
         get_booked_slot_map.clear()
         get_all_bookings.clear()
         get_prelim_slot_map.clear()
         get_teams_booked_in_room.clear()
-        return str(old["_id"])
     except DuplicateKeyError:
         raise ValueError(
             "⚡ Oops! Someone else just switched to that slot at the same time. "
             "Please pick another time from the available ones."
         )
+    if (old_slot, old_room) != (new_slot_id, new_room):
+        _promote_waitlist(db, "prelim", old_slot, old_room)
+    return str(old["_id"])
 
 
-def admin_update_booking(booking_id: Any, slot_label: str, room: str):
+def admin_update_booking(booking_id: Any, slot_id: int, room: str):
     """Admin: update any booking's slot/room. Raises ValueError on slot conflict."""
     db = get_db()
+    _require_slot(slot_id, "prelim")
     # Capture current booking details for the audit log
     current = db.prelim_bookings.find_one({"_id": _oid(booking_id)})
     # Check the target slot isn't taken by a different booking
     conflict = db.prelim_bookings.find_one({
-        "slot_label": slot_label,
+        "slot_id": slot_id,
         "room": room,
         "_id": {"$ne": _oid(booking_id)},
     })
     if conflict:
-        raise ValueError(f"Slot '{slot_label}' in room {room} is already booked by '{conflict['team_name']}'.")
+        raise ValueError(
+            f"Slot '{slot_label(slot_id)}' in room {room} is already booked by '{conflict['team_name']}'."
+        )
     db.prelim_bookings.update_one(
         {"_id": _oid(booking_id)},
-        {"$set": {"slot_label": slot_label, "room": room}},
+        {"$set": {"slot_id": slot_id, "slot_label": slot_label(slot_id), "room": room}},
     )
     if current:
         log_booking_event(
-            current["team_name"], slot_label, room, "admin_updated",
-            current.get("slot_label"), current.get("room"),
+            current["team_name"], slot_id, room, "admin_updated",
+            current.get("slot_id"), current.get("room"),
         )
     get_booked_slot_map.clear()
     get_all_bookings.clear()
     get_prelim_slot_map.clear()
     get_teams_booked_in_room.clear()
-    get_booking_history.clear()
+    if current and (current.get("slot_id"), current.get("room")) != (slot_id, room):
+        _promote_waitlist(db, "prelim", current.get("slot_id"), current.get("room"))
 
 
 def admin_delete_booking(booking_id: Any):
-    """Admin: remove a booking entirely."""
+    """Admin: remove a booking entirely. The freed slot goes to its waitlist, if any."""
     db = get_db()
-    current = db.prelim_bookings.find_one({"_id": _oid(booking_id)})
-    db.prelim_bookings.delete_one({"_id": _oid(booking_id)})
+    current = db.prelim_bookings.find_one_and_delete({"_id": _oid(booking_id)})
     if current:
         log_booking_event(
-            current["team_name"], current.get("slot_label", ""), current.get("room", ""),
+            current["team_name"], current.get("slot_id"), current.get("room", ""),
             "admin_deleted",
         )
     get_booked_slot_map.clear()
     get_all_bookings.clear()
     get_prelim_slot_map.clear()
     get_teams_booked_in_room.clear()
-    get_booking_history.clear()
+    if current:
+        _promote_waitlist(db, "prelim", current.get("slot_id"), current.get("room"))
 
 
 # ── Mentor & Robot Scheduling constants ─────────────────────────────────────────
@@ -868,52 +1552,303 @@ MENTOR_ROOM_MAP: dict = {
 # One robot per room — the room name IS the robot identifier
 SCHED_ROBOT_ROOMS: list = ["N200", "N217", "ABSC Lounge 3rd Floor"]
 
-SCHED_FRIDAY_SLOTS: list = [
-    "Fri Mar 6 \u00b7 6:20 \u2013 6:40 PM",
-    "Fri Mar 6 \u00b7 6:40 \u2013 7:00 PM",
-    "Fri Mar 6 \u00b7 7:00 \u2013 7:20 PM",
-    "Fri Mar 6 \u00b7 7:20 \u2013 7:40 PM",
-    "Fri Mar 6 \u00b7 7:40 \u2013 8:00 PM",
-]
+MAX_MENTOR_BOOKINGS: int = 2
+MAX_ROBOT_BOOKINGS: int = 2
+
+
+# ── Event schedule ──────────────────────────────────────────────────────────────
+# Every bookable time slot has a compact integer id. Bookings store the id (the
+# label is copied alongside purely for display and exports), so indexes, sorts
+# and availability lookups all work on ints. Ids increase with start time within
+# each kind, so sorting by slot_id is chronological. SCHEDULE_SLOTS is the single
+# source of slots, labels and capacities; it is not stored in the database.
+
+# March 6-7, 2026 fall before the DST change (Mar 8), so Barrie is on EST = UTC-5
+EVENT_TZ = timezone(timedelta(hours=-5))
 
-SCHED_SATURDAY_SLOTS: list = [
-    "Sat Mar 7 \u00b7 10:00 \u2013 10:20 AM",
-    "Sat Mar 7 \u00b7 10:20 \u2013 10:40 AM",
-    "Sat Mar 7 \u00b7 10:40 \u2013 11:00 AM",
-    "Sat Mar 7 \u00b7 11:00 \u2013 11:20 AM",
-    "Sat Mar 7 \u00b7 11:20 \u2013 11:40 AM",
-    "Sat Mar 7 \u00b7 11:40 AM \u2013 12:00 PM",
-    "Sat Mar 7 \u00b7 12:00 \u2013 12:20 PM",
-    "Sat Mar 7 \u00b7 12:20 \u2013 12:40 PM",
-    "Sat Mar 7 \u00b7 12:40 \u2013  1:00 PM",
-    "Sat Mar 7 \u00b7  1:00 \u2013  1:20 PM",
+
+def _slot(slot_id: int, kind: str, day: int, hour: int, minute: int,
+          minutes: int, label: str) -> Dict[str, Any]:
+    start = datetime(2026, 3, day, hour, minute, tzinfo=EVENT_TZ)
+    if kind == "prelim":
+        capacity = {"prelim": {room: 1 for room in PRELIM_ROOMS}}
+    else:
+        # One team per room per slot for both kinds, as the public grids and
+        # pickers show it; a mentor room's other mentors don't add capacity
+        capacity = {
+            "mentor": {room: 1 for room in SCHED_ROBOT_ROOMS},
+            "robot": {room: 1 for room in SCHED_ROBOT_ROOMS},
+        }
+    return {
+        "_id": slot_id,
+        "kind": kind,
+        "day": start.strftime("%a"),
+        "label": label,
+        "start": start,
+        "end": start + timedelta(minutes=minutes),
+        "capacity": capacity,
+    }
+
+
+SCHEDULE_SLOTS: list = [
+    # Prelim judging — Sat Mar 7, 10-minute slots
+    _slot(1,   "prelim",  7, 14, 30, 10, "2:30 PM – 2:40 PM"),
+    _slot(2,   "prelim",  7, 14, 40, 10, "2:40 PM – 2:50 PM"),
+    _slot(3,   "prelim",  7, 14, 50, 10, "2:50 PM – 3:00 PM"),
+    _slot(4,   "prelim",  7, 15,  0, 10, "3:00 PM – 3:10 PM"),
+    _slot(5,   "prelim",  7, 15, 10, 10, "3:10 PM – 3:20 PM"),
+    _slot(6,   "prelim",  7, 15, 20, 10, "3:20 PM – 3:30 PM"),
+    # Mentor / robot sessions — 20-minute slots
+    _slot(101, "session", 6, 18, 20, 20, "Fri Mar 6 \u00b7 6:20 \u2013 6:40 PM"),
+    _slot(102, "session", 6, 18, 40, 20, "Fri Mar 6 \u00b7 6:40 \u2013 7:00 PM"),
+    _slot(103, "session", 6, 19,  0, 20, "Fri Mar 6 \u00b7 7:00 \u2013 7:20 PM"),
+    _slot(104, "session", 6, 19, 20, 20, "Fri Mar 6 \u00b7 7:20 \u2013 7:40 PM"),
+    _slot(105, "session", 6, 19, 40, 20, "Fri Mar 6 \u00b7 7:40 \u2013 8:00 PM"),
+    _slot(106, "session", 7, 10,  0, 20, "Sat Mar 7 \u00b7 10:00 \u2013 10:20 AM"),
+    _slot(107, "session", 7, 10, 20, 20, "Sat Mar 7 \u00b7 10:20 \u2013 10:40 AM"),
+    _slot(108, "session", 7, 10, 40, 20, "Sat Mar 7 \u00b7 10:40 \u2013 11:00 AM"),
+    _slot(109, "session", 7, 11,  0, 20, "Sat Mar 7 \u00b7 11:00 \u2013 11:20 AM"),
+    _slot(110, "session", 7, 11, 20, 20, "Sat Mar 7 \u00b7 11:20 \u2013 11:40 AM"),
+    _slot(111, "session", 7, 11, 40, 20, "Sat Mar 7 \u00b7 11:40 AM \u2013 12:00 PM"),
+    _slot(112, "session", 7, 12,  0, 20, "Sat Mar 7 \u00b7 12:00 \u2013 12:20 PM"),
+    _slot(113, "session", 7, 12, 20, 20, "Sat Mar 7 \u00b7 12:20 \u2013 12:40 PM"),
+    _slot(114, "session", 7, 12, 40, 20, "Sat Mar 7 \u00b7 12:40 \u2013  1:00 PM"),
+    _slot(115, "session", 7, 13,  0, 20, "Sat Mar 7 \u00b7  1:00 \u2013  1:20 PM"),
 ]
 
-SCHED_ALL_SLOTS: list = SCHED_FRIDAY_SLOTS + SCHED_SATURDAY_SLOTS
+SLOTS_BY_ID: Dict[int, Dict[str, Any]] = {s["_id"]: s for s in SCHEDULE_SLOTS}
 
-MAX_MENTOR_BOOKINGS: int = 2
-MAX_ROBOT_BOOKINGS: int = 2
+PRELIM_SLOT_IDS: list = [s["_id"] for s in SCHEDULE_SLOTS if s["kind"] == "prelim"]
+SCHED_SLOT_IDS: list = [s["_id"] for s in SCHEDULE_SLOTS if s["kind"] == "session"]
+SCHED_FRIDAY_SLOT_IDS: list = [i for i in SCHED_SLOT_IDS if SLOTS_BY_ID[i]["day"] == "Fri"]
+SCHED_SATURDAY_SLOT_IDS: list = [i for i in SCHED_SLOT_IDS if SLOTS_BY_ID[i]["day"] == "Sat"]
+
+# Epoch seconds of each slot's start, so "has it started?" is one int comparison
+_SLOT_START_TS: Dict[int, float] = {s["_id"]: s["start"].timestamp() for s in SCHEDULE_SLOTS}
+
+
+def slot_label(slot_id: Optional[int]) -> str:
+    """Full display label for a slot id ('' if unknown)."""
+    slot = SLOTS_BY_ID.get(slot_id)
+    return slot["label"] if slot else ""
+
+
+def slot_short_label(slot_id: Optional[int]) -> str:
+    """Time-of-day part of a slot label, e.g. '6:20 – 6:40 PM'."""
+    return slot_label(slot_id).split("\u00b7", 1)[-1].strip()
+
+
+def slot_day(slot_id: Optional[int]) -> str:
+    """Three-letter weekday of a slot ('Fri' / 'Sat'), '' if unknown."""
+    slot = SLOTS_BY_ID.get(slot_id)
+    return slot["day"] if slot else ""
+
+
+def slot_has_passed(slot_id: Optional[int]) -> bool:
+    """Return True if the slot's start time is in the past (unknown slots never pass)."""
+    start = _SLOT_START_TS.get(slot_id)
+    return start is not None and time.time() >= start
+
+
+def _require_slot(slot_id: Any, kind: str) -> int:
+    """Validate that `slot_id` is a known slot of `kind`. Raises ValueError otherwise."""
+    slot = SLOTS_BY_ID.get(slot_id)
+    if slot is None or slot["kind"] != kind:
+        raise ValueError("That time slot does not exist. Please pick another.")
+    return slot_id
+
+
+def _backfill_booking_slot_ids(db) -> None:
+    """Add slot_id to bookings written when slots were keyed by label, then drop
+    the superseded label-based unique indexes."""
+    label_to_id = {s["label"]: s["_id"] for s in SCHEDULE_SLOTS}
+    for col in (db.prelim_bookings, db.mentor_bookings, db.robot_bookings):
+        ops = [
+            UpdateMany({"slot_label": label, "slot_id": {"$exists": False}},
+                       {"$set": {"slot_id": slot_id}})
+            for label, slot_id in label_to_id.items()
+        ]
+        col.bulk_write(ops, ordered=False)
+    _drop_legacy_indexes(db.prelim_bookings, ["slot_label_1_room_1"])
+    _drop_legacy_indexes(db.mentor_bookings,
+        ["mentor_name_1_slot_label_1", "team_name_1_slot_label_1"])
+    _drop_legacy_indexes(db.robot_bookings,
+        ["room_1_slot_label_1", "team_name_1_slot_label_1"])
+
+
+# ── Per-team booking quotas ─────────────────────────────────────────────────────
+# One document per (team_name, kind) holding how many sessions of that kind the
+# team currently holds. Claiming a session is a single conditional $inc, so two
+# concurrent requests from the same team can never both pass the limit check.
+# A claim whose booking never lands (the process dies in between) leaves the
+# counter one too high, so _reconcile_booking_quotas() recounts from the
+# booking collections at startup and before each auto-schedule run.
+
+_QUOTA_RECONCILE_GRACE = timedelta(minutes=5)
+
+def _init_quota_indexes(db):
+    """Create the unique index backing the booking_quotas collection."""
+    _ensure_index(db.booking_quotas,
+        [("team_name", ASCENDING), ("kind", ASCENDING)], unique=True)
+
+
+def _reserve_quota(db, kind: str, team_name: str, limit: int) -> bool:
+    """Atomically claim one unit of a team's `kind` quota ('mentor' / 'robot').
+
+    The filter only matches while count < limit. When the team is already at the
+    limit the upsert tries to insert a second quota doc and collides with the
+    unique index, which we treat as "quota exhausted". Returns True if claimed."""
+    query = {"team_name": team_name, "kind": kind, "count": {"$lt": limit}}
+    try:
+        db.booking_quotas.update_one(
+            query, {"$inc": {"count": 1}, "$set": {"updated_at": datetime.utcnow()}}, upsert=True)
+        return True
+    except DuplicateKeyError:
+        # Either the team is at the limit, or a concurrent first booking created
+        # the quota doc between our match and insert — retry once without upsert.
+        result = db.booking_quotas.update_one(
+            query, {"$inc": {"count": 1}, "$set": {"updated_at": datetime.utcnow()}})
+        return result.modified_count == 1
+
+
+def _release_quota(db, kind: str, team_name: str) -> None:
+    """Give back one unit of a team's `kind` quota (never drops below zero)."""
+    db.booking_quotas.update_one(
+        {"team_name": team_name, "kind": kind, "count": {"$gt": 0}},
+        {"$inc": {"count": -1}, "$set": {"updated_at": datetime.utcnow()}},
+    )
+
+
+def _reconcile_booking_quotas(db, kinds: tuple = ("mentor", "robot")) -> int:
+    """Reset quota counters that disagree with the bookings the team holds.
+    Counters changed within _QUOTA_RECONCILE_GRACE are left alone (their
+    booking may still be on its way), and each reset only applies if the
+    counter is unchanged since it was read. Returns the number corrected."""
+    cutoff = datetime.utcnow() - _QUOTA_RECONCILE_GRACE
+    corrected = 0
+    for kind in kinds:
+        held = {row["_id"]: row["count"] for row in _booking_collection(db, kind).aggregate(
+            [{"$group": {"_id": "$team_name", "count": {"$sum": 1}}}])}
+        ops = []
+        for quota in db.booking_quotas.find(
+                {"kind": kind, "$or": [{"updated_at": {"$lt": cutoff}}, {"updated_at": None}]}):
+            actual = held.get(quota["team_name"], 0)
+            if quota.get("count") != actual:
+                ops.append(UpdateOne(
+                    {"_id": quota["_id"], "count": quota.get("count"),
+                     "updated_at": quota.get("updated_at")},
+                    {"$set": {"count": actual}},
+                ))
+        if ops:
+            corrected += db.booking_quotas.bulk_write(ops, ordered=False).modified_count
+    if corrected:
+        print(f"booking quotas: corrected {corrected} counter(s) from the booking collections")
+    return corrected
+
+
+def _backfill_booking_quotas(db) -> None:
+    """Create quota docs for teams that booked before quotas were tracked.
+    Uses $setOnInsert so an existing (authoritative) quota doc is never clobbered."""
+    for kind, col in (("mentor", db.mentor_bookings), ("robot", db.robot_bookings)):
+        ops = [
+            UpdateOne(
+                {"team_name": row["_id"], "kind": kind},
+                {"$setOnInsert": {"count": row["count"]}},
+                upsert=True,
+            )
+            for row in col.aggregate([{"$group": {"_id": "$team_name", "count": {"$sum": 1}}}])
+        ]
+        if ops:
+            try:
+                db.booking_quotas.bulk_write(ops, ordered=False)
+            except BulkWriteError:
+                pass  # another instance backfilled the same team concurrently
+
+
+# ── Transactions ────────────────────────────────────────────────────────────────
+
+@st.cache_resource
+def _transactions_supported() -> bool:
+    """True when the server is a replica-set member or mongos (transactions need one)."""
+    try:
+        hello = get_db().client.admin.command("hello")
+    except Exception:
+        return False
+    return bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+
+
+def _run_in_transaction(db, fn):
+    """Call fn(session) inside a transaction where supported, else fn(None)."""
+    if not _transactions_supported():
+        return fn(None)
+    with db.client.start_session() as session:
+        return session.with_transaction(fn)
+
+
+# ── Team timelines ──────────────────────────────────────────────────────────────
+# A team's bookings of every kind, read straight from the booking collections:
+# one point read on prelim_bookings and one indexed range read each on the
+# (team_name, slot_id) indexes of mentor_bookings and robot_bookings. Pure
+# reads, so a timeline can never disagree with the bookings themselves.
+
+_TIMELINE_FIELDS = {"team_name": 1, "slot_id": 1, "slot_label": 1, "room": 1,
+                    "mentor_name": 1, "booked_at": 1}
+
+
+def _timeline_entry(row: Dict[str, Any]) -> Dict[str, Any]:
+    entry = _doc_with_id(row)
+    entry.pop("team_name", None)
+    if "mentor_name" in entry:
+        entry["room"] = MENTOR_ROOM_MAP.get(entry["mentor_name"], "")
+    return entry
+
+
+def get_team_timeline(team_name: str) -> Dict[str, Any]:
+    """Return {"prelim": booking | None, "mentor": [...], "robot": [...],
+    "busy_slot_ids": [...]} for a team, each booking carrying its id, slot and room."""
+    db = get_db()
+    prelim = db.prelim_bookings.find_one({"team_name": team_name}, _TIMELINE_FIELDS)
+    # slot_id in the filter lets the partial (team_name, slot_id) indexes serve it
+    query = {"team_name": team_name, "slot_id": {"$exists": True}}
+    sessions = {
+        kind: [_timeline_entry(r) for r in col.find(query, _TIMELINE_FIELDS).sort("slot_id", ASCENDING)]
+        for kind, col in (("mentor", db.mentor_bookings), ("robot", db.robot_bookings))
+    }
+    return {
+        "team_name": team_name,
+        "prelim": _timeline_entry(prelim) if prelim else None,
+        **sessions,
+        "busy_slot_ids": sorted({b["slot_id"] for b in sessions["mentor"] + sessions["robot"]}),
+    }
+
+
+def _team_busy_at(db, team_name: str, slot_id: int) -> bool:
+    """True if the team already holds a mentor or robot session at `slot_id`."""
+    query = {"team_name": team_name, "slot_id": slot_id}
+    return (db.mentor_bookings.count_documents(query, limit=1) > 0
+            or db.robot_bookings.count_documents(query, limit=1) > 0)
 
 
 # ── Scheduling DB helpers ────────────────────────────────────────────────────────
 
 def _init_scheduling_indexes(db):
     """Create unique indexes for mentor_bookings and robot_bookings collections."""
+    has_slot_id = {"partialFilterExpression": {"slot_id": {"$exists": True}}}
     _ensure_index(db.mentor_bookings,
-        [("mentor_name", ASCENDING), ("slot_label", ASCENDING)], unique=True)
+        [("mentor_name", ASCENDING), ("slot_id", ASCENDING)], unique=True, **has_slot_id)
     _ensure_index(db.mentor_bookings,
-        [("team_name",   ASCENDING), ("slot_label", ASCENDING)], unique=True)
+        [("team_name",   ASCENDING), ("slot_id", ASCENDING)], unique=True, **has_slot_id)
     _ensure_index(db.robot_bookings,
-        [("room",      ASCENDING), ("slot_label", ASCENDING)], unique=True)
+        [("room",      ASCENDING), ("slot_id", ASCENDING)], unique=True, **has_slot_id)
     _ensure_index(db.robot_bookings,
-        [("team_name", ASCENDING), ("slot_label", ASCENDING)], unique=True)
+        [("team_name", ASCENDING), ("slot_id", ASCENDING)], unique=True, **has_slot_id)
 
 
 def get_mentor_bookings_for_team(team_name: str) -> list:
     """Return all mentor bookings for a team."""
     db = get_db()
     rows = db.mentor_bookings.find({"team_name": team_name}).sort(
-        "slot_label", ASCENDING
+        "slot_id", ASCENDING
     )
     return [_doc_with_id(r) for r in rows]
 
@@ -922,7 +1857,7 @@ def get_robot_bookings_for_team(team_name: str) -> list:
     """Return all robot bookings for a team."""
     db = get_db()
     rows = db.robot_bookings.find({"team_name": team_name}).sort(
-        "slot_label", ASCENDING
+        "slot_id", ASCENDING
     )
     return [_doc_with_id(r) for r in rows]
 
@@ -932,7 +1867,7 @@ def get_all_mentor_bookings() -> list:
     """Return all mentor bookings sorted by slot then mentor."""
     db = get_db()
     rows = db.mentor_bookings.find().sort(
-        [("slot_label", ASCENDING), ("mentor_name", ASCENDING)]
+        [("slot_id", ASCENDING), ("mentor_name", ASCENDING)]
     )
     return [_doc_with_id(r) for r in rows]
 
@@ -942,45 +1877,46 @@ def get_all_robot_bookings() -> list:
     """Return all robot bookings sorted by slot then room."""
     db = get_db()
     rows = db.robot_bookings.find().sort(
-        [("slot_label", ASCENDING), ("room", ASCENDING)]
+        [("slot_id", ASCENDING), ("room", ASCENDING)]
     )
     return [_doc_with_id(r) for r in rows]
 
 
 @st.cache_data(ttl=15)
-def get_mentor_booked_map() -> Dict[str, str]:
-    """Return dict keyed by 'slot_label||mentor_name' → team_name."""
+def get_mentor_booked_map() -> Dict[tuple, str]:
+    """Return dict keyed by (slot_id, mentor_name) → team_name."""
     db = get_db()
-    result: Dict[str, str] = {}
-    for row in db.mentor_bookings.find():
-        key = f"{row['slot_label']}||{row['mentor_name']}"
-        result[key] = row["team_name"]
+    result: Dict[tuple, str] = {}
+    for row in db.mentor_bookings.find({}, {"slot_id": 1, "mentor_name": 1, "team_name": 1}):
+        result[(row.get("slot_id"), row["mentor_name"])] = row["team_name"]
     return result
 
 
 @st.cache_data(ttl=15)
-def get_robot_booked_map() -> Dict[str, str]:
-    """Return dict keyed by 'slot_label||room' → team_name."""
+def get_robot_booked_map() -> Dict[tuple, str]:
+    """Return dict keyed by (slot_id, room) → team_name."""
     db = get_db()
-    result: Dict[str, str] = {}
-    for row in db.robot_bookings.find():
-        key = f"{row['slot_label']}||{row['room']}"
-        result[key] = row["team_name"]
+    result: Dict[tuple, str] = {}
+    for row in db.robot_bookings.find({}, {"slot_id": 1, "room": 1, "team_name": 1}):
+        result[(row.get("slot_id"), row["room"])] = row["team_name"]
     return result
 
 
-def create_mentor_booking(team_name: str, mentor_name: str, slot_label: str) -> str:
+def create_mentor_booking(team_name: str, mentor_name: str, slot_id: int) -> str:
     """Create a mentor booking. Raises ValueError on limit or slot conflict."""
     db = get_db()
-    current = db.mentor_bookings.count_documents({"team_name": team_name})
-    if current >= MAX_MENTOR_BOOKINGS:
+    _require_slot(slot_id, "session")
+    if _team_busy_at(db, team_name, slot_id):
+        raise ValueError("Your team already has another session booked at this time slot.")
+    if not _reserve_quota(db, "mentor", team_name, MAX_MENTOR_BOOKINGS):
         raise ValueError(
             f"Your team has already booked {MAX_MENTOR_BOOKINGS} mentor sessions (the maximum)."
         )
     doc = {
         "team_name": team_name,
         "mentor_name": mentor_name,
-        "slot_label": slot_label,
+        "slot_id": slot_id,
+        "slot_label": slot_label(slot_id),
         "booked_at": datetime.utcnow(),
     }
     try:
@@ -989,163 +1925,956 @@ def create_mentor_booking(team_name: str, mentor_name: str, slot_label: str) ->
         get_all_mentor_bookings.clear()
         return str(result.inserted_id)
     except DuplicateKeyError:
+        _release_quota(db, "mentor", team_name)
         raise ValueError(
             f"That slot is no longer available for {mentor_name}. Please choose another."
         )
 
 
-def create_mentor_booking_room(team_name: str, room: str, slot_label: str) -> str:
+def create_mentor_booking_room(team_name: str, room: str, slot_id: int) -> str:
     """Book a mentor session in a specific room at a specific slot.
     Auto-assigns to any available mentor stationed in that room.
     Raises ValueError if at limit, already booked at this slot, or no mentors free in that room."""
     db = get_db()
-    current = db.mentor_bookings.count_documents({"team_name": team_name})
-    if current >= MAX_MENTOR_BOOKINGS:
+    _require_slot(slot_id, "session")
+    if _team_busy_at(db, team_name, slot_id):
+        raise ValueError("Your team already has another session booked at this time slot.")
+    if not _reserve_quota(db, "mentor", team_name, MAX_MENTOR_BOOKINGS):
         raise ValueError(
             f"Your team has already booked {MAX_MENTOR_BOOKINGS} mentor sessions (the maximum)."
         )
-    slot_conflict = db.mentor_bookings.find_one(
-        {"team_name": team_name, "slot_label": slot_label}
-    )
-    if slot_conflict:
-        raise ValueError("Your team already has a mentor session booked at this time slot.")
-    mentors_in_room = [m for m, r in MENTOR_ROOM_MAP.items() if r == room]
-    if not mentors_in_room:
-        raise ValueError(f"No mentors are assigned to Room {room}.")
-    booked_here = {
-        r["mentor_name"]
-        for r in db.mentor_bookings.find(
-            {"slot_label": slot_label, "mentor_name": {"$in": mentors_in_room}}
-        )
-    }
-    available_mentor = next((m for m in mentors_in_room if m not in booked_here), None)
-    if not available_mentor:
-        raise ValueError(
-            f"Room {room} is fully booked at that time. Please choose a different slot or room."
-        )
-    doc = {
-        "team_name": team_name,
-        "mentor_name": available_mentor,
-        "slot_label": slot_label,
-        "booked_at": datetime.utcnow(),
-    }
     try:
-        result = db.mentor_bookings.insert_one(doc)
-        get_mentor_booked_map.clear()
-        get_all_mentor_bookings.clear()
-        return str(result.inserted_id)
-    except DuplicateKeyError:
-        raise ValueError(
-            "⚡ Oops! Someone else just booked that slot at the same time. "
-            "Please pick another time from the available ones."
+        slot_conflict = db.mentor_bookings.find_one(
+            {"team_name": team_name, "slot_id": slot_id}
         )
+        if slot_conflict:
+            raise ValueError("Your team already has a mentor session booked at this time slot.")
+        mentors_in_room = [m for m, r in MENTOR_ROOM_MAP.items() if r == room]
+        if not mentors_in_room:
+            raise ValueError(f"No mentors are assigned to Room {room}.")
+        booked_here = {
+            r["mentor_name"]
+            for r in db.mentor_bookings.find(
+                {"slot_id": slot_id, "mentor_name": {"$in": mentors_in_room}}
+            )
+        }
+        available_mentor = next((m for m in mentors_in_room if m not in booked_here), None)
+        if not available_mentor:
+            raise ValueError(
+                f"Room {room} is fully booked at that time. Please choose a different slot or room."
+            )
+        doc = {
+            "team_name": team_name,
+            "mentor_name": available_mentor,
+            "slot_id": slot_id,
+            "slot_label": slot_label(slot_id),
+            "booked_at": datetime.utcnow(),
+        }
+        try:
+            result = db.mentor_bookings.insert_one(doc)
+        except DuplicateKeyError:
+            raise ValueError(
+                "⚡ Oops! Someone else just booked that slot at the same time. "
+                "Please pick another time from the available ones."
+            )
+    except ValueError:
+        _release_quota(db, "mentor", team_name)
+        raise
+    get_mentor_booked_map.clear()
+    get_all_mentor_bookings.clear()
+    return str(result.inserted_id)
 
 
-def create_robot_booking(team_name: str, room: str, slot_label: str) -> str:
+def create_robot_booking(team_name: str, room: str, slot_id: int) -> str:
     """Create a robot booking. Raises ValueError on limit or slot conflict."""
     db = get_db()
-    current = db.robot_bookings.count_documents({"team_name": team_name})
-    if current >= MAX_ROBOT_BOOKINGS:
+    _require_slot(slot_id, "session")
+    if _team_busy_at(db, team_name, slot_id):
+        raise ValueError("Your team already has another session booked at this time slot.")
+    if not _reserve_quota(db, "robot", team_name, MAX_ROBOT_BOOKINGS):
         raise ValueError(
             f"Your team has already booked {MAX_ROBOT_BOOKINGS} robot sessions (the maximum)."
         )
-    # Pre-check: same team, same slot
-    if db.robot_bookings.find_one({"team_name": team_name, "slot_label": slot_label}):
-        raise ValueError("Your team already has a robot session booked at this time slot.")
-    # Pre-check: room+slot already taken (live DB query, bypasses cache)
-    if db.robot_bookings.find_one({"room": room, "slot_label": slot_label}):
-        raise ValueError(
-            "⚡ Oops! Someone else just booked that slot at the same time. "
-            "Please pick another time from the available ones."
-        )
     doc = {
         "team_name": team_name,
         "room": room,
-        "slot_label": slot_label,
+        "slot_id": slot_id,
+        "slot_label": slot_label(slot_id),
         "booked_at": datetime.utcnow(),
     }
     try:
         result = db.robot_bookings.insert_one(doc)
-        get_robot_booked_map.clear()
-        get_all_robot_bookings.clear()
-        return str(result.inserted_id)
-    except DuplicateKeyError:
+    except DuplicateKeyError as exc:
+        _release_quota(db, "robot", team_name)
+        # The unique indexes tell us which constraint fired:
+        # (team_name, slot_id) → same team, same slot; (room, slot_id) → slot taken.
+        if "team_name" in ((exc.details or {}).get("keyPattern") or {}):
+            raise ValueError("Your team already has a robot session booked at this time slot.")
         raise ValueError(
             "⚡ Oops! Someone else just booked that slot at the same time. "
             "Please pick another time from the available ones."
         )
+    get_robot_booked_map.clear()
+    get_all_robot_bookings.clear()
+    return str(result.inserted_id)
 
 
 def cancel_mentor_booking(booking_id: Any):
-    """Cancel (delete) a mentor booking by ID."""
+    """Cancel (delete) a mentor booking by ID. The freed slot goes to its waitlist, if any."""
     db = get_db()
-    db.mentor_bookings.delete_one({"_id": _oid(booking_id)})
+    removed = db.mentor_bookings.find_one_and_delete({"_id": _oid(booking_id)})
+    if removed:
+        db.session_booking_history.insert_one(_session_event_doc("mentor", removed, "cancelled"))
+        _release_quota(db, "mentor", removed["team_name"])
     get_mentor_booked_map.clear()
     get_all_mentor_bookings.clear()
+    if removed and removed.get("mentor_name") in MENTOR_ROOM_MAP:
+        _promote_waitlist(db, "mentor", removed.get("slot_id"),
+                          MENTOR_ROOM_MAP[removed["mentor_name"]])
 
 
 def cancel_robot_booking(booking_id: Any):
-    """Cancel (delete) a robot booking by ID."""
+    """Cancel (delete) a robot booking by ID. The freed slot goes to its waitlist, if any."""
     db = get_db()
-    db.robot_bookings.delete_one({"_id": _oid(booking_id)})
+    removed = db.robot_bookings.find_one_and_delete({"_id": _oid(booking_id)})
+    if removed:
+        db.session_booking_history.insert_one(_session_event_doc("robot", removed, "cancelled"))
+        _release_quota(db, "robot", removed["team_name"])
     get_robot_booked_map.clear()
     get_all_robot_bookings.clear()
+    if removed:
+        _promote_waitlist(db, "robot", removed.get("slot_id"), removed.get("room"))
 
 
-def admin_update_mentor_booking(booking_id: Any, mentor_name: str, slot_label: str):
+def admin_update_mentor_booking(booking_id: Any, mentor_name: str, slot_id: int):
     """Admin: update a mentor booking's mentor and slot. Raises ValueError on conflict."""
     db = get_db()
+    _require_slot(slot_id, "session")
     conflict = db.mentor_bookings.find_one({
         "mentor_name": mentor_name,
-        "slot_label": slot_label,
+        "slot_id": slot_id,
         "_id": {"$ne": _oid(booking_id)},
     })
     if conflict:
         raise ValueError(
-            f"Slot '{slot_label}' is already booked with {mentor_name} by '{conflict['team_name']}'."
+            f"Slot '{slot_label(slot_id)}' is already booked with {mentor_name} by '{conflict['team_name']}'."
         )
-    db.mentor_bookings.update_one(
+    before = db.mentor_bookings.find_one_and_update(
         {"_id": _oid(booking_id)},
-        {"$set": {"mentor_name": mentor_name, "slot_label": slot_label}},
+        {"$set": {"mentor_name": mentor_name, "slot_id": slot_id,
+                  "slot_label": slot_label(slot_id)}},
     )
+    if before:
+        db.session_booking_history.insert_one(_session_event_doc(
+            "mentor", {**before, "mentor_name": mentor_name, "slot_id": slot_id},
+            "admin_updated", before))
     get_mentor_booked_map.clear()
     get_all_mentor_bookings.clear()
+    if before and before.get("mentor_name") in MENTOR_ROOM_MAP:
+        _promote_waitlist(db, "mentor", before.get("slot_id"),
+                          MENTOR_ROOM_MAP[before["mentor_name"]])
 
 
-def admin_update_robot_booking(booking_id: Any, room: str, slot_label: str):
+def admin_update_robot_booking(booking_id: Any, room: str, slot_id: int):
     """Admin: update a robot booking's room and slot. Raises ValueError on conflict."""
     db = get_db()
+    _require_slot(slot_id, "session")
     conflict = db.robot_bookings.find_one({
         "room": room,
-        "slot_label": slot_label,
+        "slot_id": slot_id,
         "_id": {"$ne": _oid(booking_id)},
     })
     if conflict:
         raise ValueError(
-            f"Slot '{slot_label}' for Robot in {room} is already booked by '{conflict['team_name']}'."
+            f"Slot '{slot_label(slot_id)}' for Robot in {room} is already booked by '{conflict['team_name']}'."
         )
-    db.robot_bookings.update_one(
+    before = db.robot_bookings.find_one_and_update(
         {"_id": _oid(booking_id)},
-        {"$set": {"room": room, "slot_label": slot_label}},
+        {"$set": {"room": room, "slot_id": slot_id, "slot_label": slot_label(slot_id)}},
     )
+    if before:
+        db.session_booking_history.insert_one(_session_event_doc(
+            "robot", {**before, "room": room, "slot_id": slot_id}, "admin_updated", before))
     get_robot_booked_map.clear()
     get_all_robot_bookings.clear()
+    if before and (before.get("slot_id"), before.get("room")) != (slot_id, room):
+        _promote_waitlist(db, "robot", before.get("slot_id"), before.get("room"))
 
 
 def admin_delete_mentor_booking(booking_id: Any):
     """Admin: remove a mentor booking entirely."""
-    db = get_db()
-    db.mentor_bookings.delete_one({"_id": _oid(booking_id)})
-    get_mentor_booked_map.clear()
-    get_all_mentor_bookings.clear()
+    cancel_mentor_booking(booking_id)
 
 
 def admin_delete_robot_booking(booking_id: Any):
     """Admin: remove a robot booking entirely."""
+    cancel_robot_booking(booking_id)
+
+
+# ── Admin bulk edit ─────────────────────────────────────────────────────────────
+# Used by the admin grids: a whole batch of moves is checked in memory and then
+# written in one ordered bulk_write. Moved bookings first go to a unique negative
+# placeholder slot_id so that swaps and chains (A→B's slot, B→C's slot, …) never
+# trip the unique indexes half-way through. The batch's audit events are written
+# in the same transaction where there is one, and otherwise before the moves
+# (tagged with the batch id, so a rollback can take them back out).
+
+def _booking_collection(db, kind: str):
+    return {"prelim": db.prelim_bookings,
+            "mentor": db.mentor_bookings,
+            "robot":  db.robot_bookings}[kind]
+
+
+def _apply_booking_moves(col, place: str, moves: list, batch: ObjectId,
+                         session=None) -> bool:
+    """moves: (oid, from_slot, from_place, to_slot, to_place). Returns True if
+    every booking was still where we expected and ended up at its target.
+
+    Bookings are first parked on negative placeholder slot ids (so swaps don't
+    trip the unique indexes), then moved to their targets. Placeholders and the
+    move_batch marker are unique to `batch`, so two admins saving at once never
+    pick up each other's parked bookings; pass the same `batch` to roll back."""
+    base = int.from_bytes(batch.binary[-5:], "big") << 16  # counter + random bytes
+    ops = []
+    for i, (oid, from_slot, from_place, _to_slot, _to_place) in enumerate(moves):
+        parked = {"slot_id": -(base + i + 1), "move_batch": batch}
+        ops.append(UpdateOne(
+            {"_id": oid, "$or": [{"slot_id": from_slot, place: from_place}, parked]},
+            {"$set": parked},
+        ))
+    for i, (oid, _from_slot, _from_place, to_slot, to_place) in enumerate(moves):
+        ops.append(UpdateOne(
+            {"_id": oid, "slot_id": -(base + i + 1), "move_batch": batch},
+            {"$set": {"slot_id": to_slot, "slot_label": slot_label(to_slot), place: to_place},
+             "$unset": {"move_batch": ""}},
+        ))
+    try:
+        result = col.bulk_write(ops, ordered=True, session=session)
+    except BulkWriteError:
+        return False
+    return result.matched_count == len(ops)
+
+
+def admin_bulk_update_bookings(kind: str, changes: list) -> int:
+    """Admin: move many bookings of `kind` ('prelim' / 'mentor' / 'robot') at once.
+
+    `changes` is a list of {"id", "slot_id", "room"} — "mentor_name" instead of
+    "room" for mentor bookings. The resulting schedule is validated in memory
+    and every problem is reported in a single ValueError; nothing is written
+    unless the whole batch is valid. Returns the number of bookings moved."""
+    db = get_db()
+    col = _booking_collection(db, kind)
+    place = "mentor_name" if kind == "mentor" else "room"
+    places = {"prelim": PRELIM_ROOMS, "mentor": MENTOR_NAMES, "robot": SCHED_ROBOT_ROOMS}[kind]
+    slot_kind = "prelim" if kind == "prelim" else "session"
+
+    current = {row["_id"]: row for row in col.find({}, {"team_name": 1, "slot_id": 1, place: 1})}
+    errors: list = []
+    moves: list = []
+    final = {oid: (row.get("slot_id"), row.get(place)) for oid, row in current.items()}
+    targets = {_oid(change["id"]): (change["slot_id"], change[place]) for change in changes}
+    for oid, target in targets.items():
+        row = current.get(oid)
+        if row is None:
+            errors.append("A booking being edited no longer exists.")
+            continue
+        if SLOTS_BY_ID.get(target[0], {}).get("kind") != slot_kind or target[1] not in places:
+            errors.append(f"{row['team_name']}: invalid slot or {place.replace('_', ' ')}.")
+            continue
+        if target != final[oid]:
+            moves.append((oid, *final[oid], *target))
+            final[oid] = target
+
+    # A team can't be in its other kind of session (mentor vs robot) at the same time
+    if kind != "prelim" and moves:
+        other = db.robot_bookings if kind == "mentor" else db.mentor_bookings
+        moved_teams = list({current[oid]["team_name"] for oid, *_ in moves})
+        other_sessions = {(b["team_name"], b.get("slot_id")) for b in other.find(
+            {"team_name": {"$in": moved_teams}}, {"team_name": 1, "slot_id": 1})}
+        other_kind = "robot" if kind == "mentor" else "mentor"
+        for oid, _fs, _fp, to_slot, _tp in moves:
+            team = current[oid]["team_name"]
+            if (team, to_slot) in other_sessions:
+                errors.append(f"{team} already has a {other_kind} session at {slot_label(to_slot)}.")
+
+    taken: Dict[tuple, str] = {}
+    team_slots: Dict[tuple, str] = {}
+    for oid, (slot_id, where) in final.items():
+        team = current[oid]["team_name"]
+        if (slot_id, where) in taken:
+            errors.append(f"{slot_label(slot_id)} / {where}: {taken[(slot_id, where)]} and {team}.")
+        taken[(slot_id, where)] = team
+        if kind != "prelim":
+            if (team, slot_id) in team_slots:
+                errors.append(f"{team} is booked twice at {slot_label(slot_id)}.")
+            team_slots[(team, slot_id)] = team
+    if errors:
+        raise ValueError("Nothing was saved:\n- " + "\n- ".join(errors))
+    if not moves:
+        return 0
+
+    batch = ObjectId()
+    history = _history_collection(db, kind)
+    events = []
+    for oid, fs, fp, ts, tp in moves:
+        team = current[oid]["team_name"]
+        if kind == "prelim":
+            event = _booking_event_doc(team, ts, tp, "admin_updated", fs, fp)
+        else:
+            event = _session_event_doc(kind, {"team_name": team, "slot_id": ts, place: tp},
+                                       "admin_updated", {"slot_id": fs, place: fp})
+        events.append({**event, "batch": batch})
+
+    def write(session):
+        history.insert_many(events, session=session)
+        if _apply_booking_moves(col, place, moves, batch, session):
+            return
+        if session is None:
+            # No transaction to abort: put our bookings back and drop the events
+            _apply_booking_moves(col, place, [(o, ts, tp, fs, fp) for o, fs, fp, ts, tp in moves], batch)
+            history.delete_many({"batch": batch})
+        # A booking changed under us (or a slot was just booked)
+        raise ValueError(
+            "Some bookings changed while you were editing. Nothing was saved — "
+            "please reload the page and try again."
+        )
+
+    _run_in_transaction(db, write)
+
+    if kind == "prelim":
+        get_booking_history_page.clear()
+        get_booking_history_teams.clear()
+        get_booked_slot_map.clear()
+        get_all_bookings.clear()
+        get_prelim_slot_map.clear()
+        get_teams_booked_in_room.clear()
+    elif kind == "mentor":
+        get_mentor_booked_map.clear()
+        get_all_mentor_bookings.clear()
+    else:
+        get_robot_booked_map.clear()
+        get_all_robot_bookings.clear()
+
+    # Hand any slot that is now empty to its waitlist
+    now_taken = set(final.values())
+    for _, fs, fp, _, _ in moves:
+        if (fs, fp) not in now_taken:
+            room = MENTOR_ROOM_MAP.get(fp) if kind == "mentor" else fp
+            _promote_waitlist(db, kind, fs, room)
+    return len(moves)
+
+
+# ── Auto-scheduling ─────────────────────────────────────────────────────────────
+# Fills every open prelim / mentor / robot slot in one pass using the min-cost
+# flow solver in scheduler.py. Teams' waitlist entries double as their slot
+# preferences. Results are written with one insert_many; mentor/robot sessions
+# first claim quota through _reserve_quota like any other booking.
+
+def _auto_schedule_inputs(db, kind: str, replace: bool) -> tuple:
+    """Return (teams, need, room_capacity, preferences, blocked) for `kind`."""
+    teams = [r["team_name"] for r in db.team_registrations.find(
+        {"status": {"$in": ["pending", "approved"]}}, {"team_name": 1}
+    ).sort([("created_at", ASCENDING), ("_id", ASCENDING)])]
+    col = _booking_collection(db, kind)
+    existing = [] if replace else list(col.find({}, {"team_name": 1, "slot_id": 1,
+                                                     "room": 1, "mentor_name": 1}))
+    if kind == "prelim":
+        judged = set(db.judges.distinct("prelim_room")) & set(PRELIM_ROOMS)
+        rooms = {r: 1 for r in PRELIM_ROOMS if not judged or r in judged}
+        room_capacity = {s: dict(rooms) for s in PRELIM_SLOT_IDS}
+        booked = {b["team_name"] for b in existing}
+        need = {t: 0 if t in booked else 1 for t in teams}
+    else:
+        room_capacity = {s: dict(SLOTS_BY_ID[s]["capacity"][kind]) for s in SCHED_SLOT_IDS}
+        limit = MAX_MENTOR_BOOKINGS if kind == "mentor" else MAX_ROBOT_BOOKINGS
+        held: Dict[str, int] = {}
+        for b in existing:
+            held[b["team_name"]] = held.get(b["team_name"], 0) + 1
+        need = {t: max(limit - held.get(t, 0), 0) for t in teams}
+    for b in existing:
+        room = MENTOR_ROOM_MAP.get(b.get("mentor_name")) if kind == "mentor" else b.get("room")
+        if room in room_capacity.get(b.get("slot_id"), {}):
+            # max(): an admin may have put two teams in one room by hand
+            room_capacity[b["slot_id"]][room] = max(room_capacity[b["slot_id"]][room] - 1, 0)
+
+    # A team can't be in two sessions at once, whatever the kind
+    blocked: Dict[str, set] = {}
+    if kind != "prelim":
+        for other in (db.mentor_bookings, db.robot_bookings):
+            for b in other.find({}, {"team_name": 1, "slot_id": 1}):
+                blocked.setdefault(b["team_name"], set()).add(b.get("slot_id"))
+
+    preferences: Dict[str, list] = {}
+    for w in db.booking_waitlist.find({"kind": kind}).sort([("joined_at", ASCENDING), ("_id", ASCENDING)]):
+        preferences.setdefault(w["team_name"], []).append(w["slot_id"])
+    return teams, need, room_capacity, preferences, blocked
+
+
+def auto_schedule(kind: str, replace: bool = False) -> Dict[str, Any]:
+    """Admin: book every team that still needs a `kind` session into the open slots.
+
+    With replace=True all existing bookings of that kind are removed first and
+    the whole schedule is rebuilt. Returns {"scheduled", "unscheduled"} where
+    unscheduled lists teams that still need a session because capacity ran out."""
+    import scheduler
+
+    db = get_db()
+    col = _booking_collection(db, kind)
+    if replace:
+        # Removed bookings are logged like an admin delete; only the ones
+        # actually deleted, in case a team cancelled meanwhile
+        removed = []
+        for b in list(col.find({}, {"team_name": 1, "slot_id": 1, "room": 1, "mentor_name": 1})):
+            if col.delete_one({"_id": b["_id"]}).deleted_count:
+                removed.append(b)
+        if removed:
+            _history_collection(db, kind).insert_many([
+                _booking_event_doc(b["team_name"], b.get("slot_id"), b.get("room", ""), "admin_deleted")
+                if kind == "prelim" else _session_event_doc(kind, b, "admin_deleted")
+                for b in removed
+            ])
+        if kind != "prelim":
+            db.booking_quotas.delete_many({"kind": kind})
+    elif kind != "prelim":
+        _reconcile_booking_quotas(db, (kind,))  # a leaked claim would block a team here
+    teams, need, room_capacity, preferences, blocked = _auto_schedule_inputs(db, kind, replace)
+    slot_capacity = {s: sum(rooms.values()) for s, rooms in room_capacity.items()}
+    assignment = scheduler.solve(teams, slot_capacity, need, preferences, blocked)
+    placed = scheduler.place_in_rooms(assignment, room_capacity)
+
+    now = datetime.utcnow()
+    docs = []
+    taken_mentors: Dict[tuple, set] = {}
+    for b in col.find({}, {"slot_id": 1, "mentor_name": 1}) if kind == "mentor" else ():
+        taken_mentors.setdefault((b.get("slot_id"), MENTOR_ROOM_MAP.get(b["mentor_name"])), set()).add(b["mentor_name"])
+    for team, slot_id, room in placed:
+        doc = {"team_name": team, "slot_id": slot_id, "slot_label": slot_label(slot_id),
+               "booked_at": now, "auto_scheduled": True}
+        if kind == "mentor":
+            busy = taken_mentors.setdefault((slot_id, room), set())
+            mentor = next(m for m, r in MENTOR_ROOM_MAP.items() if r == room and m not in busy)
+            busy.add(mentor)
+            doc["mentor_name"] = mentor
+        else:
+            doc["room"] = room
+        docs.append(doc)
+
+    if kind != "prelim":
+        # Claim quota per session like every other booking path, so a team that
+        # booked by hand while we were solving can't end up over its limit
+        limit = MAX_MENTOR_BOOKINGS if kind == "mentor" else MAX_ROBOT_BOOKINGS
+        docs = [d for d in docs if _reserve_quota(db, kind, d["team_name"], limit)]
+
+    inserted = docs
+    if docs:
+        try:
+            col.insert_many(docs, ordered=False)
+        except BulkWriteError as exc:
+            # A team booked (or took the slot) while we were solving — skip those
+            failed = {err["index"] for err in exc.details.get("writeErrors", [])}
+            inserted = [d for i, d in enumerate(docs) if i not in failed]
+            if kind != "prelim":
+                for i in failed:
+                    _release_quota(db, kind, docs[i]["team_name"])
+
+    if inserted:
+        _history_collection(db, kind).insert_many([
+            _booking_event_doc(d["team_name"], d["slot_id"], d["room"], "auto_scheduled")
+            if kind == "prelim" else _session_event_doc(kind, d, "auto_scheduled")
+            for d in inserted
+        ])
+    if kind == "prelim":
+        get_booking_history_page.clear()
+        get_booking_history_teams.clear()
+        get_booked_slot_map.clear()
+        get_all_bookings.clear()
+        get_prelim_slot_map.clear()
+        get_teams_booked_in_room.clear()
+    else:
+        if kind == "mentor":
+            get_mentor_booked_map.clear()
+            get_all_mentor_bookings.clear()
+        else:
+            get_robot_booked_map.clear()
+            get_all_robot_bookings.clear()
+
+    # Waitlist entries that have just been satisfied are no longer needed
+    if inserted:
+        if kind == "prelim":
+            db.booking_waitlist.delete_many(
+                {"kind": "prelim", "team_name": {"$in": [d["team_name"] for d in inserted]}})
+        else:
+            db.booking_waitlist.delete_many({"kind": kind, "$or": [
+                {"team_name": d["team_name"], "slot_id": d["slot_id"]} for d in inserted]})
+
+    got: Dict[str, int] = {}
+    for d in inserted:
+        got[d["team_name"]] = got.get(d["team_name"], 0) + 1
+    unscheduled = [t for t in teams if need.get(t, 0) > got.get(t, 0)]
+    print(f"auto_schedule({kind}): booked {len(inserted)} session(s), "
+          f"{len(unscheduled)} team(s) still short")
+    return {"scheduled": len(inserted), "unscheduled": unscheduled}
+
+
+# ── Booking waitlists ───────────────────────────────────────────────────────────
+# A team that wants a full (slot, room) joins its waitlist with a single insert.
+# Whenever a booking leaves a slot (cancel, admin delete/move, prelim switch) the
+# oldest waiter is claimed with find_one_and_delete — so two concurrent
+# cancellations can never promote the same team — and booked into the freed
+# slot through the normal create/switch path, which keeps the unique indexes and
+# quotas as the final arbiter. Each entry holds one of its team's
+# MAX_WAITLIST_ENTRIES numbered seats (unique per team and kind), so the cap
+# needs no counter to keep in step with the many places entries are deleted.
+# A waiter who is skipped because they can't take the slot gets a notice,
+# shown on their booking page, instead of silently losing their place.
+
+MAX_WAITLIST_ENTRIES: int = 3   # per team, per kind
+_WAITLIST_NOTICE_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _init_waitlist_indexes(db):
+    """Create indexes for the booking_waitlist collection."""
+    _ensure_index(db.booking_waitlist,
+        [("kind", ASCENDING), ("slot_id", ASCENDING), ("room", ASCENDING),
+         ("team_name", ASCENDING)], unique=True)
+    _ensure_index(db.booking_waitlist,
+        [("kind", ASCENDING), ("slot_id", ASCENDING), ("room", ASCENDING),
+         ("joined_at", ASCENDING), ("_id", ASCENDING)])
+    _ensure_index(db.booking_waitlist, [("team_name", ASCENDING), ("kind", ASCENDING)])
+    _ensure_index(db.booking_waitlist,
+        [("team_name", ASCENDING), ("kind", ASCENDING), ("seat", ASCENDING)],
+        unique=True, partialFilterExpression={"seat": {"$exists": True}})
+    _ensure_index(db.waitlist_notices, [("team_name", ASCENDING), ("kind", ASCENDING)])
+    _ensure_index(db.waitlist_notices, "created_at",
+        expireAfterSeconds=_WAITLIST_NOTICE_TTL_SECONDS)
+
+
+def _backfill_waitlist_seats(db) -> None:
+    """Give seats to waitlist entries created before the cap was seat-based,
+    oldest first; entries beyond the cap stay seatless until they're used up."""
+    free: Dict[tuple, list] = {}
+    for row in db.booking_waitlist.find({"seat": {"$exists": False}}).sort(
+            [("joined_at", ASCENDING), ("_id", ASCENDING)]):
+        key = (row["team_name"], row["kind"])
+        if key not in free:
+            taken = set(db.booking_waitlist.distinct(
+                "seat", {"team_name": row["team_name"], "kind": row["kind"]}))
+            free[key] = [n for n in range(MAX_WAITLIST_ENTRIES) if n not in taken]
+        while free[key]:
+            try:
+                db.booking_waitlist.update_one({"_id": row["_id"], "seat": {"$exists": False}},
+                                               {"$set": {"seat": free[key].pop(0)}})
+                break
+            except DuplicateKeyError:
+                continue  # taken by a concurrent join; try the next seat
+
+
+def _slot_is_taken(db, kind: str, slot_id: int, room: str) -> bool:
+    """True if (slot, room) is full: its bookings reach the room's capacity in
+    SLOTS_BY_ID, the same figure the auto-scheduler fills up to."""
+    capacity = SLOTS_BY_ID.get(slot_id, {}).get("capacity", {}).get(kind, {}).get(room, 1)
+    if kind == "mentor":
+        mentors = [m for m, r in MENTOR_ROOM_MAP.items() if r == room]
+        query = {"slot_id": slot_id, "mentor_name": {"$in": mentors}}
+    else:
+        query = {"slot_id": slot_id, "room": room}
+    return _booking_collection(db, kind).count_documents(query, limit=capacity) >= capacity
+
+
+def join_waitlist(kind: str, team_name: str, slot_id: int, room: str) -> str:
+    """Put a team on the waitlist for a taken (slot, room). Returns the entry id.
+    Raises ValueError if the slot is free, or the team is already waiting for it
+    or is at MAX_WAITLIST_ENTRIES for this kind."""
+    if kind not in ("prelim", "mentor", "robot"):
+        raise ValueError(f"Unknown waitlist '{kind}'.")
+    _require_slot(slot_id, "prelim" if kind == "prelim" else "session")
+    db = get_db()
+    if not _slot_is_taken(db, kind, slot_id, room):
+        raise ValueError("That slot is free right now — book it directly instead.")
+    entry_id = _insert_waitlist_entry(db, {
+        "kind": kind,
+        "slot_id": slot_id,
+        "room": room,
+        "team_name": team_name,
+        "joined_at": datetime.utcnow(),
+    })
+    if entry_id is None:
+        raise ValueError(f"Your team can wait for at most {MAX_WAITLIST_ENTRIES} slots at a time.")
+    return str(entry_id)
+
+
+def _insert_waitlist_entry(db, entry: Dict[str, Any]) -> Optional[ObjectId]:
+    """Insert `entry` into a free seat of its team's waitlist (its old seat
+    first, if it had one). Returns the entry id, or None if every seat is taken.
+    Raises ValueError if the team is already waiting for that (slot, room)."""
+    query = {"team_name": entry["team_name"], "kind": entry["kind"]}
+    taken = set(db.booking_waitlist.distinct("seat", query))
+    seats = [n for n in range(MAX_WAITLIST_ENTRIES) if n not in taken]
+    if entry.get("seat") in seats:
+        seats.remove(entry["seat"])
+        seats.insert(0, entry["seat"])
+    for seat in seats:
+        try:
+            return db.booking_waitlist.insert_one({**entry, "seat": seat}).inserted_id
+        except DuplicateKeyError:
+            if db.booking_waitlist.count_documents(
+                {**query, "slot_id": entry["slot_id"], "room": entry["room"]}, limit=1
+            ):
+                raise ValueError("Your team is already on the waitlist for that slot.")
+            # A concurrent join took this seat; try the next one
+    return None
+
+
+def leave_waitlist(entry_id: Any, team_name: str) -> None:
+    """Remove one of a team's waitlist entries."""
     db = get_db()
-    db.robot_bookings.delete_one({"_id": _oid(booking_id)})
-    get_robot_booked_map.clear()
-    get_all_robot_bookings.clear()
+    db.booking_waitlist.delete_one({"_id": _oid(entry_id), "team_name": team_name})
+
+
+def get_team_waitlist(team_name: str, kind: str) -> list:
+    """Return a team's waitlist entries of `kind` with their 1-based `position`."""
+    db = get_db()
+    rows = list(db.booking_waitlist.find({"team_name": team_name, "kind": kind})
+                .sort("slot_id", ASCENDING))
+    if not rows:
+        return []
+    # Every waitlist this team is on, in order, in one aggregate
+    queues = {
+        (g["_id"]["slot_id"], g["_id"]["room"]): g["queue"]
+        for g in db.booking_waitlist.aggregate([
+            {"$match": {"kind": kind, "$or": [
+                {"slot_id": r["slot_id"], "room": r["room"]} for r in rows]}},
+            {"$sort": {"joined_at": ASCENDING, "_id": ASCENDING}},
+            {"$group": {"_id": {"slot_id": "$slot_id", "room": "$room"},
+                        "queue": {"$push": "$_id"}}},
+        ])
+    }
+    entries = []
+    for row in rows:
+        entry = _doc_with_id(row)
+        entry["position"] = queues[(row["slot_id"], row["room"])].index(row["_id"]) + 1
+        entries.append(entry)
+    return entries
+
+
+def get_waitlist_notices(team_name: str, kind: str) -> list:
+    """Waitlist slots the team was next in line for but couldn't be booked into."""
+    db = get_db()
+    return [_doc_with_id(r) for r in db.waitlist_notices.find(
+        {"team_name": team_name, "kind": kind}).sort("created_at", ASCENDING)]
+
+
+def dismiss_waitlist_notice(notice_id: Any, team_name: str) -> None:
+    db = get_db()
+    db.waitlist_notices.delete_one({"_id": _oid(notice_id), "team_name": team_name})
+
+
+def _book_for_waiter(db, waiter: Dict[str, Any]) -> None:
+    team_name, slot_id, room = waiter["team_name"], waiter["slot_id"], waiter["room"]
+    if waiter["kind"] == "prelim":
+        # Waiting while already booked means "move me there when it frees up"
+        if db.prelim_bookings.find_one({"team_name": team_name}, {"_id": 1}):
+            switch_booking(team_name, slot_id, room)
+        else:
+            create_booking(team_name, slot_id, room)
+        # One prelim slot per team — drop its other entries so it isn't moved again
+        db.booking_waitlist.delete_many({"team_name": team_name, "kind": "prelim"})
+    elif waiter["kind"] == "mentor":
+        create_mentor_booking_room(team_name, room, slot_id)
+    else:
+        create_robot_booking(team_name, room, slot_id)
+
+
+def _promote_waitlist(db, kind: str, slot_id: Optional[int], room: Optional[str]) -> None:
+    """Give a just-freed (slot, room) to the longest-waiting team that can take it."""
+    if slot_id is None or not room:
+        return
+    while not _slot_is_taken(db, kind, slot_id, room):
+        waiter = db.booking_waitlist.find_one_and_delete(
+            {"kind": kind, "slot_id": slot_id, "room": room},
+            sort=[("joined_at", ASCENDING), ("_id", ASCENDING)],
+        )
+        if not waiter:
+            return
+        try:
+            _book_for_waiter(db, waiter)
+            print(f"waitlist: promoted '{waiter['team_name']}' to {kind} "
+                  f"{slot_label(slot_id)} / {room}")
+            return
+        except ValueError as exc:
+            if _slot_is_taken(db, kind, slot_id, room):
+                # Someone booked the slot in between; the waiter keeps their place
+                _restore_waiter(db, waiter)
+                return
+            # The team can't take it (quota reached, clashing session…) — tell
+            # them why, then offer the slot to the next one
+            print(f"waitlist: skipped '{waiter['team_name']}' for {kind} "
+                  f"{slot_label(slot_id)} / {room}: {exc}")
+            db.waitlist_notices.insert_one({
+                "team_name": waiter["team_name"],
+                "kind": kind,
+                "slot_id": slot_id,
+                "room": room,
+                "message": str(exc),
+                "created_at": datetime.utcnow(),
+            })
+        except Exception as exc:
+            # Database/network trouble: the freed slot stays open and the waiter
+            # keeps their place, so the next cancellation tries again
+            print(f"waitlist: could not promote '{waiter['team_name']}' to {kind} "
+                  f"{slot_label(slot_id)} / {room}: {exc!r}")
+            _restore_waiter(db, waiter)
+            return
+
+
+def _restore_waiter(db, waiter: Dict[str, Any]) -> None:
+    """Put a claimed waitlist entry back, keeping its id and join time (its place)."""
+    try:
+        if _insert_waitlist_entry(db, waiter) is None:
+            print(f"waitlist: no free seat to restore '{waiter['team_name']}' for "
+                  f"{waiter['kind']} {slot_label(waiter['slot_id'])} / {waiter['room']}")
+    except (ValueError, DuplicateKeyError):
+        pass  # already back (e.g. restored by a concurrent promotion)
+    except Exception as exc:
+        print(f"waitlist: could not restore '{waiter['team_name']}' for "
+              f"{waiter['kind']} {slot_label(waiter['slot_id'])} / {waiter['room']}: {exc!r}")
+
+
+# ── Booking admission queue ─────────────────────────────────────────────────────
+# Optional FIFO queue used at booking-open time. Instead of every team's browser
+# racing on the booking collections, requests are appended to booking_queue and a
+# single worker per resource ("prelim", "mentor", "robot") applies them in arrival
+# order. The worker runs as a daemon thread; a lease document guarantees only one
+# app instance processes a given resource at a time. A worker only records the
+# outcome of requests it still owns, so when a lease changes hands the new holder
+# settles the old holder's in-flight requests (_recover_queue_requests).
+
+QUEUE_RESOURCES: list = ["prelim", "mentor", "robot"]
+
+_QUEUE_LEASE_SECONDS = 10
+_QUEUE_IDLE_POLL_SECONDS = 0.25
+_QUEUE_RESULT_TTL_SECONDS = 3600
+
+
+def _init_queue_indexes(db):
+    """Create indexes for the booking_queue collection."""
+    _ensure_index(db.booking_queue,
+        [("resource", ASCENDING), ("seq", ASCENDING)], unique=True)
+    _ensure_index(db.booking_queue,
+        [("resource", ASCENDING), ("status", ASCENDING), ("seq", ASCENDING)])
+    # One waiting request per team per resource
+    _ensure_index(db.booking_queue,
+        [("resource", ASCENDING), ("team_name", ASCENDING)],
+        unique=True, partialFilterExpression={"status": "queued"})
+    _ensure_index(db.booking_queue, "finished_at",
+        expireAfterSeconds=_QUEUE_RESULT_TTL_SECONDS)
+
+
+@st.cache_data(ttl=10)
+def get_booking_queue_enabled() -> bool:
+    """Return True if booking writes should go through the admission queue."""
+    db = get_db()
+    doc = db.settings.find_one({"key": "booking_queue_enabled"})
+    return bool(doc.get("value")) if doc else False
+
+
+def set_booking_queue_enabled(enabled: bool) -> None:
+    """Turn the booking admission queue on or off for all public booking pages."""
+    db = get_db()
+    db.settings.replace_one(
+        {"key": "booking_queue_enabled"},
+        {"key": "booking_queue_enabled", "value": bool(enabled)},
+        upsert=True,
+    )
+    get_booking_queue_enabled.clear()
+
+
+def _queue_actions() -> Dict[str, Any]:
+    """Map of queueable action name → (resource, handler(args))."""
+    return {
+        "create_booking": ("prelim", lambda a: create_booking(
+            a["team_name"], a["slot_id"], a["room"])),
+        "switch_booking": ("prelim", lambda a: switch_booking(
+            a["team_name"], a["slot_id"], a["room"])),
+        "create_mentor_booking_room": ("mentor", lambda a: create_mentor_booking_room(
+            a["team_name"], a["room"], a["slot_id"])),
+        "create_robot_booking": ("robot", lambda a: create_robot_booking(
+            a["team_name"], a["room"], a["slot_id"])),
+    }
+
+
+def _queue_request_landed(db, row: Dict[str, Any]) -> bool:
+    """True if the booking a queue request asked for exists (whoever made it)."""
+    a = row["args"]
+    query = {"team_name": a["team_name"], "slot_id": a["slot_id"]}
+    if row["action"] in ("create_booking", "switch_booking"):
+        return db.prelim_bookings.count_documents({**query, "room": a["room"]}, limit=1) > 0
+    if row["action"] == "create_robot_booking":
+        return db.robot_bookings.count_documents({**query, "room": a["room"]}, limit=1) > 0
+    mentors = [m for m, r in MENTOR_ROOM_MAP.items() if r == a["room"]]
+    return db.mentor_bookings.count_documents(
+        {**query, "mentor_name": {"$in": mentors}}, limit=1) > 0
+
+
+def enqueue_booking_request(action: str, team_name: str, **args) -> str:
+    """Append a booking request to the admission queue. Returns the request id.
+
+    If the team already has a request waiting for the same resource, that
+    request's id is returned instead of queueing a duplicate."""
+    actions = _queue_actions()
+    if action not in actions:
+        raise ValueError(f"Unknown booking action '{action}'.")
+    resource = actions[action][0]
+    _ensure_queue_workers()
+    db = get_db()
+    counter = db.counters.find_one_and_update(
+        {"_id": f"booking_queue:{resource}"},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    doc = {
+        "resource": resource,
+        "seq": counter["seq"],
+        "team_name": team_name,
+        "action": action,
+        "args": {"team_name": team_name, **args},
+        "status": "queued",
+        "enqueued_at": datetime.utcnow(),
+    }
+    try:
+        result = db.booking_queue.insert_one(doc)
+        return str(result.inserted_id)
+    except DuplicateKeyError:
+        existing = db.booking_queue.find_one(
+            {"resource": resource, "team_name": team_name, "status": "queued"}
+        )
+        if not existing:
+            # The earlier request was picked up between our insert and lookup
+            return enqueue_booking_request(action, team_name, **args)
+        return str(existing["_id"])
+
+
+def get_queue_request(request_id: Any) -> Optional[Dict[str, Any]]:
+    """Return a queued request with its live 1-based `position` (None once processed)."""
+    db = get_db()
+    row = db.booking_queue.find_one({"_id": _oid(request_id)})
+    if not row:
+        return None
+    req = _doc_with_id(row)
+    req["position"] = None
+    if row["status"] == "queued":
+        _ensure_queue_workers()
+        ahead = db.booking_queue.count_documents({
+            "resource": row["resource"],
+            "status": {"$in": ["queued", "processing"]},
+            "seq": {"$lt": row["seq"]},
+        })
+        req["position"] = ahead + 1
+    return req
+
+
+def _acquire_queue_lease(db, resource: str, owner: str) -> bool:
+    """Take or renew the processing lease for `resource`. Returns True if held."""
+    now = datetime.utcnow()
+    try:
+        db.queue_leases.update_one(
+            {"_id": resource,
+             "$or": [{"owner": owner}, {"lease_until": {"$lt": now}}]},
+            {"$set": {"owner": owner,
+                      "lease_until": now + timedelta(seconds=_QUEUE_LEASE_SECONDS)}},
+            upsert=True,
+        )
+        return True
+    except DuplicateKeyError:
+        return False  # another instance holds a live lease
+
+
+def _process_next_queue_request(db, resource: str, owner: str) -> bool:
+    """Claim and apply the oldest queued request. Returns False if the queue was empty."""
+    row = db.booking_queue.find_one_and_update(
+        {"resource": resource, "status": "queued"},
+        {"$set": {"status": "processing", "worker": owner, "started_at": datetime.utcnow()}},
+        sort=[("seq", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+    if not row:
+        return False
+    handler = _queue_actions()[row["action"]][1]
+    try:
+        handler(row["args"])
+        status, message = "done", ""
+    except ValueError as exc:
+        status, message = "failed", str(exc)
+        if row.get("requeued") and _queue_request_landed(db, row):
+            # An earlier, interrupted attempt at this request did book it
+            status, message = "done", ""
+    except Exception as exc:  # keep the worker alive on unexpected errors
+        print(f"booking queue: {row['action']} failed: {exc!r}")
+        status, message = "failed", "Something went wrong while booking. Please try again."
+    # Only if we still own it: after losing the lease the new holder decides
+    db.booking_queue.update_one(
+        {"_id": row["_id"], "status": "processing", "worker": owner},
+        {"$set": {"status": status, "message": message, "finished_at": datetime.utcnow()}},
+    )
+    return True
+
+
+def _recover_queue_requests(db, resource: str, owner: str) -> None:
+    """After taking over a lease, settle the requests the previous holder left
+    in "processing". It may have died, or may still be finishing (a stalled
+    holder whose lease ran out), so don't guess: a request whose booking exists
+    is done, any other goes back to the queue at its original position."""
+    for row in db.booking_queue.find(
+        {"resource": resource, "status": "processing", "worker": {"$ne": owner}}
+    ):
+        stale = {"_id": row["_id"], "status": "processing", "worker": row.get("worker")}
+        if _queue_request_landed(db, row):
+            db.booking_queue.update_one(stale, {"$set": {
+                "status": "done", "message": "", "finished_at": datetime.utcnow()}})
+            continue
+        try:
+            db.booking_queue.update_one(stale, {
+                "$set": {"status": "queued", "requeued": True},
+                "$unset": {"worker": "", "started_at": ""},
+            })
+        except DuplicateKeyError:
+            # The team has queued a newer request meanwhile; that one stands
+            db.booking_queue.update_one(stale, {"$set": {
+                "status": "failed",
+                "message": "Your request was interrupted and replaced by your newer one.",
+                "finished_at": datetime.utcnow()}})
+
+
+def _queue_worker_loop(resource: str, owner: str) -> None:
+    db = get_db()
+    holding = False
+    lease_checked = 0.0
+    while True:
+        try:
+            if time.monotonic() - lease_checked > _QUEUE_LEASE_SECONDS / 3:
+                was_holding, holding = holding, _acquire_queue_lease(db, resource, owner)
+                lease_checked = time.monotonic()
+                if holding and not was_holding:
+                    _recover_queue_requests(db, resource, owner)
+            if not holding or not _process_next_queue_request(db, resource, owner):
+                time.sleep(_QUEUE_IDLE_POLL_SECONDS)
+        except Exception as exc:
+            print(f"booking queue worker ({resource}) error: {exc!r}")
+            holding = False
+            time.sleep(1)
+
+
+@st.cache_resource
+def _ensure_queue_workers() -> str:
+    """Start one daemon worker thread per resource (once per process)."""
+    owner = uuid.uuid4().hex
+    for resource in QUEUE_RESOURCES:
+        threading.Thread(
+            target=_queue_worker_loop, args=(resource, owner),
+            name=f"booking-queue-{resource}", daemon=True,
+        ).start()
+    return owner
 
 
 # --- Competitor auto-create ---
@@ -1236,10 +2965,10 @@ def get_finals_scoring_matrix():
 
 @st.cache_data(ttl=30)
 def get_teams_booked_in_room(room: str) -> list:
-    """Return list of {team_name, slot_label, members, project_name} for every team
-    that has a prelim booking in the given room."""
+    """Return list of {team_name, slot_id, slot_label, members, project_name} for every
+    team that has a prelim booking in the given room, in slot order."""
     db = get_db()
-    bookings = list(db.prelim_bookings.find({"room": room}).sort("slot_label", ASCENDING))
+    bookings = list(db.prelim_bookings.find({"room": room}).sort("slot_id", ASCENDING))
     result = []
     for b in bookings:
         tn = b["team_name"]
@@ -1248,7 +2977,8 @@ def get_teams_booked_in_room(room: str) -> list:
         )
         result.append({
             "team_name": tn,
-            "slot_label": b.get("slot_label", ""),
+            "slot_id": b.get("slot_id"),
+            "slot_label": slot_label(b.get("slot_id")),
             "members": reg.get("members", []) if reg else [],
             "project_name": reg.get("project_name", "") if reg else "",
         })
@@ -1260,8 +2990,8 @@ def get_prelim_slot_map() -> Dict[str, str]:
     """Return {team_name: slot_label} for all prelim bookings."""
     db = get_db()
     result: Dict[str, str] = {}
-    for row in db.prelim_bookings.find():
-        result[row["team_name"]] = row.get("slot_label", "")
+    for row in db.prelim_bookings.find({}, {"team_name": 1, "slot_id": 1}):
+        result[row["team_name"]] = slot_label(row.get("slot_id"))
     return result
 
 
@@ -1486,40 +3216,180 @@ def authenticate_user(username, password):
     return None
 
 
-# --- Server-side session store ---
+# --- Sessions ---
+# The session token in the URL (?s=...) is self-contained: base64url JSON claims
+# (session id, user id, username, role, judge id/round, issued/expiry times)
+# followed by an HMAC-SHA256 signature. Restoring a session after a refresh is
+# therefore verified in-process, with no database read. Logouts and deleted
+# judge accounts are recorded in `revoked_sessions` (TTL-expired), which each
+# process re-reads at most every _REVOCATION_POLL_SECONDS; so are judge
+# accounts whose username, round or password changes.
+#
+# The signing key is [session] secret in secrets.toml and is required for
+# login: without it get_session returns None and the login form shows an
+# error, while the public pages work as usual. Opaque tokens issued before
+# signed tokens existed are still honoured from the `sessions` collection,
+# through a small LRU.
 
-def create_session(user: dict, ttl_hours: int = 12) -> str:
-    """Create a server-side session for the given user. Returns a URL-safe token."""
-    db = get_db()
-    token = secrets.token_urlsafe(32)
-    db.sessions.insert_one({
-        "token": token,
-        "user":  user,
-        "expires_at": datetime.utcnow() + timedelta(hours=ttl_hours),
-    })
-    # Ensure MongoDB auto-expires old sessions via TTL index
+_SESSION_TTL_HOURS = 12
+_REVOCATION_POLL_SECONDS = 15
+_MAX_LEGACY_SESSIONS = 256
+
+_legacy_sessions: "OrderedDict[str, tuple]" = OrderedDict()  # token → (user, expires_at)
+_legacy_lock = threading.Lock()
+
+
+def _init_session_indexes(db):
+    _ensure_index(db.sessions, "expires_at", expireAfterSeconds=0)
+    _ensure_index(db.revoked_sessions, "expires_at", expireAfterSeconds=0)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _session_secret() -> Optional[str]:
+    """The [session] secret from secrets.toml, or None if it isn't set. It only
+    ever lives in secrets: a key kept in the database would let anyone who can
+    read the database forge admin session tokens."""
     try:
-        db.sessions.create_index("expires_at", expireAfterSeconds=0)
+        secret = st.secrets["session"]["secret"]
     except Exception:
-        pass
-    return token
+        return None
+    return str(secret) if secret else None
+
+
+def is_session_configured() -> bool:
+    """True when a [session] secret is set. Without one nobody can log in or
+    restore a session; the public pages work regardless."""
+    return _session_secret() is not None
+
+
+@st.cache_resource
+def _session_key() -> bytes:
+    secret = _session_secret()
+    if not secret:
+        raise RuntimeError("[session] secret is missing from .streamlit/secrets.toml")
+    return secret.encode("utf-8")
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_session_key(), payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def _session_claims(token: str) -> Optional[dict]:
+    """Claims of a correctly signed token (expired or not), else None."""
+    payload, _, signature = token.partition(".")
+    if not signature or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        return json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+
+
+@st.cache_data(ttl=_REVOCATION_POLL_SECONDS)
+def _revocations() -> Dict[str, Any]:
+    """{"sids": revoked session ids, "users": {user_id: revoked-before epoch}}."""
+    db = get_db()
+    sids, users = set(), {}
+    for row in db.revoked_sessions.find({}, {"sid": 1, "user_id": 1, "before": 1}):
+        if row.get("sid"):
+            sids.add(row["sid"])
+        if row.get("user_id"):
+            users[row["user_id"]] = max(users.get(row["user_id"], 0), row.get("before", 0))
+    return {"sids": sids, "users": users}
+
+
+def _is_revoked(sid: str, user_id: Optional[str], issued_at: int) -> bool:
+    revoked = _revocations()
+    return sid in revoked["sids"] or issued_at < revoked["users"].get(user_id, 0)
+
+
+def _revoke_user_sessions(db, user_ids: list) -> None:
+    """Invalidate every session issued so far to these users."""
+    now = int(time.time())
+    expires_at = datetime.utcnow() + timedelta(hours=_SESSION_TTL_HOURS)
+    if user_ids:
+        db.revoked_sessions.insert_many([
+            {"user_id": uid, "before": now + 1, "expires_at": expires_at} for uid in user_ids
+        ])
+        db.sessions.delete_many({"user.id": {"$in": user_ids}})
+        _revocations.clear()
+
+
+def create_session(user: dict, ttl_hours: int = _SESSION_TTL_HOURS) -> str:
+    """Issue a signed session token for the given user. No database write."""
+    now = int(time.time())
+    claims = {
+        "sid": secrets.token_urlsafe(12),
+        "id": user.get("id"),
+        "username": user.get("username"),
+        "role": user.get("role"),
+        "judge_id": user.get("judge_id"),
+        "judge_round": user.get("judge_round"),
+        "iat": now,
+        "exp": now + ttl_hours * 3600,
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def _get_legacy_session(token: str) -> Optional[dict]:
+    with _legacy_lock:
+        hit = _legacy_sessions.get(token)
+        if hit:
+            _legacy_sessions.move_to_end(token)
+    if hit is None:
+        row = get_db().sessions.find_one({"token": token, "expires_at": {"$gt": datetime.utcnow()}})
+        if not row:
+            return None
+        hit = (row.get("user"), row["expires_at"])
+        with _legacy_lock:
+            _legacy_sessions[token] = hit
+            while len(_legacy_sessions) > _MAX_LEGACY_SESSIONS:
+                _legacy_sessions.popitem(last=False)
+    user, expires_at = hit
+    if expires_at <= datetime.utcnow() or _is_revoked(token, (user or {}).get("id"), 0):
+        return None
+    return user
 
 
 def get_session(token: str) -> Optional[dict]:
-    """Return the stored user dict for a valid, unexpired token, or None."""
-    if not token:
+    """Return the user dict for a valid, unexpired, unrevoked token, or None.
+    Always None while no [session] secret is configured."""
+    if not token or not is_session_configured():
         return None
-    db = get_db()
-    row = db.sessions.find_one({
-        "token": token,
-        "expires_at": {"$gt": datetime.utcnow()},
-    })
-    return row.get("user") if row else None
+    if "." not in token:
+        return _get_legacy_session(token)
+    claims = _session_claims(token)
+    if not claims or claims.get("exp", 0) <= time.time():
+        return None
+    if _is_revoked(claims.get("sid"), claims.get("id"), claims.get("iat", 0)):
+        return None
+    return {k: claims[k] for k in ("id", "username", "role", "judge_id", "judge_round")
+            if claims.get(k) is not None}
 
 
 def delete_session(token: str) -> None:
-    """Delete a session by token (logout)."""
+    """Revoke a session (logout)."""
     if not token:
         return
     db = get_db()
-    db.sessions.delete_one({"token": token})
+    claims = _session_claims(token) if "." in token and is_session_configured() else None
+    if claims:
+        sid = claims.get("sid")
+        expires_at = datetime.utcfromtimestamp(claims.get("exp", 0))
+    else:
+        sid = token
+        expires_at = datetime.utcnow() + timedelta(hours=_SESSION_TTL_HOURS)
+        db.sessions.delete_one({"token": token})
+        with _legacy_lock:
+            _legacy_sessions.pop(token, None)
+    if sid:
+        db.revoked_sessions.insert_one({"sid": sid, "expires_at": expires_at})
+        _revocations.clear()
@@ -0,0 +1,203 @@
+"""
+pdf_pack.py
+
+Builds the pre-event print pack: one booking receipt per team plus a door sheet
+per room listing every prelim, mentor and robot session held there, all in a
+single ZIP. PDFs are rendered in a process pool and written into the archive
+as each one finishes, with only a few in flight at a time, so memory stays flat
+however many teams there are.
+
+Used by the "📦 Build Print Pack" button on the admin bookings page, or from the
+command line (reads the same .streamlit/secrets.toml as the app):
+
+    python pdf_pack.py autohack_print_pack.zip [--workers 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from fpdf import FPDF
+
+from receipts import render_booking_receipt
+
+_BATCH = 8  # PDFs per worker task — amortises the inter-process round trip
+
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name)).strip("_") or "unnamed"
+
+
+def _arcname(folder: str, name: str, used: set) -> str:
+    """folder/<safe name>.pdf, numbered if another job already has that name
+    (different team names can sanitise to the same string)."""
+    base = f"{folder}/{_safe(name)}"
+    arcname, n = f"{base}.pdf", 1
+    while arcname.lower() in used:
+        n += 1
+        arcname = f"{base}-{n}.pdf"
+    used.add(arcname.lower())
+    return arcname
+
+
+def _latin1(text: str) -> str:
+    return (
+        str(text)
+        .replace("–", "-").replace("—", "--")
+        .replace("’", "'").replace("‘", "'").replace("·", ".")
+        .encode("latin-1", "replace").decode("latin-1")
+    )
+
+
+def render_room_sheet(room: str, rows: List[tuple]) -> bytes:
+    """Door sheet for one room. rows: [(time, session, team, mentor), ...] in order."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_margins(14, 14, 14)
+
+    pdf.set_font("Helvetica", "B", 22)
+    pdf.set_text_color(204, 0, 0)
+    pdf.cell(0, 12, "AutoHack 2026", ln=True, align="C")
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.set_text_color(30, 30, 50)
+    pdf.cell(0, 10, _latin1(f"Room {room}"), ln=True, align="C")
+    pdf.ln(4)
+
+    col_w = [62, 26, 54, 40]
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_fill_color(26, 75, 153)
+    for w, h in zip(col_w, ["Time", "Session", "Team", "Mentor"]):
+        pdf.cell(w, 8, h, border=1, fill=True, align="C")
+    pdf.ln()
+
+    pdf.set_font("Helvetica", "", 10)
+    pdf.set_text_color(20, 20, 40)
+    for idx, row in enumerate(rows, 1):
+        pdf.set_fill_color(240, 243, 252) if idx % 2 == 0 else pdf.set_fill_color(255, 255, 255)
+        for w, val in zip(col_w, row):
+            pdf.cell(w, 7, _latin1(val)[:34], border=1, fill=True)
+        pdf.ln()
+    if not rows:
+        pdf.cell(0, 8, "No sessions booked in this room.", ln=True)
+
+    return bytes(pdf.output())
+
+
+def _render_batch(batch: List[tuple]) -> List[tuple]:
+    """Worker entry point: [(arcname, kind, kwargs), ...] → [(arcname, pdf bytes), ...]."""
+    out = []
+    for arcname, kind, kwargs in batch:
+        render = render_booking_receipt if kind == "receipt" else render_room_sheet
+        out.append((arcname, render(**kwargs)))
+    return out
+
+
+def collect_jobs() -> List[tuple]:
+    """Read the current bookings and registrations and turn them into render jobs."""
+    from db import (
+        MENTOR_ROOM_MAP,
+        get_all_bookings,
+        get_all_mentor_bookings,
+        get_all_robot_bookings,
+        get_team_registrations,
+        slot_label,
+    )
+
+    members = {r["team_name"]: r.get("members", []) for r in get_team_registrations()}
+    prelim = get_all_bookings()
+    used: set = set()
+    jobs = [
+        (_arcname("receipts", b["team_name"], used), "receipt", {
+            "team_name": b["team_name"], "slot_label": slot_label(b.get("slot_id")),
+            "room": b["room"], "members": members.get(b["team_name"], []),
+            "booked_at": b.get("booked_at"),
+        })
+        for b in prelim
+    ]
+
+    rooms: Dict[str, list] = {}
+    for b in prelim:
+        rooms.setdefault(b["room"], []).append((b.get("slot_id"), "Prelim", b["team_name"], ""))
+    for b in get_all_mentor_bookings():
+        room = MENTOR_ROOM_MAP.get(b.get("mentor_name"), "—")
+        rooms.setdefault(room, []).append((b.get("slot_id"), "Mentor", b["team_name"], b.get("mentor_name", "")))
+    for b in get_all_robot_bookings():
+        rooms.setdefault(b["room"], []).append((b.get("slot_id"), "Robot", b["team_name"], ""))
+    for room, entries in sorted(rooms.items()):
+        entries.sort(key=lambda e: (e[0] or 0, e[1], e[2]))
+        rows = [(slot_label(s), kind, team, mentor) for s, kind, team, mentor in entries]
+        jobs.append((_arcname("rooms", room, used), "room", {"room": room, "rows": rows}))
+    return jobs
+
+
+def build_pdf_pack(
+    out,
+    jobs: Optional[List[tuple]] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, float], None]] = None,
+) -> Dict[str, float]:
+    """Render every job and stream the PDFs into a ZIP written to `out` (path or
+    binary file). progress(done, total, elapsed_seconds) is called as batches
+    of files land in the archive. Returns {"files", "bytes", "seconds", "files_per_second"}."""
+    if jobs is None:
+        jobs = collect_jobs()
+    batches = [jobs[i:i + _BATCH] for i in range(0, len(jobs), _BATCH)]
+    workers = max(1, min(workers or os.cpu_count() or 2, 8, len(batches)))
+    window = workers * 2  # batches in flight (rendered but not yet zipped) at most
+    total = len(jobs)
+    done = written = 0
+    start = time.perf_counter()
+
+    # "spawn" so the workers don't inherit the app's threads and DB client
+    ctx = multiprocessing.get_context("spawn")
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        pending = set()
+        queue = iter(batches)
+        while True:
+            for batch in queue:
+                pending.add(pool.submit(_render_batch, batch))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                for arcname, data in future.result():
+                    zf.writestr(arcname, data)
+                    written += len(data)
+                    done += 1
+                if progress:
+                    progress(done, total, time.perf_counter() - start)
+
+    seconds = time.perf_counter() - start
+    stats = {"files": done, "bytes": written, "seconds": seconds,
+             "files_per_second": done / seconds if seconds else 0.0}
+    print(f"pdf_pack: {done} PDFs ({written / 1024:.0f} KB) in {seconds:.1f}s "
+          f"— {stats['files_per_second']:.1f} files/s with {workers} workers")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the AutoHack print pack ZIP.")
+    parser.add_argument("out", help="path of the ZIP file to write")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    def report(done, total, elapsed):
+        sys.stdout.write(f"\r{done}/{total} PDFs  ({done / elapsed if elapsed else 0:.1f}/s)")
+        sys.stdout.flush()
+        if done == total:
+            sys.stdout.write("\n")
+
+    build_pdf_pack(args.out, workers=args.workers, progress=report)
+
+
+if __name__ == "__main__":
+    main()
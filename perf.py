@@ -0,0 +1,345 @@
+"""
+perf.py
+
+Per-rerun MongoDB command profile. A pymongo CommandListener (registered on
+the client in db.get_db) records every command (collection, operation, query
+shape, duration, documents returned) against the Streamlit session that
+issued it. app.py brackets each full script run with begin_run()/end_run();
+commands sent in between (including widget callbacks, which run just before
+the script) make up that run's profile. Fragment-only reruns don't pass
+through app.py; each one is profiled as its own run, kept per fragment id
+and closed when the session's next run starts. Polling fragments call
+ignore_fragment_run() so their reruns (queue_status: every 2 s) are skipped.
+
+The profile is shown to admins in the sidebar "Performance" panel, and
+end_run() prints one JSON line per run (prefixed "perf: ") when the run
+repeated a query shape more than the N+1 threshold, or for every run with
+[perf] log_runs = true in secrets. [perf] n_plus_one sets the threshold
+(default 10).
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import streamlit as st
+from pymongo import monitoring
+
+_DEFAULT_N_PLUS_ONE = 10
+_MAX_SESSIONS = 256   # profiles kept, one per browser session
+_MAX_PENDING = 5000   # commands held for a session between full runs
+
+
+class _Run:
+    def __init__(self, page: str = ""):
+        self.page = page
+        self.started = time.perf_counter()
+        self.commands: List[Dict[str, Any]] = []
+        self.ignored = False
+
+
+_lock = threading.Lock()
+_open: Dict[str, _Run] = {}                          # session_id → run in progress
+_pending: Dict[str, List[Dict[str, Any]]] = {}       # session_id → commands between runs
+_last: "OrderedDict[str, _Run]" = OrderedDict()      # session_id → last finished run
+_inflight: Dict[tuple, Dict[str, Any]] = {}          # (connection, request id) → started command
+_fragment_open: Dict[str, tuple] = {}                # session_id → (fragment ids list, run)
+_fragment_last: "OrderedDict[tuple, _Run]" = OrderedDict()  # (session_id, fragment key) → last run
+
+
+def _ctx():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    return get_script_run_ctx(suppress_warning=True)
+
+
+def _session_id() -> Optional[str]:
+    ctx = _ctx()
+    return ctx.session_id if ctx else None
+
+
+def _setting(name: str, default):
+    try:
+        return st.secrets["perf"][name]
+    except Exception:
+        return default
+
+
+def _shape(value):
+    """The structure of a filter/pipeline with every literal replaced by "?",
+    so the same query with different values has the same shape."""
+    if isinstance(value, dict):
+        return {k: _shape(v) for k, v in value.items()}
+    if isinstance(value, list):
+        # $in / $or lists: the shape shouldn't depend on how many items there are
+        shapes = []
+        for item in map(_shape, value):
+            if item not in shapes:
+                shapes.append(item)
+        return shapes
+    return "?"
+
+
+def _describe(event) -> Dict[str, Any]:
+    cmd = event.command
+    op = event.command_name
+    target = cmd.get(op)
+    collection = target if isinstance(target, str) else cmd.get("collection", "")
+    if op in ("find", "count", "distinct", "findAndModify"):
+        query = cmd.get("filter", cmd.get("query", {}))
+    elif op == "aggregate":
+        query = cmd.get("pipeline", [])
+    elif op in ("update", "delete"):
+        query = [s.get("q", {}) for s in cmd.get("updates", cmd.get("deletes", []))]
+    else:
+        query = {}
+    return {
+        "collection": collection,
+        "op": op,
+        "shape": json.dumps(_shape(query), sort_keys=True, default=str),
+    }
+
+
+def _returned(reply) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if "value" in reply:                      # findAndModify
+        return int(reply["value"] is not None)
+    return int(reply.get("n", 0))
+
+
+def _fragment_key(fragment_ids: list) -> str:
+    return ",".join(fragment_ids)
+
+
+def _close_fragment_run_locked(session_id: str) -> Optional[_Run]:
+    """Move the session's open fragment run to _fragment_last; returns it for
+    logging unless it was ignored."""
+    fragment_ids, run = _fragment_open.pop(session_id, (None, None))
+    if run is None or run.ignored:
+        return None
+    _fragment_last[(session_id, _fragment_key(fragment_ids))] = run
+    _fragment_last.move_to_end((session_id, _fragment_key(fragment_ids)))
+    while len(_fragment_last) > _MAX_SESSIONS:
+        _fragment_last.popitem(last=False)
+    return run
+
+
+def _fragment_run_locked(session_id: str, fragment_ids: list) -> tuple:
+    """The run for this fragment-only rerun, opening it (and closing the
+    session's previous one) on first use. Each rerun gets a fresh
+    fragment_ids list from Streamlit, which is how a new rerun is told apart."""
+    current = _fragment_open.get(session_id)
+    if current is not None and current[0] is fragment_ids:
+        return current[1], None
+    closed = _close_fragment_run_locked(session_id)
+    if len(_fragment_open) >= _MAX_SESSIONS:
+        _fragment_open.pop(next(iter(_fragment_open)))  # a session that went away
+    run = _Run(f"fragment {_fragment_key(fragment_ids)[:8]}")
+    _fragment_open[session_id] = (fragment_ids, run)
+    return run, closed
+
+
+def _record(session_id: str, command: Dict[str, Any], fragment_ids: Optional[list]) -> None:
+    closed = None
+    with _lock:
+        run = _open.get(session_id)
+        if run is None and fragment_ids:
+            run, closed = _fragment_run_locked(session_id, fragment_ids)
+        if run is not None:
+            if not run.ignored:
+                run.commands.append(command)
+        else:
+            if session_id not in _pending and len(_pending) >= _MAX_SESSIONS:
+                _pending.pop(next(iter(_pending)))  # a session that went away
+            pending = _pending.setdefault(session_id, [])
+            if len(pending) < _MAX_PENDING:
+                pending.append(command)
+    if closed is not None:
+        _log(session_id, closed)
+
+
+class CommandProfiler(monitoring.CommandListener):
+    """Attributes each command to the Streamlit session whose thread sent it.
+    Commands from threads without a script run (e.g. the booking queue
+    worker) are ignored."""
+
+    def started(self, event):
+        ctx = _ctx()
+        if ctx is None:
+            return
+        info = _describe(event)
+        info["session"] = ctx.session_id
+        info["fragment_ids"] = ctx.fragment_ids_this_run or None
+        with _lock:
+            _inflight[(event.connection_id, event.request_id)] = info
+
+    def _finish(self, event, docs: int, error: Optional[str] = None):
+        with _lock:
+            info = _inflight.pop((event.connection_id, event.request_id), None)
+        if info is None:
+            return
+        session_id = info.pop("session")
+        fragment_ids = info.pop("fragment_ids")
+        info["ms"] = event.duration_micros / 1000
+        info["docs"] = docs
+        if error:
+            info["error"] = error
+        _record(session_id, info, fragment_ids)
+
+    def succeeded(self, event):
+        self._finish(event, _returned(event.reply))
+
+    def failed(self, event):
+        self._finish(event, 0, str(event.failure.get("errmsg", "failed")))
+
+
+listener = CommandProfiler()
+
+
+# ── Run bookkeeping (called from app.py) ──────────────────────────────────────
+
+def begin_run() -> None:
+    session_id = _session_id()
+    if session_id is None:
+        return
+    run = _Run()
+    with _lock:
+        run.commands = _pending.pop(session_id, [])
+        _open[session_id] = run
+        closed = _close_fragment_run_locked(session_id)
+    if closed is not None:
+        _log(session_id, closed)
+
+
+def ignore_fragment_run() -> None:
+    """Call at the top of a polling fragment: its fragment-only reruns are
+    left out of the profile. No effect when the fragment runs as part of a
+    full run."""
+    ctx = _ctx()
+    if ctx is None or not ctx.fragment_ids_this_run:
+        return
+    with _lock:
+        run, closed = _fragment_run_locked(ctx.session_id, ctx.fragment_ids_this_run)
+        run.ignored = True
+        run.commands = []
+    if closed is not None:
+        _log(ctx.session_id, closed)
+
+
+def label_run(page: str) -> None:
+    """Name the page the current run rendered (for the log line)."""
+    with _lock:
+        run = _open.get(_session_id())
+    if run is not None:
+        run.page = page
+
+
+def end_run() -> None:
+    session_id = _session_id()
+    with _lock:
+        run = _open.pop(session_id, None)
+        if run is None:
+            return
+        _last[session_id] = run
+        _last.move_to_end(session_id)
+        while len(_last) > _MAX_SESSIONS:
+            _last.popitem(last=False)
+    _log(session_id, run)
+
+
+def _log(session_id: str, run: _Run) -> None:
+    profile = summarize(run)
+    if profile["n_plus_one"] or _setting("log_runs", False):
+        print("perf: " + json.dumps({
+            "session": session_id[:8],
+            "page": run.page,
+            "run_ms": round((time.perf_counter() - run.started) * 1000, 1),
+            "commands": profile["commands"],
+            "db_ms": profile["ms"],
+            "docs": profile["docs"],
+            "n_plus_one": profile["n_plus_one"],
+        }, default=str))
+
+
+def summarize(run: _Run) -> Dict[str, Any]:
+    """Totals plus one row per (collection, op, shape), busiest first.
+    `n_plus_one` lists the shapes repeated more than the threshold."""
+    threshold = _setting("n_plus_one", _DEFAULT_N_PLUS_ONE)
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for c in list(run.commands):
+        key = (c["collection"], c["op"], c["shape"])
+        g = groups.setdefault(key, {"collection": c["collection"], "op": c["op"],
+                                    "shape": c["shape"], "count": 0, "ms": 0.0, "docs": 0})
+        g["count"] += 1
+        g["ms"] += c["ms"]
+        g["docs"] += c["docs"]
+    rows = sorted(groups.values(), key=lambda g: (-g["count"], -g["ms"]))
+    for g in rows:
+        g["ms"] = round(g["ms"], 2)
+    return {
+        "commands": len(run.commands),
+        "ms": round(sum(c["ms"] for c in run.commands), 2),
+        "docs": sum(c["docs"] for c in run.commands),
+        "groups": rows,
+        "n_plus_one": [
+            {k: g[k] for k in ("collection", "op", "shape", "count")}
+            for g in rows if g["op"] != "getMore" and g["count"] > threshold
+        ],
+        "threshold": threshold,
+    }
+
+
+def current_profile() -> Optional[Dict[str, Any]]:
+    """Profile of this session's run so far (or its last finished run)."""
+    session_id = _session_id()
+    with _lock:
+        run = _open.get(session_id) or _last.get(session_id)
+    return summarize(run) if run is not None else None
+
+
+def fragment_profiles() -> List[Dict[str, Any]]:
+    """Profiles of this session's last fragment-only rerun per fragment, each
+    with its "page" label ("fragment <id>")."""
+    session_id = _session_id()
+    with _lock:
+        runs = [run for (sid, _), run in _fragment_last.items() if sid == session_id]
+    return [{"page": run.page, **summarize(run)} for run in runs]
+
+
+def panel() -> None:
+    """Admin sidebar panel with the MongoDB commands of this run so far."""
+    profile = current_profile()
+    if profile is None:
+        return
+    with st.sidebar.expander(f"⏱ Performance — {profile['commands']} queries"):
+        c1, c2 = st.columns(2)
+        c1.metric("Queries", profile["commands"])
+        c2.metric("DB time", f"{profile['ms']:.0f} ms")
+        for g in profile["n_plus_one"]:
+            st.warning(
+                f"Possible N+1: `{g['op']}` on `{g['collection']}` ran {g['count']}× "
+                f"this run (threshold {profile['threshold']})."
+            )
+        if profile["groups"]:
+            st.dataframe(
+                [{"Collection": g["collection"], "Op": g["op"], "Count": g["count"],
+                  "ms": g["ms"], "Docs": g["docs"], "Shape": g["shape"]}
+                 for g in profile["groups"]],
+                hide_index=True, use_container_width=True,
+            )
+        for fragment in fragment_profiles():
+            st.caption(
+                f"Last {fragment['page']} rerun: {fragment['commands']} queries, "
+                f"{fragment['ms']:.0f} ms."
+            )
+            for g in fragment["n_plus_one"]:
+                st.warning(
+                    f"Possible N+1 in {fragment['page']}: `{g['op']}` on "
+                    f"`{g['collection']}` ran {g['count']}× (threshold {fragment['threshold']})."
+                )
+        st.caption("Counted up to this panel; fragment reruns are listed separately "
+                   "(polling fragments are not profiled).")
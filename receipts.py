@@ -0,0 +1,207 @@
+"""
+receipts.py
+
+Cache for the PDF receipts teams download (registration confirmation, prelim
+booking). A receipt is identified by a hash of its template version and the
+exact fields printed on it, so the same booking always maps to the same PDF and
+it is rendered at most once per process:
+
+  * in memory, in a small LRU shared by every session, and
+  * optionally in GridFS (bucket "receipts") so that restarts and other app
+    instances reuse it too — enable with [receipts] store_in_gridfs = true in
+    secrets.
+
+Pages call peek_receipt() on every rerun (cheap) and get_receipt() only when
+the team actually asks for the PDF. The receipt layouts live here too, so the
+bulk print pack (pdf_pack.py) renders exactly the same documents.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+_MAX_CACHED = 256  # ~ a few KB each
+
+_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _gridfs_enabled() -> bool:
+    # Streamlit is imported here, not at module level, so that pdf_pack's
+    # worker processes can use the layouts below without loading it.
+    import streamlit as st
+
+    try:
+        return bool(st.secrets.receipts.store_in_gridfs)
+    except Exception:
+        return False
+
+
+def _bucket():
+    import gridfs
+    from db import get_db
+
+    return gridfs.GridFSBucket(get_db(), bucket_name="receipts")
+
+
+def receipt_key(template: str, fields: Dict[str, Any]) -> str:
+    """Content hash of a receipt: template version + every printed field."""
+    payload = json.dumps({"template": template, **fields}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, data: bytes) -> None:
+    with _lock:
+        _cache[key] = data
+        _cache.move_to_end(key)
+        while len(_cache) > _MAX_CACHED:
+            _cache.popitem(last=False)
+
+
+def peek_receipt(template: str, fields: Dict[str, Any]) -> Optional[bytes]:
+    """Return the receipt if it has already been rendered, without rendering it."""
+    key = receipt_key(template, fields)
+    with _lock:
+        data = _cache.get(key)
+        if data is not None:
+            _cache.move_to_end(key)
+            return data
+    if not _gridfs_enabled():
+        return None
+    import gridfs
+
+    try:
+        data = _bucket().open_download_stream_by_name(key).read()
+    except gridfs.errors.NoFile:
+        return None
+    except Exception as exc:
+        print(f"receipts: GridFS read failed, ignoring: {exc}")
+        return None
+    _remember(key, data)
+    return data
+
+
+def get_receipt(template: str, fields: Dict[str, Any], render: Callable[[], bytes]) -> bytes:
+    """Return the cached receipt for (template, fields), rendering it with
+    render() on a miss. `fields` must hold everything render() prints."""
+    data = peek_receipt(template, fields)
+    if data is not None:
+        return data
+    data = render()
+    key = receipt_key(template, fields)
+    _remember(key, data)
+    if _gridfs_enabled():
+        try:
+            _bucket().upload_from_stream(key, data, metadata={"template": template})
+        except Exception as exc:
+            print(f"receipts: GridFS write failed, kept in memory only: {exc}")
+    return data
+
+
+# ── Layouts ───────────────────────────────────────────────────────────────────────
+
+# Bump whenever the layout below changes so cached receipts are re-rendered
+BOOKING_TEMPLATE = "prelim-booking-v1"
+
+
+def render_booking_receipt(
+    team_name: str,
+    slot_label: str,
+    room: str,
+    members: list,
+    booked_at=None,
+) -> bytes:
+    """Prelim booking receipt. Plain arguments only, so it also runs in the
+    worker processes used by pdf_pack."""
+    from fpdf import FPDF  # only loaded once a receipt is actually rendered
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_margins(14, 14, 14)
+
+    # Title
+    pdf.set_font("Helvetica", "B", 22)
+    pdf.set_text_color(204, 0, 0)
+    pdf.cell(0, 12, "AutoHack 2026", ln=True, align="C")
+
+    pdf.set_font("Helvetica", "", 11)
+    pdf.set_text_color(100, 100, 120)
+    pdf.cell(0, 7, "Prelims Slot Booking Receipt", ln=True, align="C")
+
+    # Red / blue divider stripe
+    y = pdf.get_y() + 3
+    pdf.set_draw_color(204, 0, 0)
+    pdf.set_line_width(0.8)
+    pdf.line(14, y, 105, y)
+    pdf.set_draw_color(74, 128, 212)
+    pdf.line(105, y, 196, y)
+    pdf.ln(8)
+
+    # Booking details
+    def _latin1(text: str) -> str:
+        """Replace Unicode chars that Helvetica (Latin-1) cannot encode."""
+        return (
+            str(text)
+            .replace("\u2013", "-")   # en-dash  →  hyphen
+            .replace("\u2014", "--")  # em-dash  →  double hyphen
+            .replace("\u2019", "'")   # right single quote
+            .replace("\u2018", "'")   # left single quote
+            .replace("\u00b7", ".")   # middle dot
+        )
+
+    def _row(label, value):
+        pdf.set_font("Helvetica", "B", 11)
+        pdf.set_text_color(30, 30, 50)
+        pdf.cell(40, 8, label, ln=False)
+        pdf.set_font("Helvetica", "", 11)
+        pdf.cell(0, 8, _latin1(value), ln=True)
+
+    _row("Team Name:", team_name)
+    _row("Time Slot:", slot_label)
+    _row("Room:", room)
+    if booked_at and hasattr(booked_at, "strftime"):
+        _row("Booked at:", booked_at.strftime("%Y-%m-%d %H:%M UTC"))
+    else:
+        _row("Generated:", datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"))
+
+    pdf.ln(4)
+
+    # Members table
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.set_text_color(204, 0, 0)
+    pdf.cell(0, 8, "Team Members", ln=True)
+    pdf.ln(1)
+
+    col_w = [10, 44, 54, 40, 34]
+    headers = ["#", "Full Name", "Email", "Institution", "Program"]
+
+    pdf.set_font("Helvetica", "B", 9)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_fill_color(26, 75, 153)
+    for w, h in zip(col_w, headers):
+        pdf.cell(w, 8, h, border=1, fill=True, align="C")
+    pdf.ln()
+
+    pdf.set_font("Helvetica", "", 9)
+    pdf.set_text_color(20, 20, 40)
+    for idx, m in enumerate(members, 1):
+        fill = idx % 2 == 0
+        if fill:
+            pdf.set_fill_color(240, 243, 252)
+        else:
+            pdf.set_fill_color(255, 255, 255)
+        row = [str(idx), m.get("name", ""), m.get("email", ""),
+               m.get("institution", ""), m.get("program", "")]
+        for w, val in zip(col_w, row):
+            pdf.cell(w, 7, val[:28], border=1, fill=True)
+        pdf.ln()
+
+    pdf.ln(6)
+    pdf.set_font("Helvetica", "I", 8)
+    pdf.set_text_color(150, 150, 170)
+    pdf.cell(0, 6, "Generated by AutoHack 2026 Booking System", align="C")
+
+    return bytes(pdf.output())
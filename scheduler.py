@@ -0,0 +1,243 @@
+"""
+scheduler.py
+
+Assignment engine behind the admin "Auto-schedule" buttons. Pure Python with no
+Streamlit or database access, so it can be benchmarked on its own
+(see benchmarks/bench_scheduler.py).
+
+Each run is a min-cost max-flow problem:
+
+    source ─need─▶ team ─1─▶ slot ─free seats─▶ sink
+
+A team → slot edge costs the slot's rank in the team's preference list (0 for a
+first choice) and DEFAULT_COST for any slot the team did not ask for, so the
+solver first schedules as many sessions as possible and, among those schedules,
+honours the most preferences. Rooms are interchangeable within a slot, so they
+are handed out afterwards by place_in_rooms().
+
+Two things keep it fast for hundreds of teams:
+  * When each team needs a single session and has no blocked slots, the
+    "any slot" edges go through one shared hub node instead of one edge per
+    (team, slot) pair.
+  * Flow is routed with the primal-dual method: each Dijkstra pass is followed
+    by a blocking flow that fills every equally cheap path at once, so the
+    number of passes depends on the handful of distinct costs, not on the
+    number of teams.
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_COST = 100  # cost of a slot the team did not list; larger than any rank
+
+_INF = float("inf")
+
+
+class _FlowGraph:
+    """Residual graph stored as parallel edge arrays (edge i ^ 1 is its reverse)."""
+
+    def __init__(self, n: int):
+        self.adj: List[List[int]] = [[] for _ in range(n)]
+        self.to: List[int] = []
+        self.cap: List[int] = []
+        self.cost: List[int] = []
+
+    def add_edge(self, u: int, v: int, cap: int, cost: int) -> int:
+        e = len(self.to)
+        self.to += [v, u]
+        self.cap += [cap, 0]
+        self.cost += [cost, -cost]
+        self.adj[u].append(e)
+        self.adj[v].append(e + 1)
+        return e
+
+    def push(self, e: int, amount: int = 1) -> None:
+        self.cap[e] -= amount
+        self.cap[e ^ 1] += amount
+
+    def min_cost_flow(self, source: int, sink: int, max_flow: int) -> int:
+        """Primal-dual min-cost flow. Returns the flow pushed.
+
+        Each phase runs one Dijkstra (on reduced costs, so every edge is
+        non-negative) and then saturates *all* shortest paths at once with a
+        Dinic-style blocking flow. Costs are small integers, so there are only
+        a few dozen phases even when hundreds of teams are routed, instead of
+        one shortest-path search per team."""
+        n = len(self.adj)
+        to, cap, cost, adj = self.to, self.cap, self.cost, self.adj
+        pot = [0] * n  # every residual edge starts with a non-negative cost
+        pushed = 0
+        while pushed < max_flow:
+            dist = [_INF] * n
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                pu = pot[u]
+                for e in adj[u]:
+                    if cap[e] > 0:
+                        v = to[e]
+                        nd = d + cost[e] + pu - pot[v]
+                        if nd < dist[v]:
+                            dist[v] = nd
+                            heapq.heappush(heap, (nd, v))
+            if dist[sink] == _INF:
+                break
+            for v in range(n):
+                if dist[v] < _INF:
+                    pot[v] += dist[v]
+            # Blocking flows over the zero-reduced-cost edges
+            while pushed < max_flow:
+                level = [-1] * n
+                level[source] = 0
+                queue = deque([source])
+                while queue:
+                    u = queue.popleft()
+                    for e in adj[u]:
+                        v = to[e]
+                        if cap[e] > 0 and level[v] < 0 and cost[e] + pot[u] == pot[v]:
+                            level[v] = level[u] + 1
+                            queue.append(v)
+                if level[sink] < 0:
+                    break
+                pushed += self._blocking_flow(source, sink, level, pot, max_flow - pushed)
+        return pushed
+
+    def _blocking_flow(self, source: int, sink: int, level: List[int],
+                       pot: List[int], limit: int) -> int:
+        """Unit-at-a-time DFS along the level graph (all team edges have capacity 1)."""
+        to, cap, cost, adj = self.to, self.cap, self.cost, self.adj
+        it = [0] * len(adj)
+        pushed = 0
+        path: List[int] = []
+        u = source
+        while pushed < limit:
+            if u == sink:
+                amount = min(limit - pushed, min(cap[e] for e in path))
+                for e in path:
+                    self.push(e, amount)
+                pushed += amount
+                path.clear()
+                u = source
+                continue
+            edges = adj[u]
+            while it[u] < len(edges):
+                e = edges[it[u]]
+                v = to[e]
+                if cap[e] > 0 and level[v] == level[u] + 1 and cost[e] + pot[u] == pot[v]:
+                    break
+                it[u] += 1
+            if it[u] < len(edges):
+                path.append(edges[it[u]])
+                u = to[edges[it[u]]]
+            elif u == source:
+                break
+            else:
+                level[u] = -1  # dead end for the rest of this phase
+                e = path.pop()
+                u = to[e ^ 1]
+                it[u] += 1
+        return pushed
+
+
+def solve(
+    teams: Iterable[str],
+    slot_capacity: Dict[int, int],
+    need=1,
+    preferences: Optional[Dict[str, List[int]]] = None,
+    blocked: Optional[Dict[str, Iterable[int]]] = None,
+) -> Dict[str, List[int]]:
+    """Assign teams to slots.
+
+    teams          team names, in priority order (earlier teams win ties)
+    slot_capacity  {slot_id: free seats in that slot across all rooms}
+    need           sessions per team — an int, or {team: int}
+    preferences    {team: [slot_id, ...]} best first (optional)
+    blocked        {team: slot_ids the team cannot take} (optional)
+
+    Returns {team: [slot_id, ...]} for every team that got at least one slot.
+    A team never gets the same slot twice.
+    """
+    teams = list(teams)
+    preferences = preferences or {}
+    blocked = {t: set(s) for t, s in (blocked or {}).items() if s}
+    needs = {t: (need.get(t, 0) if isinstance(need, dict) else need) for t in teams}
+    teams = [t for t in teams if needs[t] > 0]
+    slots = [s for s, c in slot_capacity.items() if c > 0]
+    if not teams or not slots:
+        return {}
+
+    use_hub = not blocked and all(needs[t] == 1 for t in teams)
+    # Node ids: 0 source, 1 sink, 2 hub, then slots, then teams
+    source, sink, hub = 0, 1, 2
+    slot_node = {s: 3 + i for i, s in enumerate(slots)}
+    team_base = 3 + len(slots)
+    g = _FlowGraph(team_base + len(teams))
+
+    hub_edge = {}
+    for s in slots:
+        g.add_edge(slot_node[s], sink, slot_capacity[s], 0)
+        if use_hub:
+            hub_edge[s] = g.add_edge(hub, slot_node[s], slot_capacity[s], 0)
+
+    # Per team: its options as (cost, slot_id | None for hub, edge id), cheapest first
+    team_options: Dict[str, list] = {}
+    for i, team in enumerate(teams):
+        node = team_base + i
+        g.add_edge(source, node, needs[team], 0)
+        banned = blocked.get(team, ())
+        options = []
+        seen = set()
+        for rank, s in enumerate(preferences.get(team, [])):
+            if s in slot_node and s not in banned and s not in seen:
+                seen.add(s)
+                options.append((rank, s, g.add_edge(node, slot_node[s], 1, rank)))
+        if use_hub:
+            options.append((DEFAULT_COST, None, g.add_edge(node, hub, 1, DEFAULT_COST)))
+        else:
+            for s in slots:
+                if s not in seen and s not in banned:
+                    options.append((DEFAULT_COST, s, g.add_edge(node, slot_node[s], 1, DEFAULT_COST)))
+        team_options[team] = options
+
+    g.min_cost_flow(source, sink, sum(needs.values()))
+
+    # Read the flow back: direct edges name their slot; hub units are matched to
+    # the hub → slot flows (all cost 0, so any pairing is optimal).
+    result: Dict[str, List[int]] = {}
+    via_hub: List[str] = []
+    for team in teams:
+        for cost, s, e in team_options[team]:
+            if g.cap[e ^ 1] > 0:
+                if s is None:
+                    via_hub.append(team)
+                else:
+                    result.setdefault(team, []).append(s)
+    if via_hub:
+        hub_slots = [s for s in slots for _ in range(g.cap[hub_edge[s] ^ 1])]
+        for team, s in zip(via_hub, hub_slots):
+            result.setdefault(team, []).append(s)
+    return result
+
+
+def place_in_rooms(
+    assignment: Dict[str, List[int]],
+    room_capacity: Dict[int, Dict[str, int]],
+) -> List[tuple]:
+    """Spread each slot's teams over its rooms.
+
+    room_capacity  {slot_id: {room: free seats}}
+    Returns [(team, slot_id, room), ...].
+    """
+    free = {s: dict(rooms) for s, rooms in room_capacity.items()}
+    placed = []
+    for team, slot_ids in assignment.items():
+        for s in slot_ids:
+            rooms = free[s]
+            room = max(rooms, key=rooms.__getitem__)
+            rooms[room] -= 1
+            placed.append((team, s, room))
+    return placed
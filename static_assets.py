@@ -0,0 +1,106 @@
+"""
+static_assets.py
+
+Registry for the logos shown in page banners. At startup (once per process)
+every image in assets/ is hashed and copied to static/<name>.<hash><ext>, which
+Streamlit serves at app/static/... when [server] enableStaticServing is on (see
+.streamlit/config.toml). Pages then send a short URL instead of re-reading the
+file and inlining it as base64 on every rerun. The hash in the filename means a
+changed logo gets a new URL. Streamlit sends no long-lived Cache-Control for
+these files, so browsers still revalidate them (by ETag), but never get a stale
+logo after an update.
+
+SVG files, and every file if static serving is turned off, fall back to data
+URIs, still built only once per process: some Streamlit static handlers serve
+.svg as text/plain with nosniff, and browsers won't render that as an image.
+"""
+
+import base64
+import hashlib
+import os
+from typing import Dict, Optional
+
+import streamlit as st
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+_ASSETS_DIR = os.path.join(_ROOT, "assets")
+_STATIC_DIR = os.path.join(_ROOT, "static")  # must sit next to app.py
+_EXTENSIONS = {".png", ".jpg", ".jpeg", ".svg", ".webp", ".gif"}
+_INLINE_EXTENSIONS = {".svg"}  # not reliably served with an image content type
+
+
+def _mime(name: str) -> str:
+    ext = os.path.splitext(name)[1].lstrip(".").lower()
+    return "image/svg+xml" if ext == "svg" else f"image/{ext}"
+
+
+def publish_bytes(stem: str, data: bytes, ext: str) -> Optional[str]:
+    """Write `data` to static/<stem>.<hash><ext> and return its app/static URL,
+    or None if static serving is off or the file can't be written."""
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    stem = "".join(c if c.isalnum() or c in "-_" else "_" for c in stem)
+    ext = ext.lower()
+    name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+    target = os.path.join(_STATIC_DIR, name)
+    try:
+        os.makedirs(_STATIC_DIR, exist_ok=True)
+        if not os.path.exists(target):
+            tmp = f"{target}.tmp{os.getpid()}"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, target)  # atomic, so a half-written file is never served
+        # Drop copies of older versions of the same file
+        for old in os.listdir(_STATIC_DIR):
+            if old != name and old.startswith(f"{stem}.") and old.endswith(ext):
+                os.remove(os.path.join(_STATIC_DIR, old))
+    except OSError as exc:
+        print(f"static_assets: could not publish {stem}{ext}, inlining it instead: {exc}")
+        return None
+    return f"app/static/{name}"
+
+
+@st.cache_resource
+def _registry() -> Dict[str, str]:
+    """{"assets/<file>": src URL for an <img> tag}, built once per process."""
+    urls: Dict[str, str] = {}
+    if not os.path.isdir(_ASSETS_DIR):
+        return urls
+    for entry in sorted(os.listdir(_ASSETS_DIR)):
+        path = os.path.join(_ASSETS_DIR, entry)
+        stem, ext = os.path.splitext(entry)
+        if ext.lower() not in _EXTENSIONS or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as fh:
+            data = fh.read()
+        urls[f"assets/{entry}"] = (
+            (ext.lower() not in _INLINE_EXTENSIONS and publish_bytes(stem, data, ext))
+            or f"data:{_mime(entry)};base64,{base64.b64encode(data).decode()}"
+        )
+    # Print-pack ZIPs were once written to static/, where anyone with the
+    # URL could fetch them; remove any left behind
+    if os.path.isdir(_STATIC_DIR):
+        for old in os.listdir(_STATIC_DIR):
+            if old.startswith("print-pack-") and old.endswith(".zip"):
+                try:
+                    os.remove(os.path.join(_STATIC_DIR, old))
+                except OSError as exc:
+                    print(f"static_assets: could not remove stale {old}: {exc}")
+    served = sum(not u.startswith("data:") for u in urls.values())
+    print(f"static_assets: {len(urls)} asset(s) registered, {served} via static serving")
+    return urls
+
+
+def asset_url(path: str) -> Optional[str]:
+    """URL for an image under assets/ (e.g. "assets/georgian_logo.png"), or None
+    if there is no such file."""
+    return _registry().get(os.path.normpath(path).replace(os.sep, "/"))
+
+
+def img_tag(path: str, style: str, alt: str = "") -> str:
+    """<img> tag for an asset, or "" if it doesn't exist — so callers can chain
+    fallbacks with `or`."""
+    url = asset_url(path)
+    if not url:
+        return ""
+    return f'<img src="{url}" style="{style}" alt="{alt}">'
@@ -0,0 +1,99 @@
+"""
+theme.py
+
+Page stylesheets. Each page used to send its whole <style> block (several KB)
+as a markdown element on every rerun. Now a page's sheet is minified once per
+process and published via static_assets as static/theme-<name>.<hash>.css, so
+a rerun only carries a short <link> to it (the tag is re-sent each run, as
+every element is, but the browser keeps the same node and fetches the file
+once); an edited sheet gets a new URL.
+
+This relies on app/static serving .css as text/css. Older Streamlit static
+handlers sent it as text/plain with nosniff, which browsers refuse as a
+stylesheet, hence the streamlit>=1.66 pin in requirements.txt.
+
+Rules used on several pages live here: the banner subtitle/stripe (BASE_CSS)
+and the slot grid classes (GRID_CSS), so grid cells carry a class instead of a
+long inline style string.
+"""
+
+import re
+from html import escape
+
+import streamlit as st
+
+from static_assets import publish_bytes
+
+BASE_CSS = """
+.ah-subtitle {
+    color: rgba(200,210,230,0.70); font-size: 0.95rem;
+    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
+}
+.ah-stripe {
+    height: 3px;
+    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
+    border-radius: 2px; width: 55%; margin: 16px auto 0;
+}
+"""
+
+# Grid cells sit in a fixed-layout table spaced like st.columns; Streamlit's own
+# markdown-table borders, padding and zebra striping are switched off.
+GRID_CSS = """
+table.ah-grid {
+    width: calc(100% + 2rem); margin: 0 -1rem; table-layout: fixed;
+    border-collapse: separate; border-spacing: 1rem 0.3rem;
+}
+table.ah-grid th, table.ah-grid td {
+    border: none; padding: 0; background: transparent;
+    vertical-align: middle; font-weight: inherit; text-align: inherit;
+}
+table.ah-grid p { margin: 0; }
+table.ah-grid .ah-grid-head {
+    color: #6B9FE4; font-weight: 700; font-size: 0.82rem; text-transform: uppercase;
+    padding-bottom: 4px; border-bottom: 1px solid rgba(74,128,212,0.35);
+}
+table.ah-grid .ah-grid-head.ah-center { text-align: center; }
+table.ah-grid .ah-grid-time { color: rgba(220,230,250,0.85); font-size: 0.88rem; padding-top: 6px; }
+table.ah-grid p.ah-grid-day {
+    color: rgba(220,160,0,0.80); font-size: 0.78rem; font-weight: 700; margin: 8px 0 2px;
+}
+table.ah-grid .ah-grid-sub { font-weight: 400; opacity: 0.55; font-size: 0.72rem; }
+table.ah-grid .ah-grid-free { color: rgba(120,240,140,0.80); }
+"""
+
+
+def minify(css: str) -> str:
+    """Strip <style> tags, comments and insignificant whitespace."""
+    css = re.sub(r"</?style[^>]*>", "", css)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)  # not before ":" — "a :hover" differs from "a:hover"
+    return css.replace(";}", "}").strip()
+
+
+@st.cache_resource(show_spinner=False)
+def _stylesheet(name: str, css: str) -> str:
+    """The markup that loads sheet `name`, built once per process and sheet."""
+    data = minify(css)
+    url = publish_bytes(f"theme-{name}", data.encode("utf-8"), ".css")
+    if url:
+        return f'<link rel="stylesheet" href="{escape(url)}">'
+    return f"<style>{data}</style>"  # static serving off: inline, but minified
+
+
+def apply_stylesheet(name: str, *css: str) -> None:
+    """Load the stylesheet made of the given CSS blocks (in order) on this page."""
+    st.markdown(_stylesheet(name, "\n".join(css)), unsafe_allow_html=True)
+
+
+def grid_header(label: str, center: bool = True) -> str:
+    return f'<p class="ah-grid-head{" ah-center" if center else ""}">{label}</p>'
+
+
+def grid_time(label: str) -> str:
+    return f'<p class="ah-grid-time">{label}</p>'
+
+
+def grid_day(day: str) -> str:
+    return f'<p class="ah-grid-day">&#9654; {day}</p>'
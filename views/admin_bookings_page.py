@@ -5,18 +5,26 @@ Admin page: view and manage all prelim booking slots.
 Shows a 9-slot × 3-room grid with edit/delete controls.
 """
 
+import os
+from html import escape
+
 import streamlit as st
 
 from db import (
     PRELIM_ROOMS,
-    PRELIM_SLOTS,
+    PRELIM_SLOT_IDS,
+    slot_label,
     get_all_bookings,
     get_booked_slot_map,
     admin_update_booking,
     admin_delete_booking,
-    get_approved_team_names,
-    get_booking_history,
+    get_booking_history_page,
+    get_booking_history_teams,
+    iter_booking_history,
+    get_booking_queue_enabled,
+    set_booking_queue_enabled,
 )
+from components import auto_schedule_panel, bulk_edit_bookings, slot_grid
 
 _KNOWN_APP_URL = "https://judgingapp26.streamlit.app"
 
@@ -25,6 +33,110 @@ def _booking_link() -> str:
     return f"{_KNOWN_APP_URL}/?page=book"
 
 
+def _render_queue_toggle():
+    st.toggle(
+        "Admission queue (turn on at booking opening time)",
+        value=get_booking_queue_enabled(),
+        key="admin_booking_queue_toggle",
+        on_change=lambda: set_booking_queue_enabled(
+            st.session_state["admin_booking_queue_toggle"]
+        ),
+        help="When on, prelim, mentor and robot booking requests wait in a first-come, "
+             "first-served line and are processed one at a time. Teams see their position.",
+    )
+
+
+@st.fragment
+def _booking_editor(booking: dict):
+    """Edit/delete controls for one booking. Picking a new slot or room reruns
+    only this fragment; a successful save reruns the page to refresh the grid."""
+    bid = booking["id"]
+    with st.expander(
+        f"**{booking['team_name']}** — {slot_label(booking.get('slot_id'))}  ·  Room {booking['room']}",
+        expanded=False,
+    ):
+        col_edit, col_del = st.columns([3, 1])
+
+        with col_edit:
+            st.markdown("**Edit booking**")
+
+            new_slot = st.selectbox(
+                "New Time Slot",
+                options=PRELIM_SLOT_IDS,
+                format_func=slot_label,
+                index=PRELIM_SLOT_IDS.index(booking.get("slot_id"))
+                      if booking.get("slot_id") in PRELIM_SLOT_IDS else 0,
+                key=f"edit_slot_{bid}",
+            )
+            new_room = st.selectbox(
+                "New Room",
+                options=PRELIM_ROOMS,
+                index=PRELIM_ROOMS.index(booking["room"])
+                      if booking["room"] in PRELIM_ROOMS else 0,
+                key=f"edit_room_{bid}",
+            )
+
+            if st.button("Save Changes", key=f"save_{bid}", type="primary"):
+                try:
+                    admin_update_booking(bid, new_slot, new_room)
+                    st.toast(
+                        f"✅ Updated: **{booking['team_name']}** → "
+                        f"**{slot_label(new_slot)}** — Room **{new_room}**"
+                    )
+                    st.rerun()
+                except ValueError as exc:
+                    st.error(str(exc))
+
+        with col_del:
+            st.markdown("**Remove**")
+            if st.button("🗑️ Delete", key=f"del_{bid}"):
+                _confirm_delete(booking)
+
+
+@st.dialog("Delete booking")
+def _confirm_delete(booking: dict):
+    st.warning(f"Are you sure you want to remove the booking for **{booking['team_name']}**?")
+    yes_col, no_col = st.columns(2)
+    if yes_col.button("Yes, delete", type="primary", use_container_width=True):
+        admin_delete_booking(booking["id"])
+        st.toast(f"Booking for **{booking['team_name']}** removed.")
+        st.rerun()
+    if no_col.button("Cancel", use_container_width=True):
+        st.rerun()
+
+
+@st.fragment
+def _print_pack():
+    # Print pack: every team's receipt + a door sheet per room, built on request
+    if st.button("📦 Build Print Pack (ZIP)", key="print_pack_build",
+                 help="Receipts for every booked team plus a schedule sheet for each room."):
+        import tempfile
+        from pdf_pack import build_pdf_pack
+
+        bar = st.progress(0.0, text="Rendering PDFs…")
+
+        def _pack_progress(done, total, elapsed):
+            rate = done / elapsed if elapsed else 0.0
+            bar.progress(done / total, text=f"{done}/{total} PDFs · {rate:.0f} per second")
+
+        # The ZIP holds team members' names and emails, so it goes to a private
+        # temp file (never static/) and is only read if the admin clicks
+        # download; the previous build's file is removed
+        old = st.session_state.pop("print_pack_tmp", None)
+        if old and os.path.exists(old):
+            os.remove(old)
+        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
+            path = tmp.name
+        st.session_state["print_pack_tmp"] = path
+        stats = build_pdf_pack(path, progress=_pack_progress)
+        st.download_button(
+            label=f"📥 Download Print Pack ({stats['files']} PDFs)",
+            data=lambda: open(path, "rb"),
+            file_name="autohack_print_pack.zip",
+            mime="application/zip",
+        )
+
+
 def show():
     user = st.session_state.get("user")
     if not user or user.get("role") != "admin":
@@ -39,15 +151,16 @@ def show():
         st.code(_booking_link(), language=None)
         st.caption("Teams can book or switch their prelims slot at this link. No login required.")
 
+    _render_queue_toggle()
     st.write("")
 
     # ── Load data ────────────────────────────────────────────────────────────────
     all_bookings = get_all_bookings()
-    booked_map: dict = {}   # (slot_label, room) → booking doc
+    booked_map: dict = {}   # (slot_id, room) → booking doc
     for b in all_bookings:
-        booked_map[(b["slot_label"], b["room"])] = b
+        booked_map[(b.get("slot_id"), b["room"])] = b
 
-    total_slots  = len(PRELIM_SLOTS) * len(PRELIM_ROOMS)
+    total_slots  = len(PRELIM_SLOT_IDS) * len(PRELIM_ROOMS)
     booked_count = len(all_bookings)
 
     # ── Summary metrics ──────────────────────────────────────────────────────────
@@ -61,95 +174,37 @@ def show():
     # ── Booking grid ─────────────────────────────────────────────────────────────
     st.subheader("Slot Overview")
 
-    # Column headers
-    header_cols = st.columns([2.2] + [1.6] * len(PRELIM_ROOMS))
-    header_cols[0].markdown(
-        "**Time Slot**",
-    )
-    for i, room in enumerate(PRELIM_ROOMS, start=1):
-        header_cols[i].markdown(f"**Room {room}**")
-
-    st.write("")
-
-    for slot in PRELIM_SLOTS:
-        row_cols = st.columns([2.2] + [1.6] * len(PRELIM_ROOMS))
-        row_cols[0].write(slot)
-
-        for i, room in enumerate(PRELIM_ROOMS, start=1):
-            booking = booked_map.get((slot, room))
+    rows = []
+    for slot_id in PRELIM_SLOT_IDS:
+        row = [slot_label(slot_id)]
+        for room in PRELIM_ROOMS:
+            booking = booked_map.get((slot_id, room))
             if booking:
-                row_cols[i].markdown(
-                    f"🔴 **{booking['team_name']}**",
-                )
+                row.append(f"🔴 <b>{escape(booking['team_name'])}</b>")
             else:
-                row_cols[i].markdown(
-                    "<span style='color:rgba(120,240,140,0.80);'>✅ Free</span>",
-                    unsafe_allow_html=True,
-                )
+                row.append('<span class="ah-grid-free">✅ Free</span>')
+        rows.append(row)
+    slot_grid(
+        ["<b>Time Slot</b>"] + [f"<b>Room {room}</b>" for room in PRELIM_ROOMS],
+        rows,
+        [2.2] + [1.6] * len(PRELIM_ROOMS),
+    )
 
     st.divider()
 
     # ── Full booking list with edit/delete ───────────────────────────────────────
     st.subheader("Manage Bookings")
+    auto_schedule_panel("prelim", "prelim_auto")
 
     if not all_bookings:
         st.info("No bookings have been made yet.")
+    elif st.toggle("Bulk edit", key="admin_bookings_bulk_toggle",
+                   help="Edit many bookings in a table and save them all at once."):
+        bulk_edit_bookings("prelim", all_bookings, PRELIM_SLOT_IDS, "room", PRELIM_ROOMS,
+                           "prelim_bulk")
     else:
-        approved_teams = get_approved_team_names()
-
         for booking in all_bookings:
-            bid  = booking["id"]
-            with st.expander(
-                f"**{booking['team_name']}** — {booking['slot_label']}  ·  Room {booking['room']}",
-                expanded=False,
-            ):
-                col_edit, col_del = st.columns([3, 1])
-
-                with col_edit:
-                    st.markdown("**Edit booking**")
-
-                    new_slot = st.selectbox(
-                        "New Time Slot",
-                        options=PRELIM_SLOTS,
-                        index=PRELIM_SLOTS.index(booking["slot_label"])
-                              if booking["slot_label"] in PRELIM_SLOTS else 0,
-                        key=f"edit_slot_{bid}",
-                    )
-                    new_room = st.selectbox(
-                        "New Room",
-                        options=PRELIM_ROOMS,
-                        index=PRELIM_ROOMS.index(booking["room"])
-                              if booking["room"] in PRELIM_ROOMS else 0,
-                        key=f"edit_room_{bid}",
-                    )
-
-                    if st.button("Save Changes", key=f"save_{bid}", type="primary"):
-                        try:
-                            admin_update_booking(bid, new_slot, new_room)
-                            st.success(
-                                f"✅ Updated: **{booking['team_name']}** → "
-                                f"**{new_slot}** — Room **{new_room}**"
-                            )
-                            st.rerun()
-                        except ValueError as exc:
-                            st.error(str(exc))
-
-                with col_del:
-                    st.markdown("**Remove**")
-                    if st.button("🗑️ Delete", key=f"del_{bid}"):
-                        st.session_state[f"confirm_del_{bid}"] = True
-
-                    if st.session_state.get(f"confirm_del_{bid}"):
-                        st.warning(f"Are you sure you want to remove the booking for **{booking['team_name']}**?")
-                        yes_col, no_col = st.columns(2)
-                        if yes_col.button("Yes, delete", key=f"yes_del_{bid}", type="primary"):
-                            admin_delete_booking(bid)
-                            st.session_state.pop(f"confirm_del_{bid}", None)
-                            st.success(f"Booking for **{booking['team_name']}** removed.")
-                            st.rerun()
-                        if no_col.button("Cancel", key=f"no_del_{bid}"):
-                            st.session_state.pop(f"confirm_del_{bid}", None)
-                            st.rerun()
+            _booking_editor(booking)
 
     st.divider()
 
@@ -159,7 +214,7 @@ def show():
         output = io.StringIO()
         writer = csv.DictWriter(
             output,
-            fieldnames=["team_name", "slot_label", "room", "booked_at"],
+            fieldnames=["team_name", "slot_id", "slot_label", "room", "booked_at"],
             extrasaction="ignore",
         )
         writer.writeheader()
@@ -171,6 +226,8 @@ def show():
             mime="text/csv",
         )
 
+    _print_pack()
+
     st.divider()
 
     # ── Booking History / Audit Log ──────────────────────────────────────────────
@@ -180,49 +237,83 @@ def show():
         "Most recent first. Use this to verify what a team booked and when."
     )
 
-    history = get_booking_history()
+    _render_history()
+
+
+_ACTION_LABELS = {
+    "booked":        "✅ Booked",
+    "switched":      "🔄 Switched",
+    "admin_updated": "✏️ Admin Updated",
+    "admin_deleted": "🗑️ Admin Deleted",
+    "auto_scheduled": "🤖 Auto-scheduled",
+}
+
+_HISTORY_COLUMNS = ["Timestamp (UTC)", "Team", "Action", "Slot", "Room", "Previous Slot / Room"]
+
+
+def _history_row(h: dict) -> dict:
+    ts = h.get("timestamp")
+    ts_str = ts.strftime("%Y-%m-%d %H:%M:%S UTC") if hasattr(ts, "strftime") else str(ts or "—")
+    action = h.get("action", "")
+    prev = ""
+    if h.get("previous_slot") and h.get("previous_room"):
+        prev = f"{h['previous_slot']} · Room {h['previous_room']}"
+    return {
+        "Timestamp (UTC)": ts_str,
+        "Team": h.get("team_name", "—"),
+        "Action": _ACTION_LABELS.get(action, action),
+        "Slot": h.get("slot_label", "—"),
+        "Room": h.get("room", "—"),
+        "Previous Slot / Room": prev or "—",
+    }
+
+
+@st.fragment
+def _render_history():
+    """One page of the audit log at a time. The cursors of the pages already
+    visited are kept in session_state so "Newer" can step back. A fragment, so
+    paging and filtering don't rerun the rest of the page."""
+    f1, f2 = st.columns(2)
+    team = f1.selectbox(
+        "Team", options=[""] + get_booking_history_teams(),
+        format_func=lambda t: t or "All teams", key="hist_team",
+    )
+    action = f2.selectbox(
+        "Action", options=[""] + list(_ACTION_LABELS),
+        format_func=lambda a: _ACTION_LABELS.get(a, "All actions"), key="hist_action",
+    )
+
+    # Start over from the newest page whenever the filters change
+    filters = (team, action)
+    if st.session_state.get("hist_filters") != filters:
+        st.session_state["hist_filters"] = filters
+        st.session_state["hist_cursors"] = [None]
+    cursors = st.session_state["hist_cursors"]
 
+    history, next_cursor = get_booking_history_page(team or None, action or None, cursors[-1])
     if not history:
         st.info("No booking events recorded yet.")
-    else:
+        return
+
+    import pandas as pd
+    df = pd.DataFrame([_history_row(h) for h in history], columns=_HISTORY_COLUMNS)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    nav_prev, nav_page, nav_next = st.columns([1, 2, 1])
+    nav_prev.button("← Newer", disabled=len(cursors) == 1, key="hist_newer",
+                    on_click=cursors.pop)
+    nav_page.caption(f"Page {len(cursors)}")
+    nav_next.button("Older →", disabled=next_cursor is None, key="hist_older",
+                    on_click=cursors.append, args=(next_cursor,))
+
+    # Export history as CSV — built only on request, streamed from the DB cursor
+    if st.button("Prepare History CSV", key="hist_prepare_csv"):
         import csv, io
-        import pandas as pd
-
-        _action_labels = {
-            "booked":        "✅ Booked",
-            "switched":      "🔄 Switched",
-            "admin_updated": "✏️ Admin Updated",
-            "admin_deleted": "🗑️ Admin Deleted",
-        }
-
-        rows = []
-        for h in history:
-            ts = h.get("timestamp")
-            ts_str = ts.strftime("%Y-%m-%d %H:%M:%S UTC") if hasattr(ts, "strftime") else str(ts or "—")
-            action = h.get("action", "")
-            prev = ""
-            if h.get("previous_slot") and h.get("previous_room"):
-                prev = f"{h['previous_slot']} · Room {h['previous_room']}"
-            rows.append({
-                "Timestamp (UTC)": ts_str,
-                "Team": h.get("team_name", "—"),
-                "Action": _action_labels.get(action, action),
-                "Slot": h.get("slot_label", "—"),
-                "Room": h.get("room", "—"),
-                "Previous Slot / Room": prev or "—",
-            })
-
-        df = pd.DataFrame(rows)
-        st.dataframe(df, use_container_width=True, hide_index=True)
-
-        # Export history as CSV
         hist_output = io.StringIO()
-        hist_writer = csv.DictWriter(
-            hist_output,
-            fieldnames=["Timestamp (UTC)", "Team", "Action", "Slot", "Room", "Previous Slot / Room"],
-        )
+        hist_writer = csv.DictWriter(hist_output, fieldnames=_HISTORY_COLUMNS)
         hist_writer.writeheader()
-        hist_writer.writerows(rows)
+        for h in iter_booking_history(team or None, action or None):
+            hist_writer.writerow(_history_row(h))
         st.download_button(
             label="📥 Export History CSV",
             data=hist_output.getvalue(),
@@ -5,15 +5,15 @@ Admin page: view and manage all mentor & robot scheduling bookings.
 Shows a full grid overview plus per-booking edit/delete controls.
 """
 
+from html import escape
+
 import streamlit as st
 
 from db import (
     MENTOR_NAMES,
     MENTOR_ROOM_MAP,
     SCHED_ROBOT_ROOMS,
-    SCHED_FRIDAY_SLOTS,
-    SCHED_SATURDAY_SLOTS,
-    SCHED_ALL_SLOTS,
+    SCHED_SLOT_IDS,
     MAX_MENTOR_BOOKINGS,
     MAX_ROBOT_BOOKINGS,
     get_all_mentor_bookings,
@@ -22,7 +22,14 @@ from db import (
     admin_update_robot_booking,
     admin_delete_mentor_booking,
     admin_delete_robot_booking,
+    get_booking_queue_enabled,
+    set_booking_queue_enabled,
+    slot_day,
+    slot_label,
+    slot_short_label,
 )
+from components import auto_schedule_panel, bulk_edit_bookings, lazy_tabs, slot_grid
+from theme import grid_day
 
 _KNOWN_APP_URL = "https://judgingapp26.streamlit.app"
 
@@ -31,21 +38,101 @@ def _schedule_link() -> str:
     return f"{_KNOWN_APP_URL}/?page=mentor-robot-schedule"
 
 
-def _is_friday(slot_label: str) -> bool:
-    return slot_label.startswith("Fri")
+def _is_friday(slot_id: int) -> bool:
+    return slot_day(slot_id) == "Fri"
 
 
 # ── Mentor Schedule tab ──────────────────────────────────────────────────────────
 
+def _overview_grid(headers: list, places: list, booked_map: dict, widths: list) -> None:
+    """Slot × mentor/room overview; booked_map is keyed by (slot_id, place)."""
+    rows = []
+    last_day = None
+    for slot in SCHED_SLOT_IDS:
+        day = "Friday Mar 6" if _is_friday(slot) else "Saturday Mar 7"
+        if day != last_day:
+            last_day = day
+            rows.append(grid_day(day))
+        row = [slot_short_label(slot)]
+        for place in places:
+            bk = booked_map.get((slot, place))
+            if bk:
+                row.append(f"\U0001f534 <b>{escape(bk['team_name'])}</b>")
+            else:
+                row.append('<span class="ah-grid-free">\u2705 Free</span>')
+        rows.append(row)
+    slot_grid(["<b>Time Slot</b>"] + headers, rows, widths)
+
+
+@st.dialog("Delete booking")
+def _confirm_delete(question: str, delete, booking_id: str):
+    st.warning(question)
+    y, n_btn = st.columns(2)
+    if y.button("Yes, delete", type="primary", use_container_width=True):
+        delete(booking_id)
+        st.toast("Booking removed.")
+        st.rerun()
+    if n_btn.button("Cancel", use_container_width=True):
+        st.rerun()
+
+
+@st.fragment
+def _mentor_editor(booking: dict):
+    """Edit/delete controls for one mentor booking. Changing a picker reruns
+    only this fragment; a save or delete reruns the page so the grid updates."""
+    bid = booking["id"]
+    day_tag = "Fri" if _is_friday(booking.get("slot_id")) else "Sat"
+    with st.expander(
+        f"**{booking['team_name']}** — {booking['mentor_name']}  ·  "
+        f"{slot_short_label(booking.get('slot_id'))} ({day_tag})",
+        expanded=False,
+    ):
+        col_edit, col_del = st.columns([3, 1])
+
+        with col_edit:
+            st.markdown("**Edit booking**")
+            new_mentor = st.selectbox(
+                "Mentor",
+                options=MENTOR_NAMES,
+                index=MENTOR_NAMES.index(booking["mentor_name"])
+                      if booking["mentor_name"] in MENTOR_NAMES else 0,
+                key=f"edit_m_mentor_{bid}",
+            )
+            new_slot = st.selectbox(
+                "Time Slot",
+                options=SCHED_SLOT_IDS,
+                format_func=slot_label,
+                index=SCHED_SLOT_IDS.index(booking.get("slot_id"))
+                      if booking.get("slot_id") in SCHED_SLOT_IDS else 0,
+                key=f"edit_m_slot_{bid}",
+            )
+            if st.button("Save Changes", key=f"save_m_{bid}", type="primary"):
+                try:
+                    admin_update_mentor_booking(bid, new_mentor, new_slot)
+                    st.toast(
+                        f"\u2705 Updated: **{booking['team_name']}** \u2192 "
+                        f"**{new_mentor}** at **{slot_label(new_slot)}**"
+                    )
+                    st.rerun()
+                except ValueError as exc:
+                    st.error(str(exc))
+
+        with col_del:
+            st.markdown("**Remove**")
+            if st.button("\U0001f5d1\ufe0f Delete", key=f"del_m_{bid}"):
+                _confirm_delete(f"Remove **{booking['team_name']}**'s mentor booking?",
+                                admin_delete_mentor_booking, bid)
+
+
 def _mentor_tab():
     all_bookings = get_all_mentor_bookings()
 
-    # Build lookup: (slot_label, mentor_name) → booking doc
+    # Build lookup: (slot_id, mentor_name) → booking doc
     booked_map: dict = {}
     for b in all_bookings:
-        booked_map[(b["slot_label"], b["mentor_name"])] = b
+        booked_map[(b.get("slot_id"), b["mentor_name"])] = b
 
-    total_slots  = len(SCHED_ALL_SLOTS) * len(MENTOR_NAMES)
+    total_slots  = len(SCHED_SLOT_IDS) * len(MENTOR_NAMES)
     booked_count = len(all_bookings)
 
     # ── Public link ──────────────────────────────────────────────────────────
@@ -54,6 +141,16 @@ def _mentor_tab():
         st.code(_schedule_link(), language=None)
         st.caption("Teams can book mentor and robot sessions at this link. No login required.")
 
+    st.toggle(
+        "Admission queue (turn on at booking opening time)",
+        value=get_booking_queue_enabled(),
+        key="admin_sched_queue_toggle",
+        on_change=lambda: set_booking_queue_enabled(
+            st.session_state["admin_sched_queue_toggle"]
+        ),
+        help="Shared with Prelim Bookings. When on, booking requests wait in a "
+             "first-come, first-served line and are processed one at a time.",
+    )
     st.write("")
 
     # ── Metrics ──────────────────────────────────────────────────────────────
@@ -68,99 +165,26 @@ def _mentor_tab():
     st.subheader("Mentor Slot Overview")
 
     n = len(MENTOR_NAMES)
-    col_widths = [2.2] + [1.1] * n
-    hcols = st.columns(col_widths)
-    hcols[0].markdown("**Time Slot**")
-    for i, m in enumerate(MENTOR_NAMES, start=1):
-        hcols[i].markdown(f"**{m}**")
-
-    last_day = None
-    for slot in SCHED_ALL_SLOTS:
-        day = "Friday Mar 6" if _is_friday(slot) else "Saturday Mar 7"
-        if day != last_day:
-            last_day = day
-            st.markdown(
-                f"<p style='color:rgba(220,160,0,0.80);font-size:0.78rem;"
-                f"font-weight:700;margin:8px 0 2px;'>&#9654; {day}</p>",
-                unsafe_allow_html=True,
-            )
-        row = st.columns(col_widths)
-        short = slot.split("\u00b7", 1)[-1].strip()
-        row[0].write(short)
-        for i, mentor in enumerate(MENTOR_NAMES, start=1):
-            bk = booked_map.get((slot, mentor))
-            if bk:
-                row[i].markdown(f"\U0001f534 **{bk['team_name']}**")
-            else:
-                row[i].markdown(
-                    "<span style='color:rgba(120,240,140,0.80);'>\u2705 Free</span>",
-                    unsafe_allow_html=True,
-                )
+    _overview_grid([f"<b>{escape(m)}</b>" for m in MENTOR_NAMES], MENTOR_NAMES,
+                   booked_map, [2.2] + [1.1] * n)
 
     st.divider()
 
     # ── Manage bookings ───────────────────────────────────────────────────────
     st.subheader("Manage Mentor Bookings")
+    auto_schedule_panel("mentor", "mentor_auto")
 
     if not all_bookings:
         st.info("No mentor bookings have been made yet.")
         return
 
+    if st.toggle("Bulk edit", key="admin_mentor_bulk_toggle",
+                 help="Edit many bookings in a table and save them all at once."):
+        bulk_edit_bookings("mentor", all_bookings, SCHED_SLOT_IDS, "mentor_name", MENTOR_NAMES, "mentor_bulk")
+        return
+
     for booking in all_bookings:
-        bid = booking["id"]
-        day_tag = "Fri" if _is_friday(booking["slot_label"]) else "Sat"
-        with st.expander(
-            f"**{booking['team_name']}** — {booking['mentor_name']}  ·  "
-            f"{booking['slot_label'].split(chr(183), 1)[-1].strip()} ({day_tag})",
-            expanded=False,
-        ):
-            col_edit, col_del = st.columns([3, 1])
-
-            with col_edit:
-                st.markdown("**Edit booking**")
-                new_mentor = st.selectbox(
-                    "Mentor",
-                    options=MENTOR_NAMES,
-                    index=MENTOR_NAMES.index(booking["mentor_name"])
-                          if booking["mentor_name"] in MENTOR_NAMES else 0,
-                    key=f"edit_m_mentor_{bid}",
-                )
-                new_slot = st.selectbox(
-                    "Time Slot",
-                    options=SCHED_ALL_SLOTS,
-                    index=SCHED_ALL_SLOTS.index(booking["slot_label"])
-                          if booking["slot_label"] in SCHED_ALL_SLOTS else 0,
-                    key=f"edit_m_slot_{bid}",
-                )
-                if st.button("Save Changes", key=f"save_m_{bid}", type="primary"):
-                    try:
-                        admin_update_mentor_booking(bid, new_mentor, new_slot)
-                        st.success(
-                            f"\u2705 Updated: **{booking['team_name']}** \u2192 "
-                            f"**{new_mentor}** at **{new_slot}**"
-                        )
-                        st.rerun()
-                    except ValueError as exc:
-                        st.error(str(exc))
-
-            with col_del:
-                st.markdown("**Remove**")
-                if st.button("\U0001f5d1\ufe0f Delete", key=f"del_m_{bid}"):
-                    st.session_state[f"confirm_del_m_{bid}"] = True
-
-                if st.session_state.get(f"confirm_del_m_{bid}"):
-                    st.warning(
-                        f"Remove **{booking['team_name']}**'s mentor booking?"
-                    )
-                    y, n_btn = st.columns(2)
-                    if y.button("Yes, delete", key=f"yes_del_m_{bid}", type="primary"):
-                        admin_delete_mentor_booking(bid)
-                        st.session_state.pop(f"confirm_del_m_{bid}", None)
-                        st.success("Booking removed.")
-                        st.rerun()
-                    if n_btn.button("Cancel", key=f"no_del_m_{bid}"):
-                        st.session_state.pop(f"confirm_del_m_{bid}", None)
-                        st.rerun()
+        _mentor_editor(booking)
 
     st.divider()
 
@@ -175,8 +199,8 @@ def _mentor_tab():
     for b in all_bookings:
         # Derive room from MENTOR_ROOM_MAP (stored doc may not carry a room field)
         room = b.get("room") or MENTOR_ROOM_MAP.get(b.get("mentor_name", ""), b.get("mentor_name", ""))
-        # Extract just the time portion from slot_label (strip "Fri · " / "Sat · " prefix)
-        time_str = b.get("slot_label", "").split("\u00b7", 1)[-1].strip()
+        # Just the time portion of the slot (no "Fri Mar 6 · " prefix)
+        time_str = slot_short_label(b.get("slot_id"))
         writer.writerow({
             "team_name": b.get("team_name", ""),
             "room":      room,
@@ -193,14 +217,61 @@ def _mentor_tab():
 
 # ── Robot Schedule tab ───────────────────────────────────────────────────────────
 
+@st.fragment
+def _robot_editor(booking: dict):
+    """Same as _mentor_editor, for one robot booking."""
+    bid = booking["id"]
+    day_tag = "Fri" if _is_friday(booking.get("slot_id")) else "Sat"
+    with st.expander(
+        f"**{booking['team_name']}** — Robot {booking['room']}  ·  "
+        f"{slot_short_label(booking.get('slot_id'))} ({day_tag})",
+        expanded=False,
+    ):
+        col_edit, col_del = st.columns([3, 1])
+
+        with col_edit:
+            st.markdown("**Edit booking**")
+            new_room = st.selectbox(
+                "Robot Room",
+                options=SCHED_ROBOT_ROOMS,
+                index=SCHED_ROBOT_ROOMS.index(booking["room"])
+                      if booking["room"] in SCHED_ROBOT_ROOMS else 0,
+                key=f"edit_r_room_{bid}",
+            )
+            new_slot = st.selectbox(
+                "Time Slot",
+                options=SCHED_SLOT_IDS,
+                format_func=slot_label,
+                index=SCHED_SLOT_IDS.index(booking.get("slot_id"))
+                      if booking.get("slot_id") in SCHED_SLOT_IDS else 0,
+                key=f"edit_r_slot_{bid}",
+            )
+            if st.button("Save Changes", key=f"save_r_{bid}", type="primary"):
+                try:
+                    admin_update_robot_booking(bid, new_room, new_slot)
+                    st.toast(
+                        f"\u2705 Updated: **{booking['team_name']}** \u2192 "
+                        f"Robot **{new_room}** at **{slot_label(new_slot)}**"
+                    )
+                    st.rerun()
+                except ValueError as exc:
+                    st.error(str(exc))
+
+        with col_del:
+            st.markdown("**Remove**")
+            if st.button("\U0001f5d1\ufe0f Delete", key=f"del_r_{bid}"):
+                _confirm_delete(f"Remove **{booking['team_name']}**'s robot booking?",
+                                admin_delete_robot_booking, bid)
+
+
 def _robot_tab():
     all_bookings = get_all_robot_bookings()
 
     booked_map: dict = {}
     for b in all_bookings:
-        booked_map[(b["slot_label"], b["room"])] = b
+        booked_map[(b.get("slot_id"), b["room"])] = b
 
-    total_slots  = len(SCHED_ALL_SLOTS) * len(SCHED_ROBOT_ROOMS)
+    total_slots  = len(SCHED_SLOT_IDS) * len(SCHED_ROBOT_ROOMS)
     booked_count = len(all_bookings)
 
     # ── Metrics ──────────────────────────────────────────────────────────────
@@ -214,99 +285,26 @@ def _robot_tab():
     # ── Grid overview ─────────────────────────────────────────────────────────
     st.subheader("Robot Slot Overview")
 
-    col_widths = [2.2] + [1.6] * len(SCHED_ROBOT_ROOMS)
-    hcols = st.columns(col_widths)
-    hcols[0].markdown("**Time Slot**")
-    for i, room in enumerate(SCHED_ROBOT_ROOMS, start=1):
-        hcols[i].markdown(f"**Robot {room}**")
-
-    last_day = None
-    for slot in SCHED_ALL_SLOTS:
-        day = "Friday Mar 6" if _is_friday(slot) else "Saturday Mar 7"
-        if day != last_day:
-            last_day = day
-            st.markdown(
-                f"<p style='color:rgba(220,160,0,0.80);font-size:0.78rem;"
-                f"font-weight:700;margin:8px 0 2px;'>&#9654; {day}</p>",
-                unsafe_allow_html=True,
-            )
-        row = st.columns(col_widths)
-        short = slot.split("\u00b7", 1)[-1].strip()
-        row[0].write(short)
-        for i, room in enumerate(SCHED_ROBOT_ROOMS, start=1):
-            bk = booked_map.get((slot, room))
-            if bk:
-                row[i].markdown(f"\U0001f534 **{bk['team_name']}**")
-            else:
-                row[i].markdown(
-                    "<span style='color:rgba(120,240,140,0.80);'>\u2705 Free</span>",
-                    unsafe_allow_html=True,
-                )
+    _overview_grid([f"<b>Robot {room}</b>" for room in SCHED_ROBOT_ROOMS], SCHED_ROBOT_ROOMS,
+                   booked_map, [2.2] + [1.6] * len(SCHED_ROBOT_ROOMS))
 
     st.divider()
 
     # ── Manage bookings ───────────────────────────────────────────────────────
     st.subheader("Manage Robot Bookings")
+    auto_schedule_panel("robot", "robot_auto")
 
     if not all_bookings:
         st.info("No robot bookings have been made yet.")
         return
 
+    if st.toggle("Bulk edit", key="admin_robot_bulk_toggle",
+                 help="Edit many bookings in a table and save them all at once."):
+        bulk_edit_bookings("robot", all_bookings, SCHED_SLOT_IDS, "room", SCHED_ROBOT_ROOMS, "robot_bulk")
+        return
+
     for booking in all_bookings:
-        bid = booking["id"]
-        day_tag = "Fri" if _is_friday(booking["slot_label"]) else "Sat"
-        with st.expander(
-            f"**{booking['team_name']}** — Robot {booking['room']}  ·  "
-            f"{booking['slot_label'].split(chr(183), 1)[-1].strip()} ({day_tag})",
-            expanded=False,
-        ):
-            col_edit, col_del = st.columns([3, 1])
-
-            with col_edit:
-                st.markdown("**Edit booking**")
-                new_room = st.selectbox(
-                    "Robot Room",
-                    options=SCHED_ROBOT_ROOMS,
-                    index=SCHED_ROBOT_ROOMS.index(booking["room"])
-                          if booking["room"] in SCHED_ROBOT_ROOMS else 0,
-                    key=f"edit_r_room_{bid}",
-                )
-                new_slot = st.selectbox(
-                    "Time Slot",
-                    options=SCHED_ALL_SLOTS,
-                    index=SCHED_ALL_SLOTS.index(booking["slot_label"])
-                          if booking["slot_label"] in SCHED_ALL_SLOTS else 0,
-                    key=f"edit_r_slot_{bid}",
-                )
-                if st.button("Save Changes", key=f"save_r_{bid}", type="primary"):
-                    try:
-                        admin_update_robot_booking(bid, new_room, new_slot)
-                        st.success(
-                            f"\u2705 Updated: **{booking['team_name']}** \u2192 "
-                            f"Robot **{new_room}** at **{new_slot}**"
-                        )
-                        st.rerun()
-                    except ValueError as exc:
-                        st.error(str(exc))
-
-            with col_del:
-                st.markdown("**Remove**")
-                if st.button("\U0001f5d1\ufe0f Delete", key=f"del_r_{bid}"):
-                    st.session_state[f"confirm_del_r_{bid}"] = True
-
-                if st.session_state.get(f"confirm_del_r_{bid}"):
-                    st.warning(
-                        f"Remove **{booking['team_name']}**'s robot booking?"
-                    )
-                    y, n_btn = st.columns(2)
-                    if y.button("Yes, delete", key=f"yes_del_r_{bid}", type="primary"):
-                        admin_delete_robot_booking(bid)
-                        st.session_state.pop(f"confirm_del_r_{bid}", None)
-                        st.success("Booking removed.")
-                        st.rerun()
-                    if n_btn.button("Cancel", key=f"no_del_r_{bid}"):
-                        st.session_state.pop(f"confirm_del_r_{bid}", None)
-                        st.rerun()
+        _robot_editor(booking)
 
     st.divider()
 
@@ -314,7 +312,7 @@ def _robot_tab():
     output = io.StringIO()
     writer = csv.DictWriter(
         output,
-        fieldnames=["team_name", "room", "slot_label", "booked_at"],
+        fieldnames=["team_name", "room", "slot_id", "slot_label", "booked_at"],
         extrasaction="ignore",
     )
     writer.writeheader()
@@ -337,12 +335,7 @@ def show():
 
     st.header("\U0001f4c5 Mentor & Robot Scheduling")
 
-    tab_mentor, tab_robot = st.tabs(
-        ["\U0001f9d1\u200d\U0001f3eb Mentor Schedule", "\U0001f916 Robot Schedule"]
-    )
-
-    with tab_mentor:
-        _mentor_tab()
-
-    with tab_robot:
-        _robot_tab()
+    lazy_tabs({
+        "\U0001f9d1\u200d\U0001f3eb Mentor Schedule": _mentor_tab,
+        "\U0001f916 Robot Schedule": _robot_tab,
+    }, key="admin_sched_tab")
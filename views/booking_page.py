@@ -8,20 +8,24 @@ Teams enter their registration email, confirm their team details, then pick a
 """
 
 import os
-import base64
 import streamlit as st
-from datetime import datetime
-from fpdf import FPDF
 
 from db import (
     PRELIM_ROOMS,
-    PRELIM_SLOTS,
+    PRELIM_SLOT_IDS,
+    slot_label,
     get_team_by_member_email,
     get_booking_by_team_name,
     get_booked_slot_map,
     create_booking,
     switch_booking,
+    get_booking_queue_enabled,
+    enqueue_booking_request,
 )
+from components import queue_status, queue_result, slot_grid, waitlist_panel
+from receipts import BOOKING_TEMPLATE, get_receipt, peek_receipt, render_booking_receipt
+from static_assets import img_tag
+from theme import BASE_CSS, apply_stylesheet, grid_header, grid_time
 
 # ── Asset paths ─────────────────────────────────────────────────────────────────
 _LOGO_AH_SVG    = os.path.join("assets", "autohack_logo.svg")
@@ -63,15 +67,6 @@ _CSS = f"""
     text-transform: uppercase; letter-spacing: 1.4px;
     border-left: 3px solid #CC0000; padding: 2px 0 2px 10px; margin: 6px 0 12px;
 }}
-.ah-subtitle {{
-    color: rgba(200,210,230,0.70); font-size: 0.95rem;
-    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
-}}
-.ah-stripe {{
-    height: 3px;
-    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
-    border-radius: 2px; width: 55%; margin: 16px auto 0;
-}}
 .ah-info-card {{
     background: rgba(26,75,153,0.15);
     border: 1px solid rgba(74,128,212,0.35);
@@ -178,38 +173,31 @@ hr {{ border-color: rgba(255,255,255,0.10) !important; }}
         padding: 3px 3px !important;
     }}
 }}
+div[data-testid="stCheckbox"] label p {{
+    color: #F2F3F4 !important;
+}}
 </style>
 """
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────────
 
-def _b64_tag(path: str, style: str, alt: str = "") -> str:
-    if not os.path.exists(path):
-        return ""
-    ext  = os.path.splitext(path)[1].lstrip(".").lower()
-    mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-    with open(path, "rb") as fh:
-        b64 = base64.b64encode(fh.read()).decode()
-    return f'<img src="data:{mime};base64,{b64}" style="{style}" alt="{alt}">'
-
-
 def _render_header():
-    st.markdown(_CSS, unsafe_allow_html=True)
+    apply_stylesheet("booking", BASE_CSS, _CSS)
 
     ah_tag = (
-        _b64_tag(_LOGO_AH_WHITE,
-                 "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                 "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_SVG,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_PNG,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
+        img_tag(_LOGO_AH_WHITE,
+                "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                "AutoHack 2026")
+        or img_tag(_LOGO_AH_SVG,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
+        or img_tag(_LOGO_AH_PNG,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
     )
 
-    gc_tag = _b64_tag(
+    gc_tag = img_tag(
         _LOGO_GC_PNG,
         "height:30px;object-fit:contain;opacity:0.82;",
         "Georgian College"
@@ -247,57 +235,38 @@ def _render_header():
     st.markdown(banner + subtitle, unsafe_allow_html=True)
 
 
-def _slot_key(slot_label: str, room: str) -> str:
-    return f"{slot_label}||{room}"
-
-
 # ── Booking grid renderer ────────────────────────────────────────────────────────
 
 def _render_grid(booked_map: dict, my_team: str):
     """Show the full 9×3 grid as a read-only summary."""
-    cols = st.columns([2.0] + [1.0] * len(PRELIM_ROOMS))
-    cols[0].markdown(
-        '<p style="color:#6B9FE4;font-weight:700;font-size:0.82rem;'
-        'text-transform:uppercase;padding-bottom:4px;'
-        'border-bottom:1px solid rgba(74,128,212,0.35);">Time Slot</p>',
-        unsafe_allow_html=True,
-    )
-    for i, room in enumerate(PRELIM_ROOMS, start=1):
-        cols[i].markdown(
-            f'<p style="color:#6B9FE4;font-weight:700;font-size:0.82rem;'
-            f'text-transform:uppercase;text-align:center;padding-bottom:4px;'
-            f'border-bottom:1px solid rgba(74,128,212,0.35);">Room {room}</p>',
-            unsafe_allow_html=True,
-        )
+    headers = [grid_header("Time Slot", center=False)] + [
+        grid_header(f"Room {room}") for room in PRELIM_ROOMS
+    ]
 
-    for slot in PRELIM_SLOTS:
-        row = st.columns([2.0] + [1.0] * len(PRELIM_ROOMS))
-        row[0].markdown(
-            f'<p style="color:rgba(220,230,250,0.85);font-size:0.88rem;'
-            f'padding-top:6px;">{slot}</p>',
-            unsafe_allow_html=True,
-        )
-        for i, room in enumerate(PRELIM_ROOMS, start=1):
-            key = _slot_key(slot, room)
-            occupant = booked_map.get(key)
+    rows = []
+    for slot_id in PRELIM_SLOT_IDS:
+        row = [grid_time(slot_label(slot_id))]
+        for room in PRELIM_ROOMS:
+            occupant = booked_map.get((slot_id, room))
             if occupant and occupant == my_team:
-                row[i].markdown('<div class="slot-mine">⭐ You</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-mine">⭐ You</div>')
             elif occupant:
-                row[i].markdown('<div class="slot-taken">Taken</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-taken">Taken</div>')
             else:
-                row[i].markdown('<div class="slot-free">Free</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-free">Free</div>')
+        rows.append(row)
+    slot_grid(headers, rows, [2.0] + [1.0] * len(PRELIM_ROOMS))
 
 
 # ── Slot picker ──────────────────────────────────────────────────────────────────
 
 def _render_slot_picker(booked_map: dict, label: str = "Select a time slot") -> tuple:
-    """Let user pick an available (slot, room) combination. Returns (slot, room) or (None, None)."""
-    options = []
-    for slot in PRELIM_SLOTS:
+    """Let user pick an available (slot, room) combination. Returns (slot_id, room) or (None, None)."""
+    options = {}  # display label → (slot_id, room)
+    for slot_id in PRELIM_SLOT_IDS:
         for room in PRELIM_ROOMS:
-            key = _slot_key(slot, room)
-            if key not in booked_map:
-                options.append(f"{slot}  —  Room {room}")
+            if (slot_id, room) not in booked_map:
+                options[f"{slot_label(slot_id)}  —  Room {room}"] = (slot_id, room)
 
     if not options:
         st.warning("⚠️ No slots are currently available. Please contact the organizers.")
@@ -306,115 +275,21 @@ def _render_slot_picker(booked_map: dict, label: str = "Select a time slot") ->
     st.markdown(f'<p class="ah-section">{label}</p>', unsafe_allow_html=True)
     choice = st.selectbox(
         "slot_picker",
-        options=options,
+        options=list(options),
         label_visibility="collapsed",
         key="booking_slot_select",
     )
-    if not choice:
-        return None, None
+    return options.get(choice, (None, None))
 
-    parts = choice.split("  —  Room ")
-    if len(parts) != 2:
-        return None, None
-    return parts[0].strip(), parts[1].strip()
-
-
-# ── PDF receipt ──────────────────────────────────────────────────────────────────
-
-def _generate_booking_pdf(
-    team_name: str,
-    slot_label: str,
-    room: str,
-    members: list,
-    booked_at=None,
-) -> bytes:
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_margins(14, 14, 14)
-
-    # Title
-    pdf.set_font("Helvetica", "B", 22)
-    pdf.set_text_color(204, 0, 0)
-    pdf.cell(0, 12, "AutoHack 2026", ln=True, align="C")
-
-    pdf.set_font("Helvetica", "", 11)
-    pdf.set_text_color(100, 100, 120)
-    pdf.cell(0, 7, "Prelims Slot Booking Receipt", ln=True, align="C")
-
-    # Red / blue divider stripe
-    y = pdf.get_y() + 3
-    pdf.set_draw_color(204, 0, 0)
-    pdf.set_line_width(0.8)
-    pdf.line(14, y, 105, y)
-    pdf.set_draw_color(74, 128, 212)
-    pdf.line(105, y, 196, y)
-    pdf.ln(8)
-
-    # Booking details
-    def _latin1(text: str) -> str:
-        """Replace Unicode chars that Helvetica (Latin-1) cannot encode."""
-        return (
-            str(text)
-            .replace("\u2013", "-")   # en-dash  →  hyphen
-            .replace("\u2014", "--")  # em-dash  →  double hyphen
-            .replace("\u2019", "'")   # right single quote
-            .replace("\u2018", "'")   # left single quote
-            .replace("\u00b7", ".")   # middle dot
-        )
 
-    def _row(label, value):
-        pdf.set_font("Helvetica", "B", 11)
-        pdf.set_text_color(30, 30, 50)
-        pdf.cell(40, 8, label, ln=False)
-        pdf.set_font("Helvetica", "", 11)
-        pdf.cell(0, 8, _latin1(value), ln=True)
-
-    _row("Team Name:", team_name)
-    _row("Time Slot:", slot_label)
-    _row("Room:", room)
-    if booked_at and hasattr(booked_at, "strftime"):
-        _row("Booked at:", booked_at.strftime("%Y-%m-%d %H:%M UTC"))
-    else:
-        _row("Generated:", datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"))
-
-    pdf.ln(4)
-
-    # Members table
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.set_text_color(204, 0, 0)
-    pdf.cell(0, 8, "Team Members", ln=True)
-    pdf.ln(1)
-
-    col_w = [10, 44, 54, 40, 34]
-    headers = ["#", "Full Name", "Email", "Institution", "Program"]
-
-    pdf.set_font("Helvetica", "B", 9)
-    pdf.set_text_color(255, 255, 255)
-    pdf.set_fill_color(26, 75, 153)
-    for w, h in zip(col_w, headers):
-        pdf.cell(w, 8, h, border=1, fill=True, align="C")
-    pdf.ln()
-
-    pdf.set_font("Helvetica", "", 9)
-    pdf.set_text_color(20, 20, 40)
-    for idx, m in enumerate(members, 1):
-        fill = idx % 2 == 0
-        if fill:
-            pdf.set_fill_color(240, 243, 252)
-        else:
-            pdf.set_fill_color(255, 255, 255)
-        row = [str(idx), m.get("name", ""), m.get("email", ""),
-               m.get("institution", ""), m.get("program", "")]
-        for w, val in zip(col_w, row):
-            pdf.cell(w, 7, val[:28], border=1, fill=True)
-        pdf.ln()
-
-    pdf.ln(6)
-    pdf.set_font("Helvetica", "I", 8)
-    pdf.set_text_color(150, 150, 170)
-    pdf.cell(0, 6, "Generated by AutoHack 2026 Booking System", align="C")
-
-    return bytes(pdf.output())
+def _taken_options(booked_map: dict, my_team: str) -> dict:
+    """Display label → (slot_id, room) for every slot booked by another team."""
+    return {
+        f"{slot_label(slot_id)}  —  Room {room}": (slot_id, room)
+        for slot_id in PRELIM_SLOT_IDS
+        for room in PRELIM_ROOMS
+        if booked_map.get((slot_id, room)) not in (None, my_team)
+    }
 
 
 # ── Main entry point ─────────────────────────────────────────────────────────────
@@ -496,17 +371,6 @@ def show():
         unsafe_allow_html=True,
     )
 
-    st.markdown(
-        """
-        <style>
-        div[data-testid="stCheckbox"] label p {
-            color: #F2F3F4 !important;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
     confirmed = st.checkbox(
         "Yes, this is my team — the information above is correct",
         key="booking_confirm_check",
@@ -516,38 +380,55 @@ def show():
 
     selected_team = reg["team_name"]
 
+    # ── Admission queue: wait here while a queued request is processed ───────────
+    queue_on = get_booking_queue_enabled()
+    queue_result("booking_queue_req", "✅ Your booking request has been processed.")
+    if st.session_state.get("booking_queue_req"):
+        st.divider()
+        queue_status("booking_queue_req")
+        return
+
     # ── Check for existing booking ────────────────────────────────────────────────
     existing = get_booking_by_team_name(selected_team)
     booked_map = get_booked_slot_map()
 
     if existing:
+        existing_label = slot_label(existing.get("slot_id"))
         st.success(
-            f"✅ Your team is already booked for **{existing['slot_label']}** in **Room {existing['room']}**."
+            f"✅ Your team is already booked for **{existing_label}** in **Room {existing['room']}**."
         )
         st.markdown(
             f'<div class="ah-booking-card">'
             f'  <h3>📍 Your Slot</h3>'
-            f'  <p>{existing["slot_label"]}  &nbsp;·&nbsp;  Room {existing["room"]}</p>'
+            f'  <p>{existing_label}  &nbsp;·&nbsp;  Room {existing["room"]}</p>'
             f'</div>',
             unsafe_allow_html=True,
         )
 
-        # PDF receipt download
-        pdf_bytes = _generate_booking_pdf(
-            selected_team,
-            existing["slot_label"],
-            existing["room"],
-            reg.get("members", []),
-            existing.get("booked_at"),
-        )
-        safe_name = selected_team.replace(" ", "_").replace("/", "-")
-        st.download_button(
-            label="📄 Download Booking Receipt (PDF)",
-            data=pdf_bytes,
-            file_name=f"AutoHack2026_Prelims_Receipt_{safe_name}.pdf",
-            mime="application/pdf",
-            use_container_width=True,
-        )
+        # PDF receipt download — rendered only when asked for, then cached
+        receipt_fields = {
+            "team_name": selected_team,
+            "slot_label": existing_label,
+            "room": existing["room"],
+            "members": reg.get("members", []),
+            "booked_at": existing.get("booked_at"),
+        }
+        pdf_bytes = peek_receipt(BOOKING_TEMPLATE, receipt_fields)
+        if pdf_bytes is None and st.button("📄 Prepare Booking Receipt (PDF)",
+                                           use_container_width=True):
+            pdf_bytes = get_receipt(
+                BOOKING_TEMPLATE, receipt_fields,
+                lambda: render_booking_receipt(**receipt_fields),
+            )
+        if pdf_bytes is not None:
+            safe_name = selected_team.replace(" ", "_").replace("/", "-")
+            st.download_button(
+                label="📄 Download Booking Receipt (PDF)",
+                data=pdf_bytes,
+                file_name=f"AutoHack2026_Prelims_Receipt_{safe_name}.pdf",
+                mime="application/pdf",
+                use_container_width=True,
+            )
 
         # ── Step 3: Switch picker ─────────────────────────────────────────────
         st.divider()
@@ -560,15 +441,22 @@ def show():
         freed_map = {k: v for k, v in booked_map.items() if v != selected_team}
         new_slot, new_room = _render_slot_picker(freed_map, "Choose a new time slot")
 
-        if new_slot and new_room:
+        if new_slot is not None and new_room:
             if st.button("Switch Slot", type="primary", use_container_width=True):
+                if queue_on:
+                    st.session_state["booking_queue_req"] = enqueue_booking_request(
+                        "switch_booking", selected_team, slot_id=new_slot, room=new_room,
+                    )
+                    st.rerun()
                 try:
                     switch_booking(selected_team, new_slot, new_room)
-                    st.success(f"✅ Slot switched to **{new_slot}** — Room **{new_room}**!")
+                    st.success(f"✅ Slot switched to **{slot_label(new_slot)}** — Room **{new_room}**!")
                     st.rerun()
                 except ValueError as exc:
                     st.error(str(exc))
 
+        waitlist_panel("prelim", selected_team, _taken_options(booked_map, selected_team), "booking_wait")
+
         # ── Availability overview ─────────────────────────────────────────────
         st.divider()
         st.markdown('<p class="ah-section">Current Availability</p>', unsafe_allow_html=True)
@@ -580,16 +468,23 @@ def show():
         st.divider()
         new_slot, new_room = _render_slot_picker(booked_map, "Step 3 — Book Your Slot")
 
-        if new_slot and new_room:
+        if new_slot is not None and new_room:
             if st.button("Confirm Booking", type="primary", use_container_width=True):
+                if queue_on:
+                    st.session_state["booking_queue_req"] = enqueue_booking_request(
+                        "create_booking", selected_team, slot_id=new_slot, room=new_room,
+                    )
+                    st.rerun()
                 try:
                     create_booking(selected_team, new_slot, new_room)
-                    st.success(f"🎉 Booking confirmed! **{new_slot}** — Room **{new_room}**")
+                    st.success(f"🎉 Booking confirmed! **{slot_label(new_slot)}** — Room **{new_room}**")
                     st.balloons()
                     st.rerun()
                 except ValueError as exc:
                     st.error(str(exc))
 
+        waitlist_panel("prelim", selected_team, _taken_options(booked_map, selected_team), "booking_wait")
+
         # ── Availability overview ─────────────────────────────────────────────
         st.divider()
         st.markdown('<p class="ah-section">Availability Overview</p>', unsafe_allow_html=True)
@@ -6,8 +6,9 @@ Accessible at the root URL (no login required).
 """
 
 import os
-import base64
 import streamlit as st
+from static_assets import img_tag
+from theme import BASE_CSS, apply_stylesheet
 
 # ── Asset paths ─────────────────────────────────────────────────────────────────
 _LOGO_AH_SVG   = os.path.join("assets", "autohack_logo.svg")
@@ -49,15 +50,6 @@ _CSS = f"""
 }}
 
 /* Subtitle / stripe */
-.ah-subtitle {{
-    color: rgba(200,210,230,0.70); font-size: 0.95rem;
-    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
-}}
-.ah-stripe {{
-    height: 3px;
-    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
-    border-radius: 2px; width: 55%; margin: 16px auto 0;
-}}
 
 /* ── Portal cards ── */
 .portal-grid {{
@@ -213,32 +205,22 @@ hr {{ border-color: rgba(255,255,255,0.10) !important; }}
 """
 
 
-def _b64_tag(path: str, style: str, alt: str = "") -> str:
-    if not os.path.exists(path):
-        return ""
-    ext  = os.path.splitext(path)[1].lstrip(".").lower()
-    mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-    with open(path, "rb") as fh:
-        b64 = base64.b64encode(fh.read()).decode()
-    return f'<img src="data:{mime};base64,{b64}" style="{style}" alt="{alt}">'
-
-
 def _render_header():
-    st.markdown(_CSS, unsafe_allow_html=True)
+    apply_stylesheet("home", BASE_CSS, _CSS)
 
     ah_tag = (
-        _b64_tag(_LOGO_AH_WHITE,
-                 "width:100%;max-width:600px;height:auto;object-fit:contain;",
-                 "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_SVG,
-                    "width:100%;max-width:600px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_PNG,
-                    "width:100%;max-width:600px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
+        img_tag(_LOGO_AH_WHITE,
+                "width:100%;max-width:600px;height:auto;object-fit:contain;",
+                "AutoHack 2026")
+        or img_tag(_LOGO_AH_SVG,
+                   "width:100%;max-width:600px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
+        or img_tag(_LOGO_AH_PNG,
+                   "width:100%;max-width:600px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
     )
 
-    gc_tag = _b64_tag(
+    gc_tag = img_tag(
         _LOGO_GC_PNG,
         "height:30px;object-fit:contain;opacity:0.82;",
         "Georgian College"
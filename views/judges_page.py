@@ -20,14 +20,10 @@ _ROUND_LABELS   = {"prelims": "🏁 Prelims", "finals": "🏆 Finals"}
 _ROOM_OPTIONS   = ["-- No room --"] + PRELIM_ROOMS
 
 
-def show():
-    user = st.session_state.get("user")
-    if not user or user.get("role") != "admin":
-        st.error("Admin access required.")
-        st.stop()
-
-    st.header("Manage Judges")
-
+@st.fragment
+def _add_judge_form():
+    """Add-judge form. Validation errors rerun only this fragment; a new judge
+    reruns the page so the list below picks it up."""
     # Flash success from previous add submission
     add_success = st.session_state.pop("judge_add_success", None)
     if add_success:
@@ -87,6 +83,103 @@ def show():
                 except DuplicateKeyError:
                     st.error("Username already exists.")
 
+
+@st.fragment
+def _judge_editor(judge: dict):
+    """Edit form and delete button for one judge, rerun on their own."""
+    j_round = judge.get("judge_round", "prelims")
+    j_room  = judge.get("prelim_room")
+
+    round_label = _ROUND_LABELS.get(j_round, j_round.capitalize())
+    room_label  = f" · Room {j_room}" if j_room else ""
+    expander_title = f"{judge['name']} — {round_label}{room_label}"
+
+    with st.expander(expander_title):
+        # ── Edit form ─────────────────────────────────────────────────
+        with st.form(f"edit_judge_{judge['id']}"):
+            name_val     = st.text_input("Name",     value=judge["name"])
+            username_val = st.text_input("Username", value=judge["username"] or "")
+            password_val = st.text_input(
+                "New password (leave blank to keep)", type="password"
+            )
+
+            # Round selector
+            curr_round = j_round if j_round in _ROUND_OPTIONS else "prelims"
+            round_val = st.selectbox(
+                "Round",
+                _ROUND_OPTIONS,
+                index=_ROUND_OPTIONS.index(curr_round),
+                format_func=lambda x: _ROUND_LABELS[x],
+                key=f"round_{judge['id']}",
+                help="Change to 'Finals' to give this judge access to the finals scoring page instead.",
+            )
+
+            # Room selector — only shown for prelims judges
+            # (Finals scoring takes place in one hall; no room assignment needed)
+            if j_round == "prelims":
+                curr_room = j_room if j_room in PRELIM_ROOMS else "-- No room --"
+                room_val = st.selectbox(
+                    "Assigned Prelim Room",
+                    _ROOM_OPTIONS,
+                    index=_ROOM_OPTIONS.index(curr_room),
+                    key=f"room_{judge['id']}",
+                    help="Judge will only see teams that booked this room in prelims slot booking.",
+                )
+            else:
+                room_val = "-- No room --"
+                st.info(
+                    "ℹ️ Finals judges are not assigned to a specific room — "
+                    "finals scoring takes place in one hall."
+                )
+
+            updated = st.form_submit_button("Save changes")
+            if updated:
+                if not name_val.strip() or not username_val.strip():
+                    st.error("Name and username are required.")
+                else:
+                    try:
+                        new_room = room_val if room_val != "-- No room --" else None
+                        update_judge_account(
+                            judge["id"],
+                            name_val.strip(),
+                            username_val.strip(),
+                            password=password_val or None,
+                            judge_round=round_val,
+                            update_room=True,
+                            prelim_room=new_room,
+                        )
+                        st.toast("Judge updated.")
+                        st.rerun()
+                    except DuplicateKeyError:
+                        st.error("Username already exists.")
+
+        # ── Delete ────────────────────────────────────────────────────
+        if st.button("Delete judge", key=f"delete_judge_{judge['id']}"):
+            _confirm_delete(judge)
+
+
+@st.dialog("Delete judge")
+def _confirm_delete(judge: dict):
+    st.write(f"Delete the account of **{judge['name']}** and all their scores?")
+    yes_col, no_col = st.columns(2)
+    if yes_col.button("Yes, delete", type="primary", use_container_width=True):
+        delete_judge_account(judge["id"])
+        st.toast("Judge deleted.")
+        st.rerun()
+    if no_col.button("Cancel", use_container_width=True):
+        st.rerun()
+
+
+def show():
+    user = st.session_state.get("user")
+    if not user or user.get("role") != "admin":
+        st.error("Admin access required.")
+        st.stop()
+
+    st.header("Manage Judges")
+
+    _add_judge_form()
+
     # ── Current judges list ───────────────────────────────────────────────────
     st.subheader("Current judges")
 
@@ -96,77 +189,4 @@ def show():
         return
 
     for judge in judges:
-        j_round = judge.get("judge_round", "prelims")
-        j_room  = judge.get("prelim_room")
-
-        round_label = _ROUND_LABELS.get(j_round, j_round.capitalize())
-        room_label  = f" · Room {j_room}" if j_room else ""
-        expander_title = f"{judge['name']} — {round_label}{room_label}"
-
-        with st.expander(expander_title):
-            # ── Edit form ─────────────────────────────────────────────────
-            with st.form(f"edit_judge_{judge['id']}"):
-                name_val     = st.text_input("Name",     value=judge["name"])
-                username_val = st.text_input("Username", value=judge["username"] or "")
-                password_val = st.text_input(
-                    "New password (leave blank to keep)", type="password"
-                )
-
-                # Round selector
-                curr_round = j_round if j_round in _ROUND_OPTIONS else "prelims"
-                round_val = st.selectbox(
-                    "Round",
-                    _ROUND_OPTIONS,
-                    index=_ROUND_OPTIONS.index(curr_round),
-                    format_func=lambda x: _ROUND_LABELS[x],
-                    key=f"round_{judge['id']}",
-                    help="Change to 'Finals' to give this judge access to the finals scoring page instead.",
-                )
-
-                # Room selector — only shown for prelims judges
-                # (Finals scoring takes place in one hall; no room assignment needed)
-                if j_round == "prelims":
-                    curr_room = j_room if j_room in PRELIM_ROOMS else "-- No room --"
-                    room_val = st.selectbox(
-                        "Assigned Prelim Room",
-                        _ROOM_OPTIONS,
-                        index=_ROOM_OPTIONS.index(curr_room),
-                        key=f"room_{judge['id']}",
-                        help="Judge will only see teams that booked this room in prelims slot booking.",
-                    )
-                else:
-                    room_val = "-- No room --"
-                    st.info(
-                        "ℹ️ Finals judges are not assigned to a specific room — "
-                        "finals scoring takes place in one hall."
-                    )
-
-                updated = st.form_submit_button("Save changes")
-                if updated:
-                    if not name_val.strip() or not username_val.strip():
-                        st.error("Name and username are required.")
-                    else:
-                        try:
-                            new_room = room_val if room_val != "-- No room --" else None
-                            update_judge_account(
-                                judge["id"],
-                                name_val.strip(),
-                                username_val.strip(),
-                                password=password_val or None,
-                                judge_round=round_val,
-                                update_room=True,
-                                prelim_room=new_room,
-                            )
-                            st.success("Judge updated.")
-                            st.rerun()
-                        except DuplicateKeyError:
-                            st.error("Username already exists.")
-
-            # ── Delete form ───────────────────────────────────────────────
-            with st.form(f"delete_judge_{judge['id']}"):
-                st.write("Delete this judge account and all their scores?")
-                delete_pressed = st.form_submit_button("Delete judge")
-                if delete_pressed:
-                    delete_judge_account(judge["id"])
-                    st.success("Judge deleted.")
-                    st.rerun()
+        _judge_editor(judge)
@@ -14,19 +14,25 @@ and time slots as rows.
 """
 
 import os
-import base64
 import hashlib
+from html import escape
+
 import streamlit as st
 
+from components import slot_grid
 from db import (
     MENTOR_ROOM_MAP,
-    SCHED_FRIDAY_SLOTS,
-    SCHED_SATURDAY_SLOTS,
+    SCHED_FRIDAY_SLOT_IDS,
+    SCHED_SATURDAY_SLOT_IDS,
     get_all_mentor_bookings,
     create_session,
     get_session,
     delete_session,
+    slot_day,
+    slot_short_label,
 )
+from static_assets import img_tag
+from theme import BASE_CSS, apply_stylesheet
 
 # ── Mentor portal credentials ──────────────────────────────────────────────────
 _MENTOR_USERNAME = "AutoHackMentor"
@@ -71,15 +77,6 @@ _CSS = f"""
     margin-bottom: 2rem !important;
     box-shadow: 0 8px 60px rgba(0,0,0,0.60) !important;
 }}
-.ah-subtitle {{
-    color: rgba(200,210,230,0.70); font-size: 0.95rem;
-    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
-}}
-.ah-stripe {{
-    height: 3px;
-    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
-    border-radius: 2px; width: 55%; margin: 16px auto 0;
-}}
 .ah-section {{
     color: #FF4040; font-weight: 700; font-size: 0.80rem;
     text-transform: uppercase; letter-spacing: 1.4px;
@@ -294,31 +291,21 @@ hr {{ border-color: rgba(255,255,255,0.10) !important; }}
 
 # ── Asset helpers ──────────────────────────────────────────────────────────────
 
-def _b64_tag(path: str, style: str, alt: str = "") -> str:
-    if not os.path.exists(path):
-        return ""
-    ext  = os.path.splitext(path)[1].lstrip(".").lower()
-    mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-    with open(path, "rb") as fh:
-        b64 = base64.b64encode(fh.read()).decode()
-    return f'<img src="data:{mime};base64,{b64}" style="{style}" alt="{alt}">'
-
-
 def _render_header():
-    st.markdown(_CSS, unsafe_allow_html=True)
+    apply_stylesheet("mentor-schedule", BASE_CSS, _CSS)
 
     ah_tag = (
-        _b64_tag(_LOGO_AH_WHITE,
-                 "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                 "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_SVG,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_PNG,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
+        img_tag(_LOGO_AH_WHITE,
+                "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                "AutoHack 2026")
+        or img_tag(_LOGO_AH_SVG,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
+        or img_tag(_LOGO_AH_PNG,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
     )
-    gc_tag = _b64_tag(
+    gc_tag = img_tag(
         _LOGO_GC_PNG,
         "height:30px;object-fit:contain;opacity:0.82;",
         "Georgian College"
@@ -407,9 +394,9 @@ def _render_login():
 
 # ── Data helpers ───────────────────────────────────────────────────────────────
 
-def _short(slot_label: str) -> str:
-    """Strip day prefix: 'Fri Mar 6 · 6:20 – 6:40 PM' → '6:20 – 6:40 PM'."""
-    return slot_label.split("\u00b7", 1)[-1].strip()
+def _short(slot_id: int) -> str:
+    """Time-of-day only: 'Fri Mar 6 · 6:20 – 6:40 PM' → '6:20 – 6:40 PM'."""
+    return slot_short_label(slot_id)
 
 
 def _rooms_ordered() -> list:
@@ -422,10 +409,10 @@ def _mentors_per_room() -> dict:
 
 
 def _build_schedule_map(bookings: list) -> dict:
-    """Build {(slot_label, room): [team_name, ...]} from all mentor bookings."""
+    """Build {(slot_id, room): [team_name, ...]} from all mentor bookings."""
     result: dict = {}
     for b in bookings:
-        slot = b["slot_label"]
+        slot = b.get("slot_id")
         room = MENTOR_ROOM_MAP.get(b.get("mentor_name", ""), None)
         if room is None:
             continue
@@ -436,38 +423,32 @@ def _build_schedule_map(bookings: list) -> dict:
 # ── Calendar grid renderer ─────────────────────────────────────────────────────
 
 def _render_day_grid(slots: list, schedule_map: dict, rooms: list, mpr: dict):
-    col_widths = [1.8] + [1.0] * len(rooms)
-
     # Header row
-    hcols = st.columns(col_widths)
-    hcols[0].markdown('<p class="cal-grid-header-left">Time</p>', unsafe_allow_html=True)
-    for i, room in enumerate(rooms, start=1):
+    headers = ['<p class="cal-grid-header-left">Time</p>']
+    for room in rooms:
         cap = len(mpr[room])
-        hcols[i].markdown(
+        headers.append(
             f'<p class="cal-grid-header">Room {room}'
-            f'<br><span style="font-weight:400;opacity:0.55;font-size:0.72rem;">'
-            f'{cap} mentor{"s" if cap > 1 else ""}</span></p>',
-            unsafe_allow_html=True,
+            f'<br><span class="ah-grid-sub">'
+            f'{cap} mentor{"s" if cap > 1 else ""}</span></p>'
         )
 
     # Slot rows
+    rows = []
     for slot in slots:
-        row = st.columns(col_widths)
-        row[0].markdown(
-            f'<p class="cal-time">{_short(slot)}</p>',
-            unsafe_allow_html=True,
-        )
-        for i, room in enumerate(rooms, start=1):
+        row = [f'<p class="cal-time">{_short(slot)}</p>']
+        for room in rooms:
             teams   = schedule_map.get((slot, room), [])
             cap     = len(mpr[room])
             is_full = len(teams) >= cap
 
             if not teams:
-                row[i].markdown('<div class="cal-open">Open</div>', unsafe_allow_html=True)
+                row.append('<div class="cal-open">Open</div>')
             else:
                 cell_class = "cal-team-full" if is_full else "cal-team"
-                inner = "".join(f'<div class="{cell_class}">{t}</div>' for t in teams)
-                row[i].markdown(inner, unsafe_allow_html=True)
+                row.append("".join(f'<div class="{cell_class}">{escape(t)}</div>' for t in teams))
+        rows.append(row)
+    slot_grid(headers, rows, [1.8] + [1.0] * len(rooms))
 
 
 # ── Main entry point ───────────────────────────────────────────────────────────
@@ -531,10 +512,10 @@ def show():
     mpr          = _mentors_per_room()
 
     total_possible = sum(len(mpr[r]) for r in rooms) * (
-        len(SCHED_FRIDAY_SLOTS) + len(SCHED_SATURDAY_SLOTS)
+        len(SCHED_FRIDAY_SLOT_IDS) + len(SCHED_SATURDAY_SLOT_IDS)
     )
-    fri_booked   = sum(1 for b in bookings if b["slot_label"].startswith("Fri"))
-    sat_booked   = sum(1 for b in bookings if b["slot_label"].startswith("Sat"))
+    fri_booked   = sum(1 for b in bookings if slot_day(b.get("slot_id")) == "Fri")
+    sat_booked   = sum(1 for b in bookings if slot_day(b.get("slot_id")) == "Sat")
     total_booked = len(bookings)
 
     # ── Metrics ────────────────────────────────────────────────────────────────
@@ -568,7 +549,7 @@ def show():
         '</div>',
         unsafe_allow_html=True,
     )
-    _render_day_grid(SCHED_FRIDAY_SLOTS, schedule_map, rooms, mpr)
+    _render_day_grid(SCHED_FRIDAY_SLOT_IDS, schedule_map, rooms, mpr)
 
     st.divider()
 
@@ -580,7 +561,7 @@ def show():
         '</div>',
         unsafe_allow_html=True,
     )
-    _render_day_grid(SCHED_SATURDAY_SLOTS, schedule_map, rooms, mpr)
+    _render_day_grid(SCHED_SATURDAY_SLOT_IDS, schedule_map, rooms, mpr)
 
     st.divider()
     st.caption(
@@ -0,0 +1,138 @@
+import pandas as pd
+import streamlit as st
+
+from db import bulk_register_teams, find_existing_registrations
+
+_MAX_MEMBERS = 6  # same cap as the public registration form
+_COLUMNS = ["Team Name", "Full Name", "Email", "Phone", "Institution", "Program"]
+_REQUIRED = ["Team Name", "Full Name", "Email", "Institution", "Program"]
+_EMAIL_RE = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+
+def _read_upload(upload) -> pd.DataFrame:
+    """Load the uploaded CSV/XLSX as strings, one row per team member."""
+    if upload.name.lower().endswith(".xlsx"):
+        df = pd.read_excel(upload, dtype=str, engine="openpyxl")
+    else:
+        df = pd.read_csv(upload, dtype=str, keep_default_na=False)
+    df.columns = [str(c).strip() for c in df.columns]
+    missing = [c for c in _COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError("Missing column(s): " + ", ".join(missing))
+    df = df[_COLUMNS].fillna("")
+    for col in _COLUMNS:
+        df[col] = df[col].astype(str).str.strip()
+    df = df[(df != "").any(axis=1)].reset_index(drop=True)
+    df["Email"] = df["Email"].str.lower()
+    df.index = df.index + 2  # spreadsheet row numbers (row 1 is the header)
+    return df
+
+
+def _validate(df: pd.DataFrame) -> pd.Series:
+    """Return the error text for every row ("" when the row is fine).
+
+    Every check runs over whole columns; the database is asked once, for all
+    team names and emails in the file, with a single $in query."""
+    problems = []
+
+    def flag(mask, message):
+        problems.append(mask.map({True: message, False: ""}))
+
+    for col in _REQUIRED:
+        flag(df[col] == "", f"{col} is required")
+    flag((df["Email"] != "") & ~df["Email"].str.match(_EMAIL_RE), "invalid email")
+    digits = df["Phone"].str.replace(r"\D", "", regex=True).str.len()
+    flag((df["Phone"] != "") & ~digits.between(7, 15), "phone must contain 7–15 digits")
+    flag((df["Email"] != "") & df["Email"].duplicated(keep=False), "email appears more than once in the file")
+
+    team_key = df["Team Name"].str.casefold().str.split().str.join(" ")
+    size = team_key.map(team_key.value_counts())
+    flag(size > _MAX_MEMBERS, f"team has more than {_MAX_MEMBERS} members")
+
+    taken = find_existing_registrations(
+        df["Team Name"][df["Team Name"] != ""].unique().tolist(),
+        df["Email"][df["Email"] != ""].unique().tolist(),
+    )
+    flag(df["Team Name"].isin(taken["team_names"]), "team name is already registered")
+    owner = df["Email"].map(taken["emails"])
+    problems.append(owner.map(lambda t: f"email is already registered with team {t}", na_action="ignore").fillna(""))
+
+    errors = pd.concat(problems, axis=1).apply(lambda r: "; ".join(m for m in r if m), axis=1)
+    # One bad member holds back their whole team
+    bad_team = team_key.isin(team_key[errors != ""])
+    return errors.mask(bad_team & (errors == ""), "another member of this team has errors")
+
+
+def _teams(df: pd.DataFrame) -> list:
+    """Group valid rows into (team_name, members) in file order."""
+    df = df.assign(_key=df["Team Name"].str.casefold().str.split().str.join(" "))
+    teams = []
+    for _, rows in df.groupby("_key", sort=False):
+        teams.append((rows["Team Name"].iloc[0], [
+            {"name": r["Full Name"], "email": r["Email"], "phone": r["Phone"],
+             "institution": r["Institution"], "program": r["Program"]}
+            for r in rows.to_dict("records")
+        ]))
+    return teams
+
+
+def show():
+    user = st.session_state.get("user")
+    if not user or user.get("role") != "admin":
+        st.error("Admin access required.")
+        st.stop()
+
+    st.header("Import Registrations")
+    st.caption(
+        "Register many teams at once from a school's spreadsheet (CSV or XLSX). "
+        "Use one row per team member; rows with the same Team Name form one team."
+    )
+    st.download_button(
+        "⬇️ Download CSV Template",
+        data=pd.DataFrame(columns=_COLUMNS).to_csv(index=False).encode("utf-8"),
+        file_name="autohack2026_registration_import.csv",
+        mime="text/csv",
+    )
+
+    upload = st.file_uploader("Spreadsheet", type=["csv", "xlsx"], key="reg_import_file")
+    if upload is None:
+        return
+
+    try:
+        df = _read_upload(upload)
+    except ImportError:
+        st.error("Reading .xlsx files needs the openpyxl package — upload a CSV instead.")
+        return
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+    if df.empty:
+        st.warning("The file has no member rows.")
+        return
+
+    df["Errors"] = _validate(df)
+    ok = df[df["Errors"] == ""]
+    teams = _teams(ok)
+    rejected = df["Errors"].ne("").sum()
+
+    st.caption(
+        f"{len(df)} row(s): {len(ok)} ready to import as {len(teams)} team(s), "
+        f"{rejected} with errors"
+    )
+    if rejected:
+        st.dataframe(
+            df[df["Errors"] != ""].rename_axis("Row"),
+            use_container_width=True,
+        )
+        st.download_button(
+            "⬇️ Download Error Report",
+            data=df[df["Errors"] != ""].rename_axis("Row").to_csv().encode("utf-8"),
+            file_name="autohack2026_import_errors.csv",
+            mime="text/csv",
+        )
+
+    if st.button(f"📥 Import {len(teams)} Team(s)", type="primary", disabled=not teams):
+        result = bulk_register_teams(teams)
+        st.success(f"✅ Imported {len(result['inserted'])} team(s) as pending registrations.")
+        for team, reason in result["failed"].items():
+            st.error(f"{team}: {reason}")
@@ -1,11 +1,12 @@
 import os
 import io
 import re
-import base64
 import streamlit as st
 from datetime import datetime
-from fpdf import FPDF
-from db import register_team, team_name_exists, contact_email_registered, get_team_by_member_email
+from db import RegistrationConflictError, register_team
+from receipts import get_receipt, peek_receipt
+from static_assets import img_tag
+from theme import BASE_CSS, apply_stylesheet
 
 # ── Asset paths ────────────────────────────────────────────────────────────────
 _LOGO_AH_WHITE = os.path.join("assets", "autohack_logo_white.png")
@@ -57,15 +58,6 @@ _CSS = f"""
 .ah-auto  {{ color: #CC0000; }}
 .ah-hack  {{ color: #4A80D4; }}
 .ah-year  {{ color: #A0A8B8; font-size: 2rem; letter-spacing: 1px; }}
-.ah-subtitle {{
-    color: rgba(200,210,230,0.70); font-size: 0.95rem;
-    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
-}}
-.ah-stripe {{
-    height: 3px;
-    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
-    border-radius: 2px; width: 55%; margin: 16px auto 0;
-}}
 
 /* Section labels */
 .ah-section {{
@@ -212,35 +204,24 @@ hr {{ border-color: rgba(255,255,255,0.10) !important; }}
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
-def _b64_tag(path: str, style: str, alt: str = "") -> str:
-    """Read a local file and return a base64-embedded <img> tag."""
-    if not os.path.exists(path):
-        return ""
-    ext  = os.path.splitext(path)[1].lstrip(".").lower()
-    mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-    with open(path, "rb") as fh:
-        b64 = base64.b64encode(fh.read()).decode()
-    return f'<img src="data:{mime};base64,{b64}" style="{style}" alt="{alt}">'
-
-
 def _render_header():
-    st.markdown(_CSS, unsafe_allow_html=True)
+    apply_stylesheet("registration", BASE_CSS, _CSS)
 
     # ── AutoHack logo: large centered cover banner ─────────────────────────────
     ah_tag = (
-        _b64_tag(_LOGO_AH_WHITE,
-                 "width:100%;max-width:640px;height:auto;object-fit:contain;",
-                 "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_SVG,
-                    "width:100%;max-width:640px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_PNG,
-                    "width:100%;max-width:640px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
+        img_tag(_LOGO_AH_WHITE,
+                "width:100%;max-width:640px;height:auto;object-fit:contain;",
+                "AutoHack 2026")
+        or img_tag(_LOGO_AH_SVG,
+                   "width:100%;max-width:640px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
+        or img_tag(_LOGO_AH_PNG,
+                   "width:100%;max-width:640px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
     )
 
     # ── Georgian College logo: small, below AH logo, right-aligned ────────────
-    gc_tag = _b64_tag(
+    gc_tag = img_tag(
         _LOGO_GC_PNG,
         "height:30px;object-fit:contain;opacity:0.82;",
         "Georgian College"
@@ -281,7 +262,13 @@ def _render_header():
 
 # ── PDF generation ─────────────────────────────────────────────────────────────
 
-def _generate_pdf(team_name: str, members: list) -> bytes:
+# Bump whenever the layout below changes so cached receipts are re-rendered
+_REGISTRATION_RECEIPT_TEMPLATE = "registration-v1"
+
+
+def _generate_pdf(team_name: str, members: list, submitted_at: datetime) -> bytes:
+    from fpdf import FPDF  # deferred: most visits never render a receipt
+
     pdf = FPDF()
     pdf.add_page()
     pdf.set_margins(14, 14, 14)
@@ -313,7 +300,7 @@ def _generate_pdf(team_name: str, members: list) -> bytes:
     pdf.set_font("Helvetica", "B", 11)
     pdf.cell(38, 8, "Submitted:", ln=False)
     pdf.set_font("Helvetica", "", 11)
-    pdf.cell(0, 8, datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"), ln=True)
+    pdf.cell(0, 8, submitted_at.strftime("%Y-%m-%d %H:%M UTC"), ln=True)
     pdf.ln(4)
 
     # Members section heading
@@ -378,23 +365,35 @@ def _render_success():
         unsafe_allow_html=True,
     )
 
-    pdf_bytes = _generate_pdf(team_name, members)
-    safe_name = team_name.replace(" ", "_").replace("/", "-")
-    st.download_button(
-        label="Download registration confirmation (PDF)",
-        data=pdf_bytes,
-        file_name=f"AutoHack2026_Registration_{safe_name}.pdf",
-        mime="application/pdf",
-        type="primary",
-        use_container_width=True,
-    )
+    receipt_fields = {
+        "team_name": team_name,
+        "members": members,
+        "submitted_at": st.session_state.get("submitted_at") or datetime.utcnow(),
+    }
+    pdf_bytes = peek_receipt(_REGISTRATION_RECEIPT_TEMPLATE, receipt_fields)
+    if pdf_bytes is None and st.button("Prepare registration confirmation (PDF)",
+                                       use_container_width=True):
+        pdf_bytes = get_receipt(
+            _REGISTRATION_RECEIPT_TEMPLATE, receipt_fields,
+            lambda: _generate_pdf(**receipt_fields),
+        )
+    if pdf_bytes is not None:
+        safe_name = team_name.replace(" ", "_").replace("/", "-")
+        st.download_button(
+            label="Download registration confirmation (PDF)",
+            data=pdf_bytes,
+            file_name=f"AutoHack2026_Registration_{safe_name}.pdf",
+            mime="application/pdf",
+            type="primary",
+            use_container_width=True,
+        )
 
 
 # ── State helpers ───────────────────────────────────────────────────────────────
 
 def _clear_form_state():
     keys = [
-        "registration_submitted", "submitted_team_name", "submitted_members",
+        "registration_submitted", "submitted_team_name", "submitted_members", "submitted_at",
         "reg_team_name", "reg_team_size",
     ]
     for i in range(1, 7):
@@ -444,16 +443,6 @@ def _validate(team_name, team_size, members):
             errors.append(f"Member {i}: Full Name is required.")
         if not email or "@" not in email:
             errors.append(f"Member {i}: a valid Email is required.")
-        else:
-            existing = get_team_by_member_email(email)
-            if existing:
-                team = existing.get("team_name", "another team")
-                errors.append(
-                    f"Member {i}: **{email}** is already registered with team **{team}**. "
-                    f"If this is a mistake, please contact "
-                    f"Shubhneet.Sandhu@GeorgianCollege.ca or "
-                    f"Brunilda.Xhaferllari@GeorgianCollege.ca."
-                )
         if phone:
             digits = re.sub(r'\D', '', phone)
             if len(digits) < 7 or len(digits) > 15:
@@ -465,9 +454,23 @@ def _validate(team_name, team_size, members):
             errors.append(f"Member {i}: Institution is required.")
         if not prog:
             errors.append(f"Member {i}: Program is required.")
-    if not errors:
-        if team_name_exists(team_name.strip()):
-            errors.append("A team with this name is already registered. Please choose a different name.")
+    return errors
+
+
+def _conflict_errors(conflicts, members):
+    """Form messages for a RegistrationConflictError raised by register_team."""
+    errors = []
+    if conflicts.get("team_name"):
+        errors.append("A team with this name is already registered. Please choose a different name.")
+    for i, m in enumerate(members, start=1):
+        team = conflicts.get("emails", {}).get(m["email"].strip().lower())
+        if team:
+            errors.append(
+                f"Member {i}: **{m['email']}** is already registered with team **{team}**. "
+                f"If this is a mistake, please contact "
+                f"Shubhneet.Sandhu@GeorgianCollege.ca or "
+                f"Brunilda.Xhaferllari@GeorgianCollege.ca."
+            )
     return errors
 
 
@@ -547,7 +550,11 @@ def show():
                 st.session_state["registration_submitted"] = True
                 st.session_state["submitted_team_name"]    = team_name.strip()
                 st.session_state["submitted_members"]      = active_members
+                st.session_state["submitted_at"]           = datetime.utcnow()
                 st.rerun()
+            except RegistrationConflictError as exc:
+                for err in _conflict_errors(exc.conflicts, active_members):
+                    st.error(err)
             except Exception as exc:
                 st.error(f"Submission failed — please try again. ({exc})")
 
@@ -1,43 +1,53 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timezone
-from db import get_team_registrations, update_registration, delete_registration
+from db import (
+    delete_registration, get_registrations_page, get_team_registrations, search_registrations,
+    update_registration,
+)
 
 _KNOWN_APP_URL    = "https://judgingapp26.streamlit.app"
 _MAX_MEMBERS      = 6   # public registration cap (students see 6 slots)
 _ADMIN_MAX_MEMBERS = 7  # admin-only: allows adding a 7th member via edit form
+_PAGE_SIZES = [25, 50, 100]
+_STATUS_FILTERS = {"All": None, "Pending": "pending", "Approved": "approved", "Rejected": "rejected"}
 
 
 def _registration_link() -> str:
     return f"{_KNOWN_APP_URL}/?page=register"
 
 
-def show():
-    user = st.session_state.get("user")
-    if not user or user.get("role") != "admin":
-        st.error("Admin access required.")
-        st.stop()
+def _reset_page():
+    st.session_state["reg_page"] = 0
 
-    st.header("Team Registrations")
 
-    # ── Public link ─────────────────────────────────────────────────────────────
-    with st.container(border=True):
-        st.markdown("**Public Registration Link**")
-        st.code(_registration_link(), language=None)
-        st.caption("Share this link with teams. No login required to register.")
+def _set_page(page_no: int):
+    st.session_state["reg_page"] = page_no
 
-    st.write("")
 
-    registrations = get_team_registrations()
-    if not registrations:
-        st.info("No registrations yet.")
+def _pager(page_no: int, page_count: int, key: str) -> None:
+    if page_count <= 1:
         return
+    prev_col, label_col, next_col = st.columns([1, 3, 1])
+    prev_col.button("◀ Prev", key=f"reg_prev_{key}", disabled=page_no == 0,
+                    use_container_width=True, on_click=_set_page, args=(page_no - 1,))
+    label_col.markdown(
+        f"<p style='text-align:center;margin-top:6px;'>Page {page_no + 1} of {page_count}</p>",
+        unsafe_allow_html=True,
+    )
+    next_col.button("Next ▶", key=f"reg_next_{key}", disabled=page_no >= page_count - 1,
+                    use_container_width=True, on_click=_set_page, args=(page_no + 1,))
+
 
-    # ── Caption + CSV export ─────────────────────────────────────────────────────
-    cap_col, exp_col = st.columns([5, 1])
-    cap_col.caption(f"{len(registrations)} team(s) registered")
+def _open_panel(panel: str, reg_id=None):
+    """Show the "viewing" or "editing" panel for one team (None closes it)."""
+    st.session_state["viewing_reg_id"] = None
+    st.session_state["editing_reg_id"] = None
+    st.session_state[f"{panel}_reg_id"] = reg_id
 
-    # Build CSV: one row per member so every person is individually searchable
+
+def _registrations_csv(registrations: list) -> bytes:
+    """One row per member so every person is individually searchable."""
+    import pandas as pd
     _csv_rows = []
     for _reg in registrations:
         _members = _reg.get("members") or []
@@ -58,27 +68,89 @@ def show():
                 "Institution":    _m.get("institution", ""),
                 "Program":        _m.get("program", ""),
             })
-    _csv_bytes = pd.DataFrame(_csv_rows).to_csv(index=False).encode("utf-8")
-    _fname = f"autohack2026_registrations_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M')}.csv"
-
-    exp_col.download_button(
-        label="⬇️ Export CSV",
-        data=_csv_bytes,
-        file_name=_fname,
-        mime="text/csv",
-        help="Download all team registrations as a CSV spreadsheet",
-        use_container_width=True,
+    return pd.DataFrame(_csv_rows).to_csv(index=False).encode("utf-8")
+
+
+@st.fragment
+def _quick_find():
+    with st.expander("🔎 Find a team or person"):
+        query = st.text_input(
+            "Find", key="reg_find", label_visibility="collapsed",
+            placeholder="e.g. Priya, or Georgian CET — matches start of words",
+        )
+        if query.strip():
+            matches = search_registrations(query)
+            if not matches:
+                st.caption("No matches.")
+            for reg in matches:
+                st.markdown(f"**{reg.get('team_name', '—')}** · {reg.get('status', '—')}")
+                for m in reg["matched_members"]:
+                    st.caption(
+                        " · ".join(str(m.get(f)) for f in ("name", "email", "institution", "program")
+                                   if m.get(f))
+                    )
+
+
+@st.dialog("Delete registration")
+def _confirm_delete(reg: dict):
+    st.warning(
+        f"⚠️ Are you sure you want to **permanently delete** "
+        f"**{reg.get('team_name', 'this team')}**? This cannot be undone."
     )
+    conf_yes, conf_no = st.columns(2)
+    if conf_yes.button("✅ Yes, delete", type="primary", use_container_width=True):
+        delete_registration(reg["id"])
+        st.toast(f"✅ Registration for **{reg.get('team_name', '')}** deleted.")
+        st.rerun()
+    if conf_no.button("Cancel", use_container_width=True):
+        st.rerun()
+
+
+@st.fragment
+def _csv_export():
+    # The CSV covers every registration, so it is only built on request
+    _, exp_col = st.columns([5, 1])
+    if exp_col.button("⬇️ Prepare CSV", use_container_width=True,
+                      help="Build a CSV spreadsheet of all team registrations"):
+        st.session_state["reg_csv"] = _registrations_csv(get_team_registrations())
+    if "reg_csv" in st.session_state:
+        _fname = f"autohack2026_registrations_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M')}.csv"
+        exp_col.download_button(
+            label="⬇️ Export CSV",
+            data=st.session_state["reg_csv"],
+            file_name=_fname,
+            mime="text/csv",
+            help="Download all team registrations as a CSV spreadsheet",
+            use_container_width=True,
+            on_click=lambda: st.session_state.pop("reg_csv", None),
+        )
+
+
+@st.fragment
+def _registration_list(status, search: str, page_size: int):
+    """The paged table with its view/edit panels. Paging, opening a panel and
+    saving an edit rerun only this fragment, not the whole page."""
+    page_no = st.session_state.get("reg_page", 0)
+    result = get_registrations_page(status, search, page_no, page_size)
+    total = result["total"]
+    page_count = max(1, -(-total // page_size))
+    if page_no >= page_count:
+        st.session_state["reg_page"] = page_no = page_count - 1
+        result = get_registrations_page(status, search, page_no, page_size)
+    registrations = result["rows"]
+
+    st.caption(f"{total} team(s) match")
+    if not registrations:
+        st.info("No registrations match." if total or search or status
+                else "No registrations yet.")
+        return
 
+    _pager(page_no, page_count, "top")
     st.divider()
 
-    # ── Track which team is being viewed / edited / deleted ──────────────────────
-    if "editing_reg_id" not in st.session_state:
-        st.session_state["editing_reg_id"] = None
-    if "viewing_reg_id" not in st.session_state:
-        st.session_state["viewing_reg_id"] = None
-    if "confirm_delete_reg_id" not in st.session_state:
-        st.session_state["confirm_delete_reg_id"] = None
+    # ── Track which team is being viewed / edited ────────────────────────────────
+    st.session_state.setdefault("editing_reg_id", None)
+    st.session_state.setdefault("viewing_reg_id", None)
 
     # ── Table header ─────────────────────────────────────────────────────────────
     hcols = st.columns([2.2, 0.7, 2.2, 1.5, 0.85, 0.75, 0.75])
@@ -104,69 +176,25 @@ def show():
         is_editing = st.session_state["editing_reg_id"] == reg_id
         is_viewing = st.session_state["viewing_reg_id"] == reg_id
 
-        is_confirming_delete = st.session_state["confirm_delete_reg_id"] == reg_id
-
         row = st.columns([2.2, 0.7, 2.2, 1.5, 0.85, 0.75, 0.75])
         row[0].write(reg.get("team_name", "—"))
         row[1].write(str(len(members)))
         row[2].write(member1_email)
         row[3].write(date_str)
 
-        # View button
+        # View / Edit toggles
         if is_viewing:
-            if row[4].button("Close", key=f"close_{reg_id}"):
-                st.session_state["viewing_reg_id"] = None
-                st.rerun()
+            row[4].button("Close", key=f"close_{reg_id}", on_click=_open_panel, args=("viewing",))
         else:
-            if row[4].button("👁 View", key=f"view_{reg_id}"):
-                st.session_state["viewing_reg_id"] = reg_id
-                st.session_state["editing_reg_id"] = None
-                st.session_state["confirm_delete_reg_id"] = None
-                st.rerun()
-
-        # Edit button
+            row[4].button("👁 View", key=f"view_{reg_id}", on_click=_open_panel, args=("viewing", reg_id))
         if is_editing:
-            if row[5].button("Cancel", key=f"cancel_{reg_id}"):
-                st.session_state["editing_reg_id"] = None
-                st.rerun()
+            row[5].button("Cancel", key=f"cancel_{reg_id}", on_click=_open_panel, args=("editing",))
         else:
-            if row[5].button("✏️ Edit", key=f"edit_{reg_id}"):
-                st.session_state["editing_reg_id"] = reg_id
-                st.session_state["viewing_reg_id"] = None
-                st.session_state["confirm_delete_reg_id"] = None
-                st.rerun()
-
-        # Delete button
-        if is_confirming_delete:
-            if row[6].button("✕ Cancel", key=f"del_cancel_{reg_id}"):
-                st.session_state["confirm_delete_reg_id"] = None
-                st.rerun()
-        else:
-            if row[6].button("🗑️", key=f"del_{reg_id}", help="Delete this registration"):
-                st.session_state["confirm_delete_reg_id"] = reg_id
-                st.session_state["editing_reg_id"] = None
-                st.session_state["viewing_reg_id"] = None
-                st.rerun()
-
-        # ── Delete confirmation panel ─────────────────────────────────────────────
-        if is_confirming_delete:
-            with st.container(border=True):
-                st.warning(
-                    f"⚠️ Are you sure you want to **permanently delete** "
-                    f"**{reg.get('team_name', 'this team')}**? This cannot be undone."
-                )
-                conf_yes, conf_no, _ = st.columns([1.5, 1, 5])
-                if conf_yes.button(
-                    "✅ Yes, delete", type="primary",
-                    use_container_width=True, key=f"del_confirm_{reg_id}"
-                ):
-                    delete_registration(reg_id)
-                    st.session_state["confirm_delete_reg_id"] = None
-                    st.success(f"✅ Registration for **{reg.get('team_name', '')}** deleted.")
-                    st.rerun()
-                if conf_no.button("Cancel", use_container_width=True, key=f"del_no_{reg_id}"):
-                    st.session_state["confirm_delete_reg_id"] = None
-                    st.rerun()
+            row[5].button("✏️ Edit", key=f"edit_{reg_id}", on_click=_open_panel, args=("editing", reg_id))
+
+        # Delete asks for confirmation in a dialog
+        if row[6].button("🗑️", key=f"del_{reg_id}", help="Delete this registration"):
+            _confirm_delete(reg)
 
         # ── Inline view panel ────────────────────────────────────────────────────
         if is_viewing:
@@ -234,13 +262,54 @@ def show():
                         for n, e, ph, ins, p in new_members
                         if n
                     ]
-                    update_registration(
-                        reg_id,
-                        team_name=new_team_name,
-                        members=updated_members,
-                    )
-                    st.session_state["editing_reg_id"] = None
-                    st.success(f"✅ Saved changes for **{new_team_name}**.")
-                    st.rerun()
+                    try:
+                        update_registration(
+                            reg_id,
+                            team_name=new_team_name,
+                            members=updated_members,
+                        )
+                        st.session_state["editing_reg_id"] = None
+                        st.toast(f"✅ Saved changes for **{new_team_name}**.")
+                        st.rerun(scope="fragment")
+                    except ValueError as exc:
+                        st.error(str(exc))
 
         st.divider()
+
+    _pager(page_no, page_count, "bottom")
+
+
+def show():
+    user = st.session_state.get("user")
+    if not user or user.get("role") != "admin":
+        st.error("Admin access required.")
+        st.stop()
+
+    st.header("Team Registrations")
+
+    # ── Public link ─────────────────────────────────────────────────────────────
+    with st.container(border=True):
+        st.markdown("**Public Registration Link**")
+        st.code(_registration_link(), language=None)
+        st.caption("Share this link with teams. No login required to register.")
+
+    st.write("")
+
+    # ── Quick find ───────────────────────────────────────────────────────────────
+    _quick_find()
+
+    # ── Filters (applied in the database query) ─────────────────────────────────
+    f_status, f_search, f_size = st.columns([1.2, 3, 1])
+    status_label = f_status.selectbox(
+        "Status", list(_STATUS_FILTERS), key="reg_status_filter", on_change=_reset_page,
+    )
+    search = f_search.text_input(
+        "Search", key="reg_search", on_change=_reset_page,
+        placeholder="Team, member, email, institution or program",
+    )
+    page_size = f_size.selectbox(
+        "Per page", _PAGE_SIZES, key="reg_page_size", on_change=_reset_page,
+    )
+
+    _csv_export()
+    _registration_list(_STATUS_FILTERS[status_label], search, page_size)
@@ -14,29 +14,32 @@ Cancellation is blocked once the slot's start time has passed (EST = Barrie).
 """
 
 import os
-import base64
-from datetime import datetime, timezone, timedelta
 import streamlit as st
 
 from db import (
     MENTOR_NAMES,
     MENTOR_ROOM_MAP,
     SCHED_ROBOT_ROOMS,
-    SCHED_FRIDAY_SLOTS,
-    SCHED_SATURDAY_SLOTS,
-    SCHED_ALL_SLOTS,
+    SCHED_SLOT_IDS,
     MAX_MENTOR_BOOKINGS,
     MAX_ROBOT_BOOKINGS,
     get_team_by_member_email,
-    get_mentor_bookings_for_team,
-    get_robot_bookings_for_team,
+    get_team_timeline,
     get_mentor_booked_map,
     get_robot_booked_map,
     create_mentor_booking_room,
     create_robot_booking,
     cancel_mentor_booking,
     cancel_robot_booking,
+    get_booking_queue_enabled,
+    enqueue_booking_request,
+    slot_day,
+    slot_has_passed,
+    slot_short_label,
 )
+from components import lazy_tabs, queue_status, queue_result, slot_grid, waitlist_panel
+from static_assets import img_tag
+from theme import BASE_CSS, apply_stylesheet, grid_day, grid_header, grid_time
 
 # ── Asset paths ────────────────────────────────────────────────────────────────
 _LOGO_AH_SVG   = os.path.join("assets", "autohack_logo.svg")
@@ -49,43 +52,6 @@ _BG_URL = (
     "?auto=format&fit=crop&w=1920&q=80"
 )
 
-# ── EST timezone (UTC-5) ───────────────────────────────────────────────────────
-# March 6-7, 2026 fall before DST change (Mar 8), so Barrie is on EST = UTC-5
-_EST = timezone(timedelta(hours=-5))
-
-
-def _make_est(year: int, month: int, day: int, hour: int, minute: int) -> datetime:
-    return datetime(year, month, day, hour, minute, tzinfo=_EST)
-
-
-# Slot start-time lookup (used to block cancellations of past sessions)
-_SLOT_START: dict = {
-    "Fri Mar 6 \u00b7 6:20 \u2013 6:40 PM":    _make_est(2026, 3, 6, 18, 20),
-    "Fri Mar 6 \u00b7 6:40 \u2013 7:00 PM":    _make_est(2026, 3, 6, 18, 40),
-    "Fri Mar 6 \u00b7 7:00 \u2013 7:20 PM":    _make_est(2026, 3, 6, 19,  0),
-    "Fri Mar 6 \u00b7 7:20 \u2013 7:40 PM":    _make_est(2026, 3, 6, 19, 20),
-    "Fri Mar 6 \u00b7 7:40 \u2013 8:00 PM":    _make_est(2026, 3, 6, 19, 40),
-    "Sat Mar 7 \u00b7 10:00 \u2013 10:20 AM":  _make_est(2026, 3, 7, 10,  0),
-    "Sat Mar 7 \u00b7 10:20 \u2013 10:40 AM":  _make_est(2026, 3, 7, 10, 20),
-    "Sat Mar 7 \u00b7 10:40 \u2013 11:00 AM":  _make_est(2026, 3, 7, 10, 40),
-    "Sat Mar 7 \u00b7 11:00 \u2013 11:20 AM":  _make_est(2026, 3, 7, 11,  0),
-    "Sat Mar 7 \u00b7 11:20 \u2013 11:40 AM":  _make_est(2026, 3, 7, 11, 20),
-    "Sat Mar 7 \u00b7 11:40 AM \u2013 12:00 PM": _make_est(2026, 3, 7, 11, 40),
-    "Sat Mar 7 \u00b7 12:00 \u2013 12:20 PM":  _make_est(2026, 3, 7, 12,  0),
-    "Sat Mar 7 \u00b7 12:20 \u2013 12:40 PM":  _make_est(2026, 3, 7, 12, 20),
-    "Sat Mar 7 \u00b7 12:40 \u2013  1:00 PM":  _make_est(2026, 3, 7, 12, 40),
-    "Sat Mar 7 \u00b7  1:00 \u2013  1:20 PM":  _make_est(2026, 3, 7, 13,  0),
-}
-
-
-def _slot_has_passed(slot_label: str) -> bool:
-    """Return True if the slot's start time is in the past (Barrie EST)."""
-    start = _SLOT_START.get(slot_label)
-    if start is None:
-        return False  # Unknown slot — allow cancel
-    return datetime.now(tz=_EST) >= start
-
-
 # ── CSS ────────────────────────────────────────────────────────────────────────
 _CSS = f"""
 <style>
@@ -110,15 +76,6 @@ _CSS = f"""
     margin-bottom: 2rem !important;
     box-shadow: 0 8px 60px rgba(0,0,0,0.60) !important;
 }}
-.ah-subtitle {{
-    color: rgba(200,210,230,0.70); font-size: 0.95rem;
-    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
-}}
-.ah-stripe {{
-    height: 3px;
-    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
-    border-radius: 2px; width: 55%; margin: 16px auto 0;
-}}
 .ah-section {{
     color: #FF4040; font-weight: 700; font-size: 0.80rem;
     text-transform: uppercase; letter-spacing: 1.4px;
@@ -265,38 +222,31 @@ hr {{ border-color: rgba(255,255,255,0.10) !important; }}
         font-size: 0.80rem !important;
     }}
 }}
+div[data-testid="stCheckbox"] label p {{
+    color: #F2F3F4 !important;
+}}
 </style>
 """
 
 
 # ── Asset helpers ──────────────────────────────────────────────────────────────
 
-def _b64_tag(path: str, style: str, alt: str = "") -> str:
-    if not os.path.exists(path):
-        return ""
-    ext  = os.path.splitext(path)[1].lstrip(".").lower()
-    mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-    with open(path, "rb") as fh:
-        b64 = base64.b64encode(fh.read()).decode()
-    return f'<img src="data:{mime};base64,{b64}" style="{style}" alt="{alt}">'
-
-
 def _render_header():
-    st.markdown(_CSS, unsafe_allow_html=True)
+    apply_stylesheet("scheduling", BASE_CSS, _CSS)
 
     ah_tag = (
-        _b64_tag(_LOGO_AH_WHITE,
-                 "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                 "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_SVG,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_PNG,
-                    "width:100%;max-width:560px;height:auto;object-fit:contain;",
-                    "AutoHack 2026")
+        img_tag(_LOGO_AH_WHITE,
+                "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                "AutoHack 2026")
+        or img_tag(_LOGO_AH_SVG,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
+        or img_tag(_LOGO_AH_PNG,
+                   "width:100%;max-width:560px;height:auto;object-fit:contain;",
+                   "AutoHack 2026")
     )
 
-    gc_tag = _b64_tag(
+    gc_tag = img_tag(
         _LOGO_GC_PNG,
         "height:30px;object-fit:contain;opacity:0.82;",
         "Georgian College"
@@ -336,13 +286,13 @@ def _render_header():
 
 # ── Slot key helpers ───────────────────────────────────────────────────────────
 
-def _is_friday_slot(slot_label: str) -> bool:
-    return slot_label.startswith("Fri")
+def _is_friday_slot(slot_id: int) -> bool:
+    return slot_day(slot_id) == "Fri"
 
 
-def _short(slot_label: str) -> str:
-    """Strip the day prefix: 'Fri Mar 6 · 6:20 – 6:40 PM' → '6:20 – 6:40 PM'."""
-    return slot_label.split("\u00b7", 1)[-1].strip()
+def _short(slot_id: int) -> str:
+    """Time-of-day only: 'Fri Mar 6 · 6:20 – 6:40 PM' → '6:20 – 6:40 PM'."""
+    return slot_short_label(slot_id)
 
 
 # ── Availability grids ─────────────────────────────────────────────────────────
@@ -352,6 +302,26 @@ def _mentor_rooms_ordered() -> list:
     return list(dict.fromkeys(MENTOR_ROOM_MAP.values()))
 
 
+def _grid_headers(rooms: list) -> list:
+    return [grid_header("Time Slot", center=False)] + [grid_header(f"Room {room}") for room in rooms]
+
+
+def _time_cell(slot: int) -> str:
+    return grid_time(_short(slot))
+
+
+def _slot_rows():
+    """Yield (slot_id, day heading or None) — the heading on each day's first slot."""
+    last_day = None
+    for slot in SCHED_SLOT_IDS:
+        day = "Friday Mar 6" if _is_friday_slot(slot) else "Saturday Mar 7"
+        heading = None
+        if day != last_day:
+            last_day = day
+            heading = grid_day(day)
+        yield slot, heading
+
+
 def _render_mentor_grid(mentor_booked_map: dict, my_team: str):
     """Mentor availability grid.
     Rows = time slots.  Columns = Rooms (N200, N217, ABSC Lounge 3rd Floor).
@@ -363,119 +333,66 @@ def _render_mentor_grid(mentor_booked_map: dict, my_team: str):
     """
     rooms = _mentor_rooms_ordered()
     mentors_per_room = {r: [m for m, rm in MENTOR_ROOM_MAP.items() if rm == r] for r in rooms}
-    col_widths = [2.0] + [1.0] * len(rooms)
-
-    # Header row
-    hcols = st.columns(col_widths)
-    hcols[0].markdown(
-        '<p style="color:#6B9FE4;font-weight:700;font-size:0.82rem;'
-        'text-transform:uppercase;padding-bottom:4px;'
-        'border-bottom:1px solid rgba(74,128,212,0.35);">Time Slot</p>',
-        unsafe_allow_html=True,
-    )
-    for i, room in enumerate(rooms, start=1):
-        hcols[i].markdown(
-            f'<p style="color:#6B9FE4;font-weight:700;font-size:0.82rem;'
-            f'text-transform:uppercase;text-align:center;padding-bottom:4px;'
-            f'border-bottom:1px solid rgba(74,128,212,0.35);">Room {room}</p>',
-            unsafe_allow_html=True,
-        )
 
-    last_day = None
-    for slot in SCHED_ALL_SLOTS:
-        day = "Friday Mar 6" if _is_friday_slot(slot) else "Saturday Mar 7"
-        if day != last_day:
-            last_day = day
-            st.markdown(
-                f"<p style='color:rgba(220,160,0,0.80);font-size:0.78rem;"
-                f"font-weight:700;margin:8px 0 2px;'>&#9654; {day}</p>",
-                unsafe_allow_html=True,
-            )
-        row = st.columns(col_widths)
-        row[0].markdown(
-            f'<p style="color:rgba(220,230,250,0.85);font-size:0.88rem;'
-            f'padding-top:6px;">{_short(slot)}</p>',
-            unsafe_allow_html=True,
-        )
-        for i, room in enumerate(rooms, start=1):
+    rows = []
+    for slot, day_row in _slot_rows():
+        if day_row:
+            rows.append(day_row)
+        row = [_time_cell(slot)]
+        for room in rooms:
             mentors   = mentors_per_room[room]
             team_here = any(
-                mentor_booked_map.get(f"{slot}||{m}") == my_team for m in mentors
+                mentor_booked_map.get((slot, m)) == my_team for m in mentors
             )
-            any_booked = any(f"{slot}||{m}" in mentor_booked_map for m in mentors)
+            any_booked = any((slot, m) in mentor_booked_map for m in mentors)
 
             if team_here:
-                row[i].markdown('<div class="slot-mine">&#11088; You</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-mine">&#11088; You</div>')
             elif any_booked:
                 # Any booking in this room at this slot means it's full (one team per room)
-                row[i].markdown('<div class="slot-taken">Taken</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-taken">Taken</div>')
             else:
-                row[i].markdown('<div class="slot-free">Free</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-free">Free</div>')
+        rows.append(row)
+    slot_grid(_grid_headers(rooms), rows, [2.0] + [1.0] * len(rooms))
 
 
 def _render_robot_grid(robot_booked_map: dict, my_team: str):
     """Robot availability grid.
     Rows = time slots.  Columns = Room N200 / N217 / ABSC Lounge 3rd Floor.
     """
-    col_widths = [2.0] + [1.0] * len(SCHED_ROBOT_ROOMS)
-
-    # Header row
-    hcols = st.columns(col_widths)
-    hcols[0].markdown(
-        '<p style="color:#6B9FE4;font-weight:700;font-size:0.82rem;'
-        'text-transform:uppercase;padding-bottom:4px;'
-        'border-bottom:1px solid rgba(74,128,212,0.35);">Time Slot</p>',
-        unsafe_allow_html=True,
-    )
-    for i, room in enumerate(SCHED_ROBOT_ROOMS, start=1):
-        hcols[i].markdown(
-            f'<p style="color:#6B9FE4;font-weight:700;font-size:0.82rem;'
-            f'text-transform:uppercase;text-align:center;padding-bottom:4px;'
-            f'border-bottom:1px solid rgba(74,128,212,0.35);">Room {room}</p>',
-            unsafe_allow_html=True,
-        )
-
-    last_day = None
-    for slot in SCHED_ALL_SLOTS:
-        day = "Friday Mar 6" if _is_friday_slot(slot) else "Saturday Mar 7"
-        if day != last_day:
-            last_day = day
-            st.markdown(
-                f"<p style='color:rgba(220,160,0,0.80);font-size:0.78rem;"
-                f"font-weight:700;margin:8px 0 2px;'>&#9654; {day}</p>",
-                unsafe_allow_html=True,
-            )
-        row = st.columns(col_widths)
-        row[0].markdown(
-            f'<p style="color:rgba(220,230,250,0.85);font-size:0.88rem;'
-            f'padding-top:6px;">{_short(slot)}</p>',
-            unsafe_allow_html=True,
-        )
-        for i, room in enumerate(SCHED_ROBOT_ROOMS, start=1):
-            occupant = robot_booked_map.get(f"{slot}||{room}")
+    rows = []
+    for slot, day_row in _slot_rows():
+        if day_row:
+            rows.append(day_row)
+        row = [_time_cell(slot)]
+        for room in SCHED_ROBOT_ROOMS:
+            occupant = robot_booked_map.get((slot, room))
             if occupant and occupant == my_team:
-                row[i].markdown('<div class="slot-mine">&#11088; You</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-mine">&#11088; You</div>')
             elif occupant:
-                row[i].markdown('<div class="slot-taken">Taken</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-taken">Taken</div>')
             else:
-                row[i].markdown('<div class="slot-free">Free</div>', unsafe_allow_html=True)
+                row.append('<div class="slot-free">Free</div>')
+        rows.append(row)
+    slot_grid(_grid_headers(SCHED_ROBOT_ROOMS), rows, [2.0] + [1.0] * len(SCHED_ROBOT_ROOMS))
 
 
 # ── Slot pickers ───────────────────────────────────────────────────────────────
 
 def _mentor_slot_picker(mentor_booked_map: dict, team_booked_slots: set):
     """Dropdown of available mentor slot + room combos.
-    Returns (slot_label, room) or (None, None)."""
+    Returns (slot_id, room) or (None, None)."""
     rooms = _mentor_rooms_ordered()
     mentors_per_room = {r: [m for m, rm in MENTOR_ROOM_MAP.items() if rm == r] for r in rooms}
 
-    options = []  # list of (display_label, slot_label, room)
-    for slot in SCHED_ALL_SLOTS:
+    options = []  # list of (display_label, slot_id, room)
+    for slot in SCHED_SLOT_IDS:
         if slot in team_booked_slots:
             continue
         for room in rooms:
             mentors = mentors_per_room[room]
-            if not any(f"{slot}||{m}" in mentor_booked_map for m in mentors):
+            if not any((slot, m) in mentor_booked_map for m in mentors):
                 day = "Fri" if _is_friday_slot(slot) else "Sat"
                 options.append((f"{_short(slot)}  —  Room {room}  ({day})", slot, room))
 
@@ -496,13 +413,13 @@ def _mentor_slot_picker(mentor_booked_map: dict, team_booked_slots: set):
 
 
 def _robot_slot_picker(robot_booked_map: dict, team_booked_slots: set):
-    """Dropdown of available slot + room combos. Returns (slot_label, room) or (None, None)."""
-    options = []  # list of (display_label, slot_label, room)
-    for slot in SCHED_ALL_SLOTS:
+    """Dropdown of available slot + room combos. Returns (slot_id, room) or (None, None)."""
+    options = []  # list of (display_label, slot_id, room)
+    for slot in SCHED_SLOT_IDS:
         if slot in team_booked_slots:
             continue
         for room in SCHED_ROBOT_ROOMS:
-            if f"{slot}||{room}" not in robot_booked_map:
+            if (slot, room) not in robot_booked_map:
                 day = "Fri" if _is_friday_slot(slot) else "Sat"
                 options.append((f"{_short(slot)}  —  Room {room}  ({day})", slot, room))
 
@@ -522,23 +439,50 @@ def _robot_slot_picker(robot_booked_map: dict, team_booked_slots: set):
     return None, None
 
 
+def _mentor_taken_options(mentor_booked_map: dict, team_booked_slots: set) -> dict:
+    """Display label → (slot_id, room) for taken mentor rooms the team could wait for."""
+    rooms = _mentor_rooms_ordered()
+    mentors_per_room = {r: [m for m, rm in MENTOR_ROOM_MAP.items() if rm == r] for r in rooms}
+    return {
+        f"{_short(slot)}  —  Room {room}  ({slot_day(slot)})": (slot, room)
+        for slot in SCHED_SLOT_IDS if slot not in team_booked_slots
+        for room in rooms
+        if any((slot, m) in mentor_booked_map for m in mentors_per_room[room])
+    }
+
+
+def _robot_taken_options(robot_booked_map: dict, team_booked_slots: set) -> dict:
+    """Display label → (slot_id, room) for taken robot slots the team could wait for."""
+    return {
+        f"{_short(slot)}  —  Room {room}  ({slot_day(slot)})": (slot, room)
+        for slot in SCHED_SLOT_IDS if slot not in team_booked_slots
+        for room in SCHED_ROBOT_ROOMS
+        if (slot, room) in robot_booked_map
+    }
+
+
 # ── Mentor tab ─────────────────────────────────────────────────────────────────
 
-def _mentor_tab(team_name: str):
-    mentor_bookings   = get_mentor_bookings_for_team(team_name)
+def _mentor_tab(team_name: str, timeline: dict):
+    queue_result("sched_mentor_queue_req", "✅ Your mentor session request has been processed.")
+    if st.session_state.get("sched_mentor_queue_req"):
+        queue_status("sched_mentor_queue_req")
+        return
+
+    mentor_bookings   = timeline["mentor"]
     mentor_booked_map = get_mentor_booked_map()
     slots_used        = len(mentor_bookings)
-    team_booked_slots = {b["slot_label"] for b in mentor_bookings}
+    team_booked_slots = set(timeline["busy_slot_ids"])
 
     # ── Your current bookings (shown first) ────────────────────────────────────
     st.markdown('<p class="ah-section">Your Mentor Sessions</p>', unsafe_allow_html=True)
 
     if mentor_bookings:
         for b in mentor_bookings:
-            day_tag    = "Friday" if _is_friday_slot(b["slot_label"]) else "Saturday"
+            day_tag    = "Friday" if _is_friday_slot(b.get("slot_id")) else "Saturday"
             room       = MENTOR_ROOM_MAP.get(b.get("mentor_name", ""), "—")
-            short_slot = _short(b["slot_label"])
-            passed     = _slot_has_passed(b["slot_label"])
+            short_slot = _short(b.get("slot_id"))
+            passed     = slot_has_passed(b.get("slot_id"))
 
             st.markdown(
                 f'<div class="ah-booking-card">'
@@ -593,9 +537,15 @@ def _mentor_tab(team_name: str):
         )
 
         chosen_slot, chosen_room = _mentor_slot_picker(mentor_booked_map, team_booked_slots)
-        if chosen_slot and chosen_room:
+        if chosen_slot is not None and chosen_room:
             if st.button("Book Mentor Session", type="primary", use_container_width=True,
                          key="book_mentor_btn"):
+                if get_booking_queue_enabled():
+                    st.session_state["sched_mentor_queue_req"] = enqueue_booking_request(
+                        "create_mentor_booking_room", team_name,
+                        room=chosen_room, slot_id=chosen_slot,
+                    )
+                    st.rerun()
                 try:
                     create_mentor_booking_room(team_name, chosen_room, chosen_slot)
                     st.success(
@@ -605,6 +555,11 @@ def _mentor_tab(team_name: str):
                 except ValueError as exc:
                     st.error(str(exc))
 
+        waitlist_panel(
+            "mentor", team_name,
+            _mentor_taken_options(mentor_booked_map, team_booked_slots), "sched_mentor_wait",
+        )
+
     # ── Availability grid (always shown at bottom) ─────────────────────────────
     st.divider()
     st.markdown('<p class="ah-section">Availability Overview</p>', unsafe_allow_html=True)
@@ -614,20 +569,25 @@ def _mentor_tab(team_name: str):
 
 # ── Robot tab ──────────────────────────────────────────────────────────────────
 
-def _robot_tab(team_name: str):
-    robot_bookings    = get_robot_bookings_for_team(team_name)
+def _robot_tab(team_name: str, timeline: dict):
+    queue_result("sched_robot_queue_req", "✅ Your robot session request has been processed.")
+    if st.session_state.get("sched_robot_queue_req"):
+        queue_status("sched_robot_queue_req")
+        return
+
+    robot_bookings    = timeline["robot"]
     robot_booked_map  = get_robot_booked_map()
     slots_used        = len(robot_bookings)
-    team_booked_slots = {b["slot_label"] for b in robot_bookings}
+    team_booked_slots = set(timeline["busy_slot_ids"])
 
     # ── Your current bookings (shown first) ────────────────────────────────────
     st.markdown('<p class="ah-section">Your Robot Sessions</p>', unsafe_allow_html=True)
 
     if robot_bookings:
         for b in robot_bookings:
-            day_tag    = "Friday" if _is_friday_slot(b["slot_label"]) else "Saturday"
-            short_slot = _short(b["slot_label"])
-            passed     = _slot_has_passed(b["slot_label"])
+            day_tag    = "Friday" if _is_friday_slot(b.get("slot_id")) else "Saturday"
+            short_slot = _short(b.get("slot_id"))
+            passed     = slot_has_passed(b.get("slot_id"))
 
             st.markdown(
                 f'<div class="ah-booking-card">'
@@ -682,9 +642,15 @@ def _robot_tab(team_name: str):
         )
 
         chosen_slot, chosen_room = _robot_slot_picker(robot_booked_map, team_booked_slots)
-        if chosen_slot and chosen_room:
+        if chosen_slot is not None and chosen_room:
             if st.button("Book Robot Session", type="primary", use_container_width=True,
                          key="book_robot_btn"):
+                if get_booking_queue_enabled():
+                    st.session_state["sched_robot_queue_req"] = enqueue_booking_request(
+                        "create_robot_booking", team_name,
+                        room=chosen_room, slot_id=chosen_slot,
+                    )
+                    st.rerun()
                 try:
                     create_robot_booking(team_name, chosen_room, chosen_slot)
                     st.success(
@@ -694,6 +660,11 @@ def _robot_tab(team_name: str):
                 except ValueError as exc:
                     st.error(str(exc))
 
+        waitlist_panel(
+            "robot", team_name,
+            _robot_taken_options(robot_booked_map, team_booked_slots), "sched_robot_wait",
+        )
+
     # ── Availability grid (always shown at bottom) ─────────────────────────────
     st.divider()
     st.markdown('<p class="ah-section">Availability Overview</p>', unsafe_allow_html=True)
@@ -786,17 +757,6 @@ def show():
         unsafe_allow_html=True,
     )
 
-    st.markdown(
-        """
-        <style>
-        div[data-testid="stCheckbox"] label p {
-            color: #F2F3F4 !important;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
     confirmed = st.checkbox(
         "Yes, this is my team — the information above is correct",
         key="sched_confirm_check",
@@ -813,15 +773,11 @@ def show():
         unsafe_allow_html=True,
     )
 
-    tab_mentor, tab_robot = st.tabs(
-        ["\U0001f9d1\u200d\U0001f3eb Mentor Sessions", "\U0001f916 Robot Sessions"]
-    )
-
-    with tab_mentor:
-        _mentor_tab(selected_team)
-
-    with tab_robot:
-        _robot_tab(selected_team)
+    timeline = get_team_timeline(selected_team)
+    lazy_tabs({
+        "\U0001f9d1\u200d\U0001f3eb Mentor Sessions": lambda: _mentor_tab(selected_team, timeline),
+        "\U0001f916 Robot Sessions": lambda: _robot_tab(selected_team, timeline),
+    }, key="sched_tab")
 
     st.divider()
     st.caption(
@@ -35,6 +35,7 @@ from db import (
     clear_all_prelim_scores,
     clear_all_finals_scores,
 )
+from components import lazy_tabs
 
 _ROUND_LABELS = {"prelims": "🏁 Prelims", "finals": "🏆 Finals"}
 
@@ -271,110 +272,83 @@ def _score_matrix_tab(label: str, is_finals: bool):
     )
 
 
-def show():
-    user = st.session_state.get("user")
-    if not user or user.get("role") != "admin":
-        st.error("Admin access required.")
-        st.stop()
+@st.dialog("Clear scores")
+def _confirm_clear(label: str, clear):
+    st.warning(
+        f"⚠️ This will permanently delete **all {label.lower()} judge scores**. "
+        "This cannot be undone."
+    )
+    c1, c2 = st.columns(2)
+    if c1.button(f"✅ Yes, clear {label.lower()} scores", type="primary",
+                 use_container_width=True):
+        clear()
+        st.toast(f"All {label.lower()} scores cleared.")
+        st.rerun()
+    if c2.button("Cancel", use_container_width=True):
+        st.rerun()
+
+
+@st.fragment
+def _scores_panel(label: str, is_finals: bool):
+    """Controls, matrix and export for one round. Refreshing reruns only this
+    fragment, so the other round's matrix and export aren't rebuilt."""
+    key = label.lower()
+    col_r, col_c, _ = st.columns([2, 2, 4])
+    with col_r:
+        # Clicking reruns this fragment, which re-reads the scores
+        st.button("🔄 Refresh Scores", use_container_width=True, key=f"so_refresh_{key}")
+    with col_c:
+        if st.button(f"🗑️ Clear All {label} Scores", use_container_width=True,
+                     key=f"so_clear_{key}"):
+            _confirm_clear(label, clear_all_finals_scores if is_finals else clear_all_prelim_scores)
 
-    st.header("Scoring Overview")
+    st.divider()
+    _score_matrix_tab(label, is_finals=is_finals)
 
-    tab_assign, tab_prelims, tab_finals = st.tabs(
-        ["👥 Judge Assignments", "🏁 Prelims Scores", "🏆 Finals Scores"]
+    st.divider()
+    st.download_button(
+        label=f"⬇️ Export Detailed {label} Submissions (CSV)",
+        data=_build_detailed_csv(is_finals=is_finals),
+        file_name=f"{key}_detailed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+        help="Per-judge × per-competitor breakdown with individual question scores",
+        key=f"so_dl_{key}_detailed",
     )
 
-    with tab_assign:
-        st.subheader("Judge Assignments")
-        st.caption("Shows every judge's round and, for prelims judges, their assigned room.")
-        _judge_assignments_tab()
 
-    with tab_prelims:
-        st.subheader("Prelims Scoring Matrix")
-        st.caption(
-            "Average scores per team per question, combined across all prelims judges. "
-            "Sorted by overall average (highest first)."
-        )
+def _judge_assignments_section():
+    st.subheader("Judge Assignments")
+    st.caption("Shows every judge's round and, for prelims judges, their assigned room.")
+    _judge_assignments_tab()
 
-        # ── Prelim score controls ───────────────────────────────────────────────
-        col_rp, col_cp, _ = st.columns([2, 2, 4])
-        with col_rp:
-            if st.button("🔄 Refresh Scores", use_container_width=True, key="so_refresh_prelims"):
-                st.rerun()
-        with col_cp:
-            if st.button("🗑️ Clear All Prelim Scores", use_container_width=True, key="so_clear_prelims"):
-                st.session_state["so_confirm_clear_prelims"] = True
-        if st.session_state.get("so_confirm_clear_prelims"):
-            st.warning(
-                "⚠️ This will permanently delete **all prelim judge scores**. "
-                "This cannot be undone."
-            )
-            c1, c2, _ = st.columns([2, 2, 4])
-            with c1:
-                if st.button("✅ Yes, clear prelim scores", type="primary",
-                             use_container_width=True, key="so_confirm_prelim_yes"):
-                    clear_all_prelim_scores()
-                    st.session_state.pop("so_confirm_clear_prelims", None)
-                    st.success("All prelim scores cleared.")
-                    st.rerun()
-            with c2:
-                if st.button("Cancel", use_container_width=True, key="so_confirm_prelim_no"):
-                    st.session_state.pop("so_confirm_clear_prelims", None)
-                    st.rerun()
-
-        st.divider()
-        _score_matrix_tab("Prelims", is_finals=False)
-
-        st.divider()
-        st.download_button(
-            label="⬇️ Export Detailed Prelims Submissions (CSV)",
-            data=_build_detailed_csv(is_finals=False),
-            file_name=f"prelims_detailed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
-            help="Per-judge × per-competitor breakdown with individual question scores",
-            key="so_dl_prelims_detailed",
-        )
 
-    with tab_finals:
-        st.subheader("Finals Scoring Matrix")
-        st.caption(
-            "Average scores per finalist team per question, combined across all finals judges."
-        )
+def _prelims_section():
+    st.subheader("Prelims Scoring Matrix")
+    st.caption(
+        "Average scores per team per question, combined across all prelims judges. "
+        "Sorted by overall average (highest first)."
+    )
+    _scores_panel("Prelims", is_finals=False)
 
-        # ── Finals score controls ───────────────────────────────────────────────
-        col_rf, col_cf, _ = st.columns([2, 2, 4])
-        with col_rf:
-            if st.button("🔄 Refresh Scores", use_container_width=True, key="so_refresh_finals"):
-                st.rerun()
-        with col_cf:
-            if st.button("🗑️ Clear All Finals Scores", use_container_width=True, key="so_clear_finals"):
-                st.session_state["so_confirm_clear_finals"] = True
-        if st.session_state.get("so_confirm_clear_finals"):
-            st.warning(
-                "⚠️ This will permanently delete **all finals judge scores**. "
-                "This cannot be undone."
-            )
-            c1, c2, _ = st.columns([2, 2, 4])
-            with c1:
-                if st.button("✅ Yes, clear finals scores", type="primary",
-                             use_container_width=True, key="so_confirm_finals_yes"):
-                    clear_all_finals_scores()
-                    st.session_state.pop("so_confirm_clear_finals", None)
-                    st.success("All finals scores cleared.")
-                    st.rerun()
-            with c2:
-                if st.button("Cancel", use_container_width=True, key="so_confirm_finals_no"):
-                    st.session_state.pop("so_confirm_clear_finals", None)
-                    st.rerun()
-
-        st.divider()
-        _score_matrix_tab("Finals", is_finals=True)
-
-        st.divider()
-        st.download_button(
-            label="⬇️ Export Detailed Finals Submissions (CSV)",
-            data=_build_detailed_csv(is_finals=True),
-            file_name=f"finals_detailed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
-            help="Per-judge × per-competitor breakdown with individual question scores",
-            key="so_dl_finals_detailed",
-        )
+
+def _finals_section():
+    st.subheader("Finals Scoring Matrix")
+    st.caption(
+        "Average scores per finalist team per question, combined across all finals judges."
+    )
+    _scores_panel("Finals", is_finals=True)
+
+
+def show():
+    user = st.session_state.get("user")
+    if not user or user.get("role") != "admin":
+        st.error("Admin access required.")
+        st.stop()
+
+    st.header("Scoring Overview")
+
+    lazy_tabs({
+        "👥 Judge Assignments": _judge_assignments_section,
+        "🏁 Prelims Scores":    _prelims_section,
+        "🏆 Finals Scores":     _finals_section,
+    }, key="so_tab")
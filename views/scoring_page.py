@@ -10,7 +10,6 @@ Design mirrors booking_page.py / registration_page.py exactly:
 """
 
 import os
-import base64
 import streamlit as st
 
 from db import (
@@ -24,6 +23,8 @@ from db import (
     get_scores_for_judge_all,
     get_prelim_comments_for_judge_competitor,
 )
+from static_assets import img_tag
+from theme import BASE_CSS, apply_stylesheet
 
 # ── Asset paths ────────────────────────────────────────────────────────────────
 _LOGO_AH_WHITE = os.path.join("assets", "autohack_logo_white.png")
@@ -39,20 +40,6 @@ _CONTACT_SHUBHNEET = "Shubhneet.Sandhu@GeorgianCollege.ca"
 _CONTACT_BRUNILDA  = "Brunilda.Xhaferllari@GeorgianCollege.ca"
 
 
-# ── Asset helpers ──────────────────────────────────────────────────────────────
-
-@st.cache_data
-def _b64_tag(path: str, style: str, alt: str = "") -> str:
-    """Return an <img> tag with the image embedded as a base64 data URI."""
-    if not os.path.exists(path):
-        return ""
-    ext  = os.path.splitext(path)[1].lstrip(".").lower()
-    mime = "image/svg+xml" if ext == "svg" else f"image/{ext}"
-    with open(path, "rb") as fh:
-        b64 = base64.b64encode(fh.read()).decode()
-    return f'<img src="data:{mime};base64,{b64}" style="{style}" alt="{alt}">'
-
-
 # ── CSS (dark theme, consistent with home / booking / scheduling pages) ────────
 
 _CSS = f"""
@@ -114,15 +101,6 @@ section[data-testid="stSidebar"] {{ display: none !important; }}
 }}
 
 /* ── Subtitle + stripe below banner ── */
-.ah-subtitle {{
-    color: rgba(200,210,230,0.70); font-size: 0.95rem;
-    letter-spacing: 2.5px; text-transform: uppercase; font-weight: 300; margin: 0;
-}}
-.ah-stripe {{
-    height: 3px;
-    background: linear-gradient(90deg, #CC0000 50%, #4A80D4 50%);
-    border-radius: 2px; width: 55%; margin: 16px auto 0;
-}}
 
 /* ── Info card (dark) ── */
 .ah-info-card {{
@@ -391,7 +369,7 @@ div[data-testid="stRadio"] [role="radiogroup"] > label:has(input:checked) p {{
 
 def _render_css():
     """Inject page CSS (navbar + content styles)."""
-    st.markdown(_CSS, unsafe_allow_html=True)
+    apply_stylesheet("scoring", BASE_CSS, _CSS)
 
 
 def _render_team_card(team_info: dict):
@@ -634,11 +612,11 @@ def show():
 
     # ── Top navbar: logos (left)  ·  signed in + logout (right) ──────────────
     ah_tag = (
-        _b64_tag(_LOGO_AH_WHITE, "height:42px;object-fit:contain;", "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_SVG, "height:42px;object-fit:contain;", "AutoHack 2026")
-        or _b64_tag(_LOGO_AH_PNG, "height:42px;object-fit:contain;", "AutoHack 2026")
+        img_tag(_LOGO_AH_WHITE, "height:42px;object-fit:contain;", "AutoHack 2026")
+        or img_tag(_LOGO_AH_SVG, "height:42px;object-fit:contain;", "AutoHack 2026")
+        or img_tag(_LOGO_AH_PNG, "height:42px;object-fit:contain;", "AutoHack 2026")
     )
-    gc_tag = _b64_tag(
+    gc_tag = img_tag(
         _LOGO_GC_PNG, "height:28px;object-fit:contain;opacity:0.82;", "Georgian College"
     )
 